@@ -67,10 +67,34 @@
         <source>Add Length to Table</source>
         <translation>Adicionar Comprimento na Tabela</translation>
     </message>
+    <message>
+        <source>Add Multiple Measures to Table</source>
+        <translation>Adicionar Várias Medidas na Tabela</translation>
+    </message>
+    <message>
+        <source>Add Measures to Multiple Layers</source>
+        <translation>Calcular Medidas em Várias Camadas</translation>
+    </message>
+    <message>
+        <source>Azimuth and Distance Table from Features</source>
+        <translation>Tabela de Azimutes e Distâncias das Feições</translation>
+    </message>
+    <message>
+        <source>Generate Descriptive Memorial</source>
+        <translation>Gerar Memorial Descritivo</translation>
+    </message>
+    <message>
+        <source>Export SIGEF Spreadsheet</source>
+        <translation>Exportar Planilha SIGEF</translation>
+    </message>
     <message>
         <source>Chamfer Line</source>
         <translation>Chanfrar Linha</translation>
     </message>
+    <message>
+        <source>Batch Chamfer</source>
+        <translation>Chanfro em Lote</translation>
+    </message>
     <message>
         <source>Useful Links</source>
         <translation>Links Úteis</translation>
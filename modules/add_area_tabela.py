@@ -31,17 +31,8 @@ class AreaTabelaDialog(BaseCalculadoraTabela):
     window_title = "Adicionar Área na Tabela de Atributos"
     field_name = "Area_ha"  # Valor padrão inicial (será atualizado pelo formato)
     field_type = QVariant.String
-    expression_string = "format_number($area/10000,2)"  # Padrão: hectares
     geometry_types = [QgsWkbTypes.PolygonGeometry]  # Apenas polígonos
 
-    # Opções de formatação disponíveis
-    format_options = {
-        "Hectares (ha)": "format_number($area/10000,2)",
-        "Metros² (m²)": "format_number($area,2)",
-        "Quilômetros² (km²)": "format_number($area/1000000,3)",
-        "Acres": "format_number($area/4046.86,3)"
-    }
-
     # Mapeamento de nomes de campo por formato
     field_names_by_format = {
         "Hectares (ha)": "Area_ha",
@@ -50,6 +41,15 @@ class AreaTabelaDialog(BaseCalculadoraTabela):
         "Acres": "Area_acres"
     }
 
+    # Medida de cada formato (medida, operação, casas): texto formatado,
+    # valor numérico e cálculo no banco
+    measures = {
+        "Hectares (ha)": ("area", "/ 10000", 2),
+        "Metros² (m²)": ("area", "", 2),
+        "Quilômetros² (km²)": ("area", "/ 1000000", 3),
+        "Acres": ("area", "/ 4046.86", 3)
+    }
+
 
 def run(iface):
     """Função principal que abre o diálogo"""
@@ -23,6 +23,16 @@
 from .base_field_calculator import BaseCalculadoraTabela
 from qgis.core import QgsWkbTypes
 from qgis.PyQt.QtCore import QVariant
+import math
+
+
+def azimute_gms(geom, medidor):
+    """Mesmo texto da expressão GMS: graus e minutos inteiros, segundos com até 2 casas."""
+    azim = medidor.azimute(geom)
+    graus = math.floor(azim)
+    minutos = math.floor((azim - graus) * 60)
+    segundos = round(((azim - graus) * 60 - minutos) * 60, 2)
+    return f"{graus}° {minutos}' {medidor.texto(segundos)}\""
 
 
 class AzimuteTabelaDialog(BaseCalculadoraTabela):
@@ -33,7 +43,7 @@ class AzimuteTabelaDialog(BaseCalculadoraTabela):
     field_type = QVariant.String
     geometry_types = [QgsWkbTypes.LineGeometry]  # Apenas linhas
 
-    # Opções de formatação disponíveis
+    # Texto GMS: formato sem medida, sempre gravado como texto
     format_options = {
         "GMS (Graus° Minutos' Segundos\")": """
             with_variable('azim', degrees(azimuth(start_point($geometry), end_point($geometry))),
@@ -45,8 +55,7 @@ class AzimuteTabelaDialog(BaseCalculadoraTabela):
                     )
                 )
             )
-        """,
-        "Decimal (Graus)": "format_number(degrees(azimuth(start_point($geometry), end_point($geometry))), 4)"
+        """
     }
 
     # Mapeamento de nomes de campo por formato
@@ -55,6 +64,16 @@ class AzimuteTabelaDialog(BaseCalculadoraTabela):
         "Decimal (Graus)": "Azimute_Dec"
     }
 
+    # Cálculo direto na geometria, equivalente à expressão acima
+    native_functions = {
+        "GMS (Graus° Minutos' Segundos\")": azimute_gms
+    }
+
+    # Medida do azimute decimal: texto formatado, valor numérico e cálculo no banco
+    measures = {
+        "Decimal (Graus)": ("azimute", "", 4)
+    }
+
 
 def run(iface):
     """Função principal que abre o diálogo"""
@@ -31,16 +31,8 @@ class ComprimentoTabelaDialog(BaseCalculadoraTabela):
     window_title = "Adicionar Comprimento na Tabela"
     field_name = "Comp_m"  # Valor padrão inicial (será atualizado pelo formato)
     field_type = QVariant.String
-    expression_string = "format_number($length, 3)"  # Padrão: metros
     geometry_types = [QgsWkbTypes.LineGeometry]  # Apenas linhas
 
-    # Opções de formatação disponíveis
-    format_options = {
-        "Metros (m)": "format_number($length, 3)",
-        "Quilômetros (km)": "format_number($length/1000, 3)",
-        "Centímetros (cm)": "format_number($length*100, 2)"
-    }
-
     # Mapeamento de nomes de campo por formato
     field_names_by_format = {
         "Metros (m)": "Comp_m",
@@ -48,6 +40,14 @@ class ComprimentoTabelaDialog(BaseCalculadoraTabela):
         "Centímetros (cm)": "Comp_cm"
     }
 
+    # Medida de cada formato (medida, operação, casas): texto formatado,
+    # valor numérico e cálculo no banco
+    measures = {
+        "Metros (m)": ("comprimento", "", 3),
+        "Quilômetros (km)": ("comprimento", "/ 1000", 3),
+        "Centímetros (cm)": ("comprimento", "* 100", 2)
+    }
+
 
 def run(iface):
     """Função principal que abre o diálogo"""
@@ -31,9 +31,13 @@ class CoordXTabelaDialog(BaseCalculadoraTabela):
     window_title = "Adicionar Coordenada X na Tabela"
     field_name = "Coord_X"
     field_type = QVariant.String
-    expression_string = "to_string($x)"
     geometry_types = [QgsWkbTypes.PointGeometry]  # Apenas pontos
 
+    # Medida da coordenada: texto (to_string), valor numérico e cálculo no banco
+    measures = {
+        "Padrão": ("x", "", None)
+    }
+
 
 def run(iface):
     """Função principal que abre o diálogo"""
@@ -31,9 +31,13 @@ class CoordYTabelaDialog(BaseCalculadoraTabela):
     window_title = "Adicionar Coordenada Y na Tabela"
     field_name = "Coord_Y"
     field_type = QVariant.String
-    expression_string = "to_string($y)"
     geometry_types = [QgsWkbTypes.PointGeometry]  # Apenas pontos
 
+    # Medida da coordenada: texto (to_string), valor numérico e cálculo no banco
+    measures = {
+        "Padrão": ("y", "", None)
+    }
+
 
 def run(iface):
     """Função principal que abre o diálogo"""
@@ -0,0 +1,452 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from functools import partial
+import time
+
+from .base_field_calculator import (CalculoCampoTask, _tarefas_ativas, _LOTE,
+                                    _LOTE_DIRETO)
+from .add_medidas_tabela import (MedidasTabelaDialog, MEDIDAS, MARCAVEL, MARCADO,
+                                 DESMARCADO, PAPEL_DADOS)
+from .calculo_banco import CalculoBancoTask
+from qgis.core import QgsApplication, QgsMessageLog, Qgis
+from qgis.PyQt.QtWidgets import QCheckBox, QListWidget, QListWidgetItem, QMessageBox
+
+
+class LoteTabelaDialog(MedidasTabelaDialog):
+    """Calcula as medidas marcadas em várias camadas de uma vez.
+
+    Cada camada tem a sua tarefa, e o gerenciador de tarefas do QGIS lê e
+    calcula as camadas em paralelo no seu conjunto de threads. Os lotes de
+    cada camada são gravados na thread principal, um de cada vez, como no
+    cálculo de uma camada só."""
+
+    window_title = "Calcular Medidas em Várias Camadas"
+
+    camadas_list = None
+    todasCheck = None
+
+    def __init__(self, iface):
+        # Cálculos em andamento por id de camada, e o resultado das já terminadas
+        self.lote = {}
+        self.resumo = []
+        self.fila_banco = []
+        self.inicio_lote = time.perf_counter()
+        super().__init__(iface)
+
+        # As camadas são marcadas na lista, não no combo
+        self.coluna_combo.hide()
+        self.select_camada.setText("Marque as camadas e as medidas:")
+
+        self.todasCheck = QCheckBox("Marcar todas as camadas", self)
+        self.todasCheck.toggled.connect(self.marcar_todas)
+        self.verticalLayout_2.insertWidget(1, self.todasCheck)
+
+        self.camadas_list = QListWidget(self)
+        self.camadas_list.setToolTip("Camadas que recebem as medidas; cada uma é calculada em paralelo")
+        self.verticalLayout_2.insertWidget(2, self.camadas_list)
+        self.camadas_list.itemChanged.connect(self.ao_marcar_camada)
+
+        self.popular_lista_camadas()
+        self.popular_medidas()
+        self.adjustSize()
+
+    def popular_lista_camadas(self):
+        """Lista as camadas compatíveis do combo, que o popular_camadas já filtrou"""
+        self.camadas_list.blockSignals(True)
+        self.camadas_list.clear()
+        for i in range(self.coluna_combo.count()):
+            layer = self.coluna_combo.itemData(i)
+            item = QListWidgetItem(f"{layer.name()} ({layer.featureCount()} feições)")
+            item.setFlags(item.flags() | MARCAVEL)
+            item.setCheckState(DESMARCADO)
+            item.setData(PAPEL_DADOS, layer)
+            self.camadas_list.addItem(item)
+        self.camadas_list.blockSignals(False)
+
+    def camadas_marcadas(self):
+        """Camadas marcadas na lista"""
+        if self.camadas_list is None:
+            return []
+        itens = (self.camadas_list.item(i) for i in range(self.camadas_list.count()))
+        return [item.data(PAPEL_DADOS) for item in itens if item.checkState() == MARCADO]
+
+    def marcar_todas(self, marcar):
+        self.camadas_list.blockSignals(True)
+        for i in range(self.camadas_list.count()):
+            self.camadas_list.item(i).setCheckState(MARCADO if marcar else DESMARCADO)
+        self.camadas_list.blockSignals(False)
+        self.ao_marcar_camada()
+
+    def ao_marcar_camada(self):
+        """Mostra as medidas dos tipos de geometria das camadas marcadas"""
+        camadas = self.camadas_marcadas()
+        self.popular_medidas()
+        if camadas:
+            self.filtroEdit.setLayer(camadas[0])
+        self.status_label.setText(f"Status: {len(camadas)} camada(s) selecionada(s)")
+
+    def popular_medidas(self):
+        """Lista as medidas compatíveis com alguma camada marcada (todas, se
+        nenhuma estiver marcada), mantendo as marcadas"""
+        if self.camadas_list is None:
+            return
+        tipos = {layer.geometryType() for layer in self.camadas_marcadas()}
+        marcadas = set(self.indices_marcados())
+        self.medidas_list.blockSignals(True)
+        self.medidas_list.clear()
+
+        for indice, (rotulo, tipos_medida, nome, *_) in enumerate(MEDIDAS):
+            if tipos and not tipos.intersection(tipos_medida):
+                continue
+            item = QListWidgetItem(f"{rotulo} ({nome})")
+            item.setFlags(item.flags() | MARCAVEL)
+            item.setCheckState(MARCADO if indice in marcadas else DESMARCADO)
+            item.setData(PAPEL_DADOS, indice)
+            self.medidas_list.addItem(item)
+
+        self.medidas_list.blockSignals(False)
+
+    def atualizar_vivo_check(self):
+        """Com várias camadas a opção de campo vivo fica como o usuário marcar"""
+
+    def em_execucao(self, executando):
+        super().em_execucao(executando)
+        if self.camadas_list is not None:
+            self.camadas_list.setEnabled(not executando)
+            self.todasCheck.setEnabled(not executando)
+
+    def campos_camada(self, layer):
+        """Campos das medidas marcadas que se aplicam ao tipo de geometria da camada"""
+        return [campo for indice, campo in zip(self.indices_marcados(), self.campos_calculo())
+                if layer.geometryType() in MEDIDAS[indice][1]]
+
+    def confirmar_recalculo(self, camadas):
+        """Pergunta uma única vez se os campos que já existem devem ser
+        recalculados; retorna False se o usuário desistir"""
+        existentes = [layer.name() for layer in camadas
+                      if any(nome in layer.fields().names() for nome, *_ in self.campos_camada(layer))]
+        if not existentes:
+            return True
+
+        lista = "\n".join(existentes[:10])
+        if len(existentes) > 10:
+            lista += f"\n... e mais {len(existentes) - 10}"
+        reply = QMessageBox.question(
+            self,
+            "Campo já existe",
+            f"{len(existentes)} camada(s) já têm algum dos campos:\n{lista}\n"
+            f"Deseja recalcular os valores?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        return reply == QMessageBox.Yes
+
+    def preparar_camada(self, layer, campos, direto):
+        """Cria os campos e monta o cálculo de uma camada (dicionário no
+        formato do cálculo de uma camada só, acrescido dos valores).
+
+        Levanta ValueError com o motivo se a camada não puder ser calculada."""
+        campos, mantidos = self.definir_tipos(layer, campos)
+        if mantidos:
+            QgsMessageLog.logMessage(
+                f"{layer.name()}: campo(s) {', '.join(mantidos)} já existe(m) como texto e "
+                f"continua(m) recebendo o valor formatado.", "RMCGEO", Qgis.Info)
+
+        if direto:
+            impedimento = self.pode_gravar_direto(layer, campos)
+            if impedimento:
+                raise ValueError(impedimento)
+        impedimento = self.verificar_tipos(layer, campos)
+        if impedimento:
+            raise ValueError(impedimento)
+
+        request, escopo, total = self.escopo_calculo(layer)
+        nomes = ", ".join(nome for nome, *_ in campos)
+        field_exists = any(nome in layer.fields().names() for nome, *_ in campos)
+
+        was_editing = layer.isEditable()
+        if not was_editing and not direto:
+            layer.startEditing()
+
+        try:
+            if any(nome not in layer.fields().names() for nome, *_ in campos):
+                if was_editing:
+                    layer.beginEditCommand(f"Adicionar Coluna {nomes}")
+                self.criar_campos(layer, campos, direto)
+                if was_editing:
+                    layer.endEditCommand()
+
+            fields = layer.dataProvider().fields() if direto else layer.fields()
+            indices = [fields.indexFromName(nome) for nome, *_ in campos]
+            valores = self.obter_valores(layer, campos, indices, request)
+        except Exception:
+            if not was_editing and not direto:
+                layer.rollBack()
+            raise
+
+        if not direto:
+            layer.beginEditCommand(f"Calcular Campo {nomes} (RMCGEO)")
+
+        return {
+            'descricao': f"Calcular Campo {nomes} em {layer.name()} (RMCGEO)",
+            'tarefa': None,
+            'banco': False,
+            'layer': layer,
+            'campos': campos,
+            'direto': direto,
+            'vivo': self.vivoCheck.isChecked(),
+            'field_exists': field_exists,
+            'iniciou_edicao': not was_editing and not direto,
+            'total': total,
+            'gravadas': 0,
+            'inicio': time.perf_counter(),
+            'erro': None,
+            'erro_banco': None,
+            'valores': valores,
+            'escopo': escopo,
+        }
+
+    def add_campo(self):
+        """Calcula as medidas marcadas em todas as camadas marcadas"""
+        camadas = self.camadas_marcadas()
+        if not camadas:
+            QMessageBox.warning(self, "Aviso", "Marque ao menos uma camada!")
+            return
+        if not self.campos_calculo():
+            QMessageBox.warning(self, "Aviso", "Selecione ao menos uma medida!")
+            return
+        if not self.confirmar_recalculo(camadas):
+            return
+
+        direto = self.diretoCheck.isChecked()
+        self.lote = {}
+        self.resumo = []
+        self.fila_banco = []
+        self.inicio_lote = time.perf_counter()
+
+        for layer in camadas:
+            campos = self.campos_camada(layer)
+            if not campos:
+                self.resumo.append((layer.name(), None, "nenhuma medida marcada para este tipo de geometria"))
+                continue
+            try:
+                calculo = self.preparar_camada(layer, campos, direto)
+            except Exception as e:
+                self.resumo.append((layer.name(), None, str(e)))
+                continue
+            self.lote[layer.id()] = calculo
+
+        if not self.lote:
+            self.mostrar_resumo()
+            return
+
+        self.em_execucao(True)
+        for calculo in list(self.lote.values()):
+            # Na gravação direta, PostGIS e GeoPackage calculam a camada toda num UPDATE
+            banco = None
+            if direto and calculo['escopo'] == ['todas']:
+                banco = self.comando_banco(calculo['layer'], calculo['campos'])
+            if banco:
+                self.fila_banco.append((calculo, *banco))
+            else:
+                self.calcular_camada_no_qgis(calculo)
+
+        self.iniciar_proximo_banco()
+        self.mostrar_progresso_lote()
+
+    def executar_tarefa_camada(self, calculo, tarefa):
+        calculo['tarefa'] = tarefa
+        calculo['inicio'] = time.perf_counter()
+        _tarefas_ativas.append(tarefa)
+        QgsApplication.taskManager().addTask(tarefa)
+
+    def calcular_camada_no_qgis(self, calculo):
+        """Lê e calcula a camada numa tarefa própria; os lotes são gravados na thread principal"""
+        calculo['banco'] = False
+        tamanho = _LOTE_DIRETO if calculo['direto'] else _LOTE
+        tarefa = CalculoCampoTask(calculo['descricao'], calculo['valores'],
+                                  partial(self.ao_terminar_camada, calculo), tamanho)
+        tarefa.loteCalculado.connect(partial(self.aplicar_lote_camada, calculo))
+        self.executar_tarefa_camada(calculo, tarefa)
+
+    def iniciar_proximo_banco(self):
+        """Executa o próximo cálculo no banco de dados.
+
+        Os UPDATEs rodam um de cada vez: no GeoPackage só há um escritor
+        por arquivo, e no PostGIS as camadas disputariam a mesma conexão."""
+        if not self.fila_banco or any(c['banco'] and c['tarefa'] for c in self.lote.values()):
+            return
+        calculo, destino, comando = self.fila_banco.pop(0)
+        calculo['banco'] = True
+
+        def ao_terminar_banco(resultado, erro):
+            _tarefas_ativas.remove(tarefa)
+            calculo['tarefa'] = None
+            if resultado:
+                calculo['gravadas'] = calculo['total']
+                self.ao_terminar_camada(calculo, True, None)
+            else:
+                # O caminho no QGIS grava tudo de novo
+                calculo['erro_banco'] = erro
+                self.calcular_camada_no_qgis(calculo)
+            self.iniciar_proximo_banco()
+
+        tarefa = CalculoBancoTask(calculo['descricao'], destino, comando, ao_terminar_banco)
+        self.executar_tarefa_camada(calculo, tarefa)
+
+    def aplicar_lote_camada(self, calculo, lote):
+        """Grava na thread principal um lote {fid: {campo: valor}} de uma camada"""
+        layer = calculo['layer']
+        try:
+            if calculo['direto']:
+                provider = layer.dataProvider()
+                if not provider.changeAttributeValues(lote):
+                    erros = "; ".join(provider.errors()) or "erro desconhecido"
+                    raise Exception(f"A fonte de dados recusou a gravação: {erros}")
+            else:
+                for fid, atributos in lote.items():
+                    layer.changeAttributeValues(fid, atributos)
+        except Exception as e:
+            calculo['erro'] = str(e)
+            calculo['tarefa'].cancel()
+        else:
+            calculo['gravadas'] += len(lote)
+            self.mostrar_progresso_lote()
+        finally:
+            calculo['tarefa'].lote_gravado()
+
+    def mostrar_progresso_lote(self):
+        """Progresso somado de todas as camadas e a vazão total"""
+        calculos = list(self.lote.values())
+        gravadas = sum(c['gravadas'] for c in calculos)
+        concluidas = len(self.resumo)
+        decorrido = time.perf_counter() - self.inicio_lote
+        vazao = gravadas / decorrido if decorrido > 0 else 0.0
+
+        if all(c['total'] >= 0 for c in calculos):
+            total = sum(c['total'] for c in calculos)
+            self.progressBar.setRange(0, 100)
+            self.progressBar.setValue(int(100 * gravadas / total) if total else 100)
+        else:
+            self.progressBar.setRange(0, 0)
+        self.status_label.setText(
+            f"Status: {concluidas} camada(s) concluída(s), {gravadas} feições ({vazao:.0f} feições/s)")
+
+    def ao_terminar_camada(self, calculo, resultado, erro_calculo):
+        """Confirma ou desfaz as alterações de uma camada e, na última, mostra o resumo"""
+        if calculo.get('terminado'):
+            return
+        calculo['terminado'] = True
+
+        layer = calculo['layer']
+        erro = calculo['erro'] or erro_calculo
+        sucesso = resultado and not erro
+
+        if calculo['direto']:
+            layer.reload()
+        elif sucesso:
+            layer.endEditCommand()
+        else:
+            layer.destroyEditCommand()
+            if calculo['iniciou_edicao']:
+                layer.rollBack()
+        layer.triggerRepaint()
+
+        if sucesso:
+            if calculo['erro_banco']:
+                QgsMessageLog.logMessage(
+                    f"{layer.name()}: cálculo no banco recusado, feito no QGIS: {calculo['erro_banco']}",
+                    "RMCGEO", Qgis.Info)
+            self.gravar_campos_vivos(layer, calculo['campos'], calculo['vivo'])
+            self.resumo.append((layer.name(), calculo, None))
+        else:
+            motivo = erro or "cancelado"
+            if calculo['direto'] and calculo['gravadas']:
+                motivo += f" ({calculo['gravadas']} feições já gravadas na fonte de dados)"
+            self.resumo.append((layer.name(), calculo, motivo))
+
+        self.mostrar_progresso_lote()
+        if all(c.get('terminado') for c in self.lote.values()):
+            self.lote = {}
+            self.fila_banco = []
+            self.em_execucao(False)
+            self.iface.mapCanvas().refresh()
+            self.mostrar_resumo()
+
+    def mostrar_resumo(self):
+        """Resumo por camada: feições gravadas e tempo, ou o motivo da falha"""
+        decorrido = time.perf_counter() - self.inicio_lote
+        linhas, falhas, gravadas = [], 0, 0
+        for nome, calculo, motivo in self.resumo:
+            if motivo:
+                falhas += 1
+                linhas.append(f"{nome}: {motivo}")
+            else:
+                gravadas += calculo['gravadas']
+                tempo = time.perf_counter() - calculo['inicio']
+                onde = " no banco" if calculo['banco'] else ""
+                linhas.append(f"{nome}: {calculo['gravadas']} feições{onde} em {tempo:.1f} s")
+
+        for linha in linhas:
+            QgsMessageLog.logMessage(linha, "RMCGEO", Qgis.Warning if falhas else Qgis.Info)
+
+        total = len(self.resumo)
+        cabecalho = (f"{total - falhas} de {total} camada(s) calculadas, {gravadas} feições "
+                     f"em {decorrido:.1f} s.")
+        self.status_label.setText(f"Status: {cabecalho}")
+
+        detalhes = "\n".join(linhas[:20])
+        if len(linhas) > 20:
+            detalhes += "\n... (resumo completo no painel de mensagens de log)"
+        if falhas:
+            QMessageBox.warning(self, "Cálculo em lote", f"{cabecalho}\n\n{detalhes}")
+        else:
+            QMessageBox.information(self, "Cálculo em lote", f"{cabecalho}\n\n{detalhes}")
+
+    def cancelar_calculo(self):
+        """Cancela as tarefas no QGIS e os cálculos no banco que ainda não começaram"""
+        if not self.lote:
+            return
+        self.status_label.setText("Status: Cancelando...")
+        pendentes, self.fila_banco = self.fila_banco, []
+        for calculo, *_ in pendentes:
+            self.ao_terminar_camada(calculo, False, None)
+        for calculo in list(self.lote.values()):
+            if calculo['tarefa'] and not calculo['banco']:
+                calculo['tarefa'].cancel()
+
+    def reject(self):
+        """Não fecha o diálogo com cálculos em andamento: cancela primeiro"""
+        if self.lote:
+            self.cancelar_calculo()
+            return
+        super().reject()
+
+
+def run(iface):
+    """Função principal que abre o diálogo"""
+    dialog = LoteTabelaDialog(iface)
+    # Compatibilidade Qt5/Qt6: exec_() foi renomeado para exec()
+    if hasattr(dialog, 'exec'):
+        dialog.exec()
+    else:
+        dialog.exec_()
@@ -0,0 +1,157 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from .base_field_calculator import BaseCalculadoraTabela, expressao_texto, funcao_texto
+from .add_area_tabela import AreaTabelaDialog
+from .add_perimetro_tabela import PerimetroTabelaDialog
+from .add_comprimento_tabela import ComprimentoTabelaDialog
+from .add_azimute_tabela import AzimuteTabelaDialog
+from .add_coord_x_tabela import CoordXTabelaDialog
+from .add_coord_y_tabela import CoordYTabelaDialog
+from qgis.core import QgsWkbTypes
+from qgis.PyQt.QtCore import QVariant, Qt
+from qgis.PyQt.QtWidgets import QListWidget, QListWidgetItem
+
+# Compatibilidade Qt5/Qt6:
+try:
+    MARCAVEL = Qt.ItemFlag.ItemIsUserCheckable  # Qt6
+    MARCADO = Qt.CheckState.Checked
+    DESMARCADO = Qt.CheckState.Unchecked
+    PAPEL_DADOS = Qt.ItemDataRole.UserRole
+except AttributeError:
+    MARCAVEL = Qt.ItemIsUserCheckable  # Qt5
+    MARCADO = Qt.Checked
+    DESMARCADO = Qt.Unchecked
+    PAPEL_DADOS = Qt.UserRole
+
+
+def opcoes_calculadora(rotulo, classe):
+    """Medidas oferecidas por uma calculadora de campo, uma por formato:
+    (rótulo, tipos de geometria, nome, tipo, expressão, função nativa, medida)."""
+    nomes = classe.field_names_by_format or {}
+    medidas = classe.measures or {}
+    for formato in classe.opcoes_formato() or ["Padrão"]:
+        texto = rotulo if formato == "Padrão" else f"{rotulo} - {formato}"
+        yield (texto, classe.geometry_types, nomes.get(formato, classe.field_name),
+               classe.field_type, classe.expressao_formato(formato),
+               classe.funcao_formato(formato), medidas.get(formato))
+
+
+def opcao_medida(rotulo, tipos, nome, medida):
+    """Medida sem calculadora própria, gravada como texto por padrão"""
+    return (rotulo, tipos, nome, QVariant.String, expressao_texto(medida),
+            funcao_texto(medida), medida)
+
+
+# Linhas e polígonos; em pontos o centroide é a própria coordenada
+_CENTROIDE = [QgsWkbTypes.LineGeometry, QgsWkbTypes.PolygonGeometry]
+
+MEDIDAS = [
+    *opcoes_calculadora("Área", AreaTabelaDialog),
+    *opcoes_calculadora("Perímetro", PerimetroTabelaDialog),
+    *opcoes_calculadora("Comprimento", ComprimentoTabelaDialog),
+    *opcoes_calculadora("Azimute", AzimuteTabelaDialog),
+    *opcoes_calculadora("Coordenada X", CoordXTabelaDialog),
+    *opcoes_calculadora("Coordenada Y", CoordYTabelaDialog),
+    opcao_medida("Centroide X", _CENTROIDE, "Centr_X", ("centroide_x", "", None)),
+    opcao_medida("Centroide Y", _CENTROIDE, "Centr_Y", ("centroide_y", "", None)),
+]
+
+
+class MedidasTabelaDialog(BaseCalculadoraTabela):
+    """Adiciona várias medidas de uma vez, lendo cada geometria uma única vez"""
+
+    window_title = "Adicionar Medidas na Tabela"
+    field_type = QVariant.String
+    geometry_types = [QgsWkbTypes.PointGeometry, QgsWkbTypes.LineGeometry,
+                      QgsWkbTypes.PolygonGeometry]
+
+    medidas_list = None
+
+    def __init__(self, iface):
+        super().__init__(iface)
+
+        # As medidas e unidades são marcadas na lista, não no combo de formato
+        self.formatacao_combo.hide()
+
+        self.medidas_list = QListWidget(self)
+        self.medidas_list.setToolTip("Marque as medidas a calcular; todas são gravadas numa única passada pela camada")
+        self.verticalLayout_2.insertWidget(1, self.medidas_list)
+        self.medidas_list.itemChanged.connect(self.ao_marcar_medida)
+
+        self.popular_medidas()
+        self.adjustSize()
+
+    def popular_medidas(self):
+        """Lista as medidas compatíveis com a camada, mantendo as marcadas"""
+        marcadas = set(self.indices_marcados())
+        self.medidas_list.blockSignals(True)
+        self.medidas_list.clear()
+
+        layer = self.coluna_combo.currentData()
+        if layer:
+            for indice, (rotulo, tipos, nome, *_) in enumerate(MEDIDAS):
+                if layer.geometryType() not in tipos:
+                    continue
+                item = QListWidgetItem(f"{rotulo} ({nome})")
+                item.setFlags(item.flags() | MARCAVEL)
+                item.setCheckState(MARCADO if indice in marcadas else DESMARCADO)
+                item.setData(PAPEL_DADOS, indice)
+                self.medidas_list.addItem(item)
+
+        self.medidas_list.blockSignals(False)
+
+    def indices_marcados(self):
+        """Índices em MEDIDAS das medidas marcadas na lista"""
+        if self.medidas_list is None:
+            return []
+        itens = (self.medidas_list.item(i) for i in range(self.medidas_list.count()))
+        return [item.data(PAPEL_DADOS) for item in itens if item.checkState() == MARCADO]
+
+    def ao_mudar_camada(self):
+        """Atualiza o status e as medidas disponíveis quando a camada é alterada"""
+        super().ao_mudar_camada()
+        if self.medidas_list is not None:
+            self.popular_medidas()
+
+    def ao_marcar_medida(self):
+        total = len(self.indices_marcados())
+        self.status_label.setText(f"Status: {total} medida(s) selecionada(s)")
+
+    def em_execucao(self, executando):
+        super().em_execucao(executando)
+        if self.medidas_list is not None:
+            self.medidas_list.setEnabled(not executando)
+
+    def campos_calculo(self):
+        """Um campo (nome, tipo, expressão, função nativa, medida) por medida marcada"""
+        return [tuple(MEDIDAS[indice][2:]) for indice in self.indices_marcados()]
+
+
+def run(iface):
+    """Função principal que abre o diálogo"""
+    dialog = MedidasTabelaDialog(iface)
+    # Compatibilidade Qt5/Qt6: exec_() foi renomeado para exec()
+    if hasattr(dialog, 'exec'):
+        dialog.exec()
+    else:
+        dialog.exec_()
@@ -31,16 +31,8 @@ class PerimetroTabelaDialog(BaseCalculadoraTabela):
     window_title = "Adicionar Perímetro na Tabela"
     field_name = "Perim_m"  # Valor padrão inicial (será atualizado pelo formato)
     field_type = QVariant.String
-    expression_string = "format_number($perimeter, 2)"  # Padrão: metros
     geometry_types = [QgsWkbTypes.PolygonGeometry]  # Apenas polígonos
 
-    # Opções de formatação disponíveis
-    format_options = {
-        "Metros (m)": "format_number($perimeter, 2)",
-        "Quilômetros (km)": "format_number($perimeter/1000, 3)",
-        "Centímetros (cm)": "format_number($perimeter*100, 2)"
-    }
-
     # Mapeamento de nomes de campo por formato
     field_names_by_format = {
         "Metros (m)": "Perim_m",
@@ -48,6 +40,14 @@ class PerimetroTabelaDialog(BaseCalculadoraTabela):
         "Centímetros (cm)": "Perim_cm"
     }
 
+    # Medida de cada formato (medida, operação, casas): texto formatado,
+    # valor numérico e cálculo no banco
+    measures = {
+        "Metros (m)": ("perimetro", "", 2),
+        "Quilômetros (km)": ("perimetro", "/ 1000", 3),
+        "Centímetros (cm)": ("perimetro", "* 100", 2)
+    }
+
 
 def run(iface):
     """Função principal que abre o diálogo"""
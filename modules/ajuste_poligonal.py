@@ -0,0 +1,144 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Erro de fechamento e ajuste de poligonais (Bowditch, trânsito e Crandall)
+ sem dependência do QGIS.
+"""
+
+import math
+from collections import namedtuple
+
+BOWDITCH = 'bowditch'
+TRANSITO = 'transito'
+CRANDALL = 'crandall'
+
+METODOS = {
+    BOWDITCH: "Bowditch (regra da bússola)",
+    TRANSITO: "Trânsito",
+    CRANDALL: "Crandall",
+}
+
+Fechamento = namedtuple('Fechamento', ['erro_e', 'erro_n', 'erro_linear', 'perimetro', 'precisao'])
+
+
+def projecoes(azimutes, distancias):
+    """Retorna as projeções (dE, dN) de cada pernada."""
+    delta_e = []
+    delta_n = []
+    for azimute, distancia in zip(azimutes, distancias):
+        azimute_rad = math.radians(azimute)
+        delta_e.append(distancia * math.sin(azimute_rad))
+        delta_n.append(distancia * math.cos(azimute_rad))
+    return delta_e, delta_n
+
+
+def calcular_fechamento(azimutes, distancias, inicio=(0.0, 0.0), fim=None):
+    """Calcula o erro de fechamento da poligonal.
+
+    Sem `fim`, a poligonal é considerada fechada (deve terminar no início).
+    A precisão é o denominador N da razão 1:N (infinita sem erro)."""
+    delta_e, delta_n = projecoes(azimutes, distancias)
+    fim = fim or inicio
+
+    erro_e = inicio[0] + math.fsum(delta_e) - fim[0]
+    erro_n = inicio[1] + math.fsum(delta_n) - fim[1]
+    erro_linear = math.hypot(erro_e, erro_n)
+    perimetro = math.fsum(distancias)
+    precisao = perimetro / erro_linear if erro_linear > 0 else math.inf
+
+    return Fechamento(erro_e, erro_n, erro_linear, perimetro, precisao)
+
+
+def _correcoes_crandall(delta_e, delta_n, distancias, erro_e, erro_n):
+    """Correções pela regra de Crandall: azimutes mantidos e apenas as
+    distâncias ajustadas (mínimos quadrados com peso 1/distância)."""
+    see = sum(d * (de / d) ** 2 for de, d in zip(delta_e, distancias))
+    snn = sum(d * (dn / d) ** 2 for dn, d in zip(delta_n, distancias))
+    sen = sum(d * (de / d) * (dn / d) for de, dn, d in zip(delta_e, delta_n, distancias))
+
+    determinante = see * snn - sen * sen
+    if abs(determinante) < 1e-12:
+        raise ValueError("Regra de Crandall indefinida: todas as pernadas são paralelas.")
+
+    lambda_e = (-erro_e * snn + erro_n * sen) / determinante
+    lambda_n = (-erro_n * see + erro_e * sen) / determinante
+
+    correcoes = []
+    for de, dn, d in zip(delta_e, delta_n, distancias):
+        seno, cosseno = de / d, dn / d
+        # Correção da distância ao longo do próprio azimute
+        v = d * (lambda_e * seno + lambda_n * cosseno)
+        correcoes.append((v * seno, v * cosseno))
+    return correcoes
+
+
+def correcoes_poligonal(azimutes, distancias, erro_e, erro_n, metodo=BOWDITCH):
+    """Retorna a correção (cE, cN) de cada pernada para anular o erro informado."""
+    delta_e, delta_n = projecoes(azimutes, distancias)
+
+    if metodo == CRANDALL:
+        return _correcoes_crandall(delta_e, delta_n, distancias, erro_e, erro_n)
+
+    if metodo == TRANSITO:
+        pesos_e = [abs(de) for de in delta_e]
+        pesos_n = [abs(dn) for dn in delta_n]
+    elif metodo == BOWDITCH:
+        pesos_e = pesos_n = list(distancias)
+    else:
+        raise ValueError(f"Método de ajuste desconhecido: {metodo}")
+
+    total_e = math.fsum(pesos_e)
+    total_n = math.fsum(pesos_n)
+
+    # Sem projeções em um eixo (regra do trânsito), distribui pela distância
+    if total_e == 0:
+        pesos_e, total_e = distancias, math.fsum(distancias)
+    if total_n == 0:
+        pesos_n, total_n = distancias, math.fsum(distancias)
+
+    return [(-erro_e * pe / total_e, -erro_n * pn / total_n)
+            for pe, pn in zip(pesos_e, pesos_n)]
+
+
+def ajustar_poligonal(azimutes, distancias, inicio, fim=None, metodo=BOWDITCH):
+    """Retorna as coordenadas (x, y) ajustadas de todos os vértices,
+    começando pelo ponto inicial e terminando exatamente no ponto final."""
+    fechamento = calcular_fechamento(azimutes, distancias, inicio, fim)
+    delta_e, delta_n = projecoes(azimutes, distancias)
+    correcoes = correcoes_poligonal(
+        azimutes, distancias, fechamento.erro_e, fechamento.erro_n, metodo)
+
+    x, y = inicio
+    vertices = [(x, y)]
+    for de, dn, (ce, cn) in zip(delta_e, delta_n, correcoes):
+        x += de + ce
+        y += dn + cn
+        vertices.append((x, y))
+
+    # Elimina o resíduo de arredondamento acumulado no último vértice
+    vertices[-1] = tuple(fim or inicio)
+    return vertices
+
+
+def formatar_precisao(precisao):
+    """Formata a precisão relativa como '1:12.345'."""
+    if math.isinf(precisao):
+        return "sem erro"
+    return f"1:{precisao:,.0f}".replace(',', '.')
@@ -0,0 +1,131 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Conversões de ângulos (azimute, rumo e GMS) sem dependência do QGIS.
+"""
+
+import re
+
+QUADRANTES = ('NE', 'SE', 'SW', 'NW')
+
+# Grafias em português dos quadrantes (noroeste e sudoeste)
+_QUADRANTES_PT = {'NO': 'NW', 'SO': 'SW'}
+
+_NUMERO = re.compile(r'\d+(?:[.,]\d+)?')
+
+
+def numero(texto):
+    """Converte texto numérico com vírgula ou ponto decimal (aceita '1.234,56')."""
+    texto = texto.strip()
+    if ',' in texto:
+        texto = texto.replace('.', '').replace(',', '.')
+    return float(texto)
+
+
+def interpretar_angulo(texto):
+    """Interpreta um ângulo em GMS ('45°30'15"', '45 30 15', '45-30-15') ou decimal.
+
+    Retorna (graus_decimais, 'G M S') ou (None, None) se inválido."""
+    partes = _NUMERO.findall(texto or '')
+    if not partes or len(partes) > 3:
+        return None, None
+
+    valores = [numero(p) for p in partes]
+    if len(valores) > 1 and (valores[1] >= 60 or (len(valores) == 3 and valores[2] >= 60)):
+        return None, None
+
+    decimal = valores[0]
+    if len(valores) > 1:
+        decimal += valores[1] / 60.0
+    if len(valores) > 2:
+        decimal += valores[2] / 3600.0
+
+    return decimal, ' '.join(p.replace(',', '.') for p in partes)
+
+
+def decimal_para_dms(valor, casas=2):
+    """Converte graus decimais para a string 'G M S' usada nas ferramentas."""
+    graus = int(valor)
+    minutos_dec = (valor - graus) * 60
+    minutos = int(minutos_dec)
+    segundos = round((minutos_dec - minutos) * 60, casas)
+
+    if segundos >= 60:
+        segundos -= 60
+        minutos += 1
+    if minutos >= 60:
+        minutos -= 60
+        graus += 1
+
+    return f"{graus} {minutos} {segundos:.{casas}f}"
+
+
+def formatar_dms(dms_str):
+    """Formata 'G M S' com símbolos de graus, minutos e segundos."""
+    try:
+        parts = dms_str.strip().split()
+        if len(parts) == 1:
+            return f"{float(parts[0]):.0f}°"
+        elif len(parts) == 2:
+            return f"{float(parts[0]):.0f}° {float(parts[1]):.0f}'"
+        elif len(parts) == 3:
+            return f"{float(parts[0]):.0f}° {float(parts[1]):.0f}' {float(parts[2]):.2f}\""
+        else:
+            return dms_str
+    except ValueError:
+        return dms_str
+
+
+def normalizar_quadrante(texto):
+    """Normaliza a grafia do quadrante ('NO' -> 'NW', 'N E' -> 'NE')."""
+    if not texto:
+        return None
+    quadrante = re.sub(r'[^A-Z]', '', texto.upper())
+    quadrante = _QUADRANTES_PT.get(quadrante, quadrante)
+    return quadrante if quadrante in QUADRANTES else None
+
+
+def rumo_para_azimute(rumo_decimal, quadrante):
+    """Converte rumo decimal e quadrante para azimute."""
+    if rumo_decimal is None or rumo_decimal < 0 or rumo_decimal > 90:
+        return None
+
+    if quadrante == 'NE':
+        return rumo_decimal
+    elif quadrante == 'SE':
+        return 180 - rumo_decimal
+    elif quadrante == 'SW':
+        return 180 + rumo_decimal
+    elif quadrante == 'NW':
+        return 360 - rumo_decimal
+    return None
+
+
+def azimute_para_rumo(azimute):
+    """Converte azimute para (rumo_decimal, quadrante)."""
+    azimute = azimute % 360.0
+
+    if azimute <= 90:
+        return azimute, 'NE'
+    elif azimute <= 180:
+        return 180 - azimute, 'SE'
+    elif azimute <= 270:
+        return azimute - 180, 'SW'
+    return 360 - azimute, 'NW'
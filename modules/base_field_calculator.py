@@ -23,16 +23,302 @@
 from qgis.PyQt.QtWidgets import QMessageBox, QDialog
 from qgis.PyQt import uic
 from qgis.core import (QgsProject,QgsField,QgsExpression,QgsExpressionContext,
-                        QgsExpressionContextUtils,QgsWkbTypes,QgsVectorLayer)
-from qgis.PyQt.QtCore import QVariant, Qt
+                        QgsExpressionContextUtils,QgsWkbTypes,QgsVectorLayer,
+                        QgsDistanceArea,QgsFeatureRequest,QgsVectorDataProvider,
+                        QgsVectorLayerFeatureSource,QgsTask,QgsApplication,
+                        QgsMessageLog,Qgis,QgsCoordinateTransform)
+from qgis.PyQt.QtCore import QVariant, Qt, QLocale, pyqtSignal
 from qgis.PyQt.QtGui import QPixmap
+import hashlib
+import json
+import math
 import os
+import threading
+import time
+
+from .calculo_banco import destino_banco, comando_sql, CalculoBancoTask
+
+# Feições por lote de gravação: a memória fica limitada a poucos lotes por vez
+_LOTE = 10000
+
+# Lote da gravação direta na fonte de dados; cada lote gravado é um ponto
+# de retomada do cálculo
+_LOTE_DIRETO = 50000
+
+# Mantém referência às tarefas em execução (o gerenciador não as segura)
+_tarefas_ativas = []
+
+# Propriedade da camada com as definições dos campos vivos (JSON)
+CHAVE_CAMPOS_VIVOS = 'rmcgeo/campos_vivos'
+
+# Monitores de campos vivos por id de camada
+_monitores = {}
+
+# Escopos do cálculo: chave e texto do combo
+ESCOPOS = [
+    ('todas', "Todas as feições"),
+    ('selecionadas', "Feições selecionadas"),
+    ('filtro', "Feições do filtro"),
+    ('extensao', "Feições na extensão do mapa"),
+]
+
+# Compatibilidade QGIS: enum do tipo de filtro do QgsFeatureRequest
+try:
+    FILTRO_FIDS = QgsFeatureRequest.FilterType.FilterFids
+    FILTRO_EXPRESSAO = QgsFeatureRequest.FilterType.FilterExpression
+except AttributeError:
+    FILTRO_FIDS = QgsFeatureRequest.FilterFids
+    FILTRO_EXPRESSAO = QgsFeatureRequest.FilterExpression
+
+# Compatibilidade Qt5/Qt6:
+try:
+    OMITIR_SEPARADOR = QLocale.NumberOption.OmitGroupSeparator  # Qt6
+except AttributeError:
+    OMITIR_SEPARADOR = QLocale.OmitGroupSeparator  # Qt5
 
 # Carrega o arquivo .ui
 FORM_CLASS, _ = uic.loadUiType(os.path.join(
     os.path.dirname(__file__), '..', 'ui', 'coluna_tabela.ui'))
 
 
+class MedidorNativo:
+    """Medidas e formatações equivalentes às funções de expressão do QGIS
+    ($area, $perimeter, $length, $x, $y, centroid, azimuth, format_number e
+    to_string),
+    calculadas diretamente sobre a geometria.
+
+    Usa o mesmo elipsoide e as mesmas unidades do projeto que as expressões,
+    de modo que o resultado é idêntico ao do caminho por expressão."""
+
+    def __init__(self, layer):
+        projeto = QgsProject.instance()
+        self.distancia = QgsDistanceArea()
+        self.distancia.setSourceCrs(layer.crs(), projeto.transformContext())
+        self.distancia.setEllipsoid(projeto.ellipsoid())
+        self.unidade_area = projeto.areaUnits()
+        self.unidade_distancia = projeto.distanceUnits()
+
+        # format_number usa o idioma do QGIS sempre com separador de milhar
+        self.locale = QLocale()
+        self.locale.setNumberOptions(self.locale.numberOptions() & ~OMITIR_SEPARADOR)
+
+    def area(self, geometria):
+        return self.distancia.convertAreaMeasurement(
+            self.distancia.measureArea(geometria), self.unidade_area)
+
+    def perimetro(self, geometria):
+        return self.distancia.convertLengthMeasurement(
+            self.distancia.measurePerimeter(geometria), self.unidade_distancia)
+
+    def comprimento(self, geometria):
+        return self.distancia.convertLengthMeasurement(
+            self.distancia.measureLength(geometria), self.unidade_distancia)
+
+    def x(self, geometria):
+        return geometria.vertexAt(0).x()
+
+    def y(self, geometria):
+        return geometria.vertexAt(0).y()
+
+    def centroide(self, geometria):
+        return geometria.centroid().asPoint()
+
+    def medir(self, medida, geometria):
+        """Valor da medida pelo nome usado em `measures` ('area', 'x', ...)."""
+        if medida == 'centroide_x':
+            return self.centroide(geometria).x()
+        if medida == 'centroide_y':
+            return self.centroide(geometria).y()
+        return getattr(self, medida)(geometria)
+
+    def azimute(self, geometria):
+        """Azimute (graus) do primeiro ao último vértice da geometria."""
+        inicio = geometria.vertexAt(0)
+        fim = geometria.vertexAt(geometria.constGet().nCoordinates() - 1)
+        return math.degrees(math.atan2(fim.x() - inicio.x(), fim.y() - inicio.y())) % 360.0
+
+    def numero(self, valor, casas):
+        """Equivalente a format_number(valor, casas)."""
+        return self.locale.toString(float(valor), 'f', casas)
+
+    def texto(self, valor):
+        """Equivalente à conversão de número em texto das expressões (to_string, ||)."""
+        if valor == int(valor):
+            return str(int(valor))
+        return repr(valor)
+
+
+def formatar_valor(value):
+    """Formata o valor retornado pela expressão."""
+    if isinstance(value, str):
+        try:
+            return float(value.replace(',', '.'))
+        except:
+            return value
+    return value
+
+
+def preparar_expressao(layer, expression_string):
+    """Prepara e valida a expressão QGIS"""
+    expression = QgsExpression(expression_string)
+    context = QgsExpressionContext()
+    context.appendScopes(QgsExpressionContextUtils.globalProjectLayerScopes(layer))
+    expression.prepare(context)
+
+    if expression.hasParserError():
+        raise Exception(f"Erro na expressão: {expression.parserErrorString()}")
+
+    return expression, context
+
+
+def valores_feicoes(fonte, calculos, medidor, request=None):
+    """Gera (fid, [valores]) calculando todos os campos numa única leitura
+    de cada feição.
+
+    `calculos` é uma lista de (expressão, contexto, função): a função
+    nativa (geometria, medidor) é usada quando existe; senão, a expressão
+    preparada. Sem expressões, os atributos nem são lidos."""
+    request = QgsFeatureRequest(request) if request else QgsFeatureRequest()
+    if all(funcao for _, _, funcao in calculos):
+        request.setNoAttributes()
+
+    for feature in fonte.getFeatures(request):
+        geometria = feature.geometry() if feature.hasGeometry() else None
+        valores = []
+        for expression, context, funcao in calculos:
+            if funcao:
+                valores.append(funcao(geometria, medidor) if geometria else None)
+                continue
+
+            context.setFeature(feature)
+            valores.append(expression.evaluate(context))
+
+            # Verifica se houve erro na avaliação (mostra apenas o primeiro)
+            if expression.hasEvalError():
+                raise Exception(f"Erro ao calcular valor: {expression.evalErrorString()}")
+
+        yield feature.id(), valores
+
+
+# Expressões equivalentes às medidas do MedidorNativo
+EXPRESSOES_MEDIDA = {
+    'area': "$area",
+    'perimetro': "$perimeter",
+    'comprimento': "$length",
+    'x': "$x",
+    'y': "$y",
+    'centroide_x': "x(centroid($geometry))",
+    'centroide_y': "y(centroid($geometry))",
+    'azimute': "degrees(azimuth(start_point($geometry), end_point($geometry)))",
+}
+
+
+def aplicar_operacao(valor, operacao):
+    """Aplica ao valor a operação de uma medida ("/ 10000", "* 100" ou "")."""
+    if not operacao:
+        return valor
+    operador, numero = operacao.split()
+    return valor / float(numero) if operador == '/' else valor * float(numero)
+
+
+def campo_numerico(nome, medida):
+    """Campo (nome, tipo, expressão, função nativa, medida) que grava a
+    medida (medida, operação, casas) como número, arredondado às casas do
+    formato, sem nenhuma formatação de texto."""
+    chave, operacao, casas = medida
+    expressao = f"{EXPRESSOES_MEDIDA[chave]} {operacao}".strip()
+    if casas is not None:
+        expressao = f"round({expressao}, {casas})"
+
+    def funcao(geometria, medidor):
+        valor = aplicar_operacao(medidor.medir(chave, geometria), operacao)
+        return valor if casas is None else round(valor, casas)
+
+    return (nome, QVariant.Double, expressao, funcao, medida)
+
+
+def expressao_texto(medida):
+    """Expressão que grava a medida (medida, operação, casas) como texto:
+    format_number com as casas do formato, ou to_string sem casas."""
+    chave, operacao, casas = medida
+    expressao = f"{EXPRESSOES_MEDIDA[chave]} {operacao}".strip()
+    if casas is None:
+        return f"to_string({expressao})"
+    return f"format_number({expressao}, {casas})"
+
+
+def funcao_texto(medida):
+    """Função nativa (geometria, medidor) equivalente a expressao_texto."""
+    chave, operacao, casas = medida
+
+    def funcao(geometria, medidor):
+        valor = aplicar_operacao(medidor.medir(chave, geometria), operacao)
+        return medidor.texto(valor) if casas is None else medidor.numero(valor, casas)
+
+    return funcao
+
+
+def preparar_calculos(layer, campos):
+    """Lista de (expressão, contexto, função) de cada campo (nome, tipo,
+    expressão, função nativa, medida), para valores_feicoes."""
+    calculos = []
+    for _, _, expression_string, funcao, _ in campos:
+        if funcao:
+            calculos.append((None, None, funcao))
+        else:
+            calculos.append((*preparar_expressao(layer, expression_string), None))
+    return calculos
+
+
+def filtrar_apos(request, fid):
+    """Restringe o request às feições com fid maior que `fid`, mantendo o filtro existente"""
+    if request.filterType() == FILTRO_FIDS:
+        request.setFilterFids([f for f in request.filterFids() if f > fid])
+    elif request.filterType() == FILTRO_EXPRESSAO:
+        request.setFilterExpression(f"({request.filterExpression().expression()}) AND $id > {fid}")
+    else:
+        request.setFilterExpression(f"$id > {fid}")
+    return request
+
+
+def pasta_retomada():
+    """Pasta dos pontos de retomada no perfil do usuário do QGIS."""
+    pasta = os.path.join(QgsApplication.qgisSettingsDirPath(), 'rmcgeo', 'retomada')
+    os.makedirs(pasta, exist_ok=True)
+    return pasta
+
+
+def chave_retomada(layer, campos, escopo):
+    """Identifica um cálculo pela fonte da camada, pelos campos e expressões
+    e pelo escopo das feições."""
+    dados = json.dumps([layer.source(), [(nome, expressao) for nome, _, expressao, *_ in campos], escopo])
+    return hashlib.sha1(dados.encode('utf-8')).hexdigest()
+
+
+def ler_retomada(chave):
+    """Ponto de retomada {'ultimo_fid', 'gravadas'} de um cálculo interrompido, ou None."""
+    try:
+        with open(os.path.join(pasta_retomada(), chave + '.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def gravar_retomada(chave, dados):
+    """Grava o ponto de retomada sem deixar um arquivo pela metade."""
+    caminho = os.path.join(pasta_retomada(), chave + '.json')
+    with open(caminho + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(dados, f)
+    os.replace(caminho + '.tmp', caminho)
+
+
+def apagar_retomada(chave):
+    try:
+        os.remove(os.path.join(pasta_retomada(), chave + '.json'))
+    except OSError:
+        pass
+
+
 class BaseCalculadoraTabela(QDialog, FORM_CLASS):
     """Classe base para criar ferramentas que adicionam campos calculados
     nas tabelas de atributos das camadas."""
@@ -43,8 +329,15 @@ class BaseCalculadoraTabela(QDialog, FORM_CLASS):
     field_type = QVariant.Double
     expression_string = "$area"
     geometry_types = None  # None = aceita todos os tipos
-    format_options = None  # None = sem opções de formatação, ou dicionário
     field_names_by_format = None  # None = nome fixo, ou dicionário
+    # Medida (medida, operação, casas) de cada formato ("Padrão" quando não há
+    # opções), ex. ("area", "/ 10000", 2): dela saem o texto formatado, a
+    # função nativa, o valor numérico e o cálculo no banco (ver calculo_banco)
+    measures = None
+    # Formatos sem medida, sempre gravados como texto: expressão de cada um e,
+    # opcionalmente, a função (geometria, medidor) -> valor equivalente
+    format_options = None
+    native_functions = None
 
     def __init__(self, iface):
         super().__init__()
@@ -73,20 +366,56 @@ class BaseCalculadoraTabela(QDialog, FORM_CLASS):
 
         self.configurar_formatacao_combo()
 
+        for chave, texto in ESCOPOS:
+            self.escopoCombo.addItem(texto, chave)
+        self.filtroEdit.setEnabled(False)
+
         self.popular_camadas()
 
+        # Cálculo em andamento (tarefa, camada e contadores), ou None
+        self.calculo = None
+        self.em_execucao(False)
+
         self.salvarButton.clicked.connect(self.add_campo)
 
+        self.cancelarButton.clicked.connect(self.cancelar_calculo)
+
         self.coluna_combo.currentIndexChanged.connect(self.ao_mudar_camada)
 
         self.formatacao_combo.currentIndexChanged.connect(self.ao_mudar_formato)
 
+        self.escopoCombo.currentIndexChanged.connect(self.ao_mudar_escopo)
+
+    @classmethod
+    def opcoes_formato(cls):
+        """Formatos oferecidos no combo, na ordem em que foram declarados
+        (primeiro os sem medida), ou lista vazia se só houver o "Padrão"."""
+        nomes = list(cls.format_options or {})
+        nomes += [nome for nome in (cls.measures or {}) if nome not in nomes]
+        return [nome for nome in nomes if nome != "Padrão"]
+
+    @classmethod
+    def expressao_formato(cls, formato):
+        """Expressão (texto formatado) de um formato"""
+        if cls.format_options and formato in cls.format_options:
+            return cls.format_options[formato]
+        medida = (cls.measures or {}).get(formato)
+        return expressao_texto(medida) if medida else cls.expression_string
+
+    @classmethod
+    def funcao_formato(cls, formato):
+        """Função nativa de um formato, ou None para usar a expressão"""
+        if cls.native_functions and formato in cls.native_functions:
+            return cls.native_functions[formato]
+        medida = (cls.measures or {}).get(formato)
+        return funcao_texto(medida) if medida else None
+
     def configurar_formatacao_combo(self):
         """Configura o combo box de formatação"""
         self.formatacao_combo.clear()
 
-        if self.format_options:
-            for format_name in self.format_options.keys():
+        if self.opcoes_formato():
+            for format_name in self.opcoes_formato():
                 self.formatacao_combo.addItem(format_name)
             self.formatacao_combo.setEnabled(True)
         else:
@@ -95,7 +424,7 @@ class BaseCalculadoraTabela(QDialog, FORM_CLASS):
 
     def ao_mudar_formato(self):
         """Atualiza quando o formato é alterado"""
-        if self.format_options:
+        if self.opcoes_formato():
             selected_format = self.formatacao_combo.currentText()
 
             if self.field_names_by_format and selected_format in self.field_names_by_format:
@@ -103,6 +432,8 @@ class BaseCalculadoraTabela(QDialog, FORM_CLASS):
 
             self.status_label.setText(f"Status: Formato selecionado - {selected_format}")
 
+        self.atualizar_vivo_check()
+
     def nome_tipo_geometria(self, geom_type):
         """Retorna o nome legível do tipo de geometria"""
         if geom_type == QgsWkbTypes.PointGeometry:
@@ -154,15 +485,71 @@ class BaseCalculadoraTabela(QDialog, FORM_CLASS):
             if layer:
                 feature_count = layer.featureCount()
                 self.status_label.setText(f"Status: {feature_count} feições na camada")
+                self.filtroEdit.setLayer(layer)
 
-    def formatar_valor(self, value):
-        """Formata o valor retornado pela expressão."""
-        if isinstance(value, str):
-            try:
-                return float(value.replace(',', '.'))
-            except:
-                return value
-        return value
+        self.atualizar_vivo_check()
+
+    def ao_mudar_escopo(self):
+        """Habilita a expressão de filtro apenas no escopo do filtro"""
+        self.filtroEdit.setEnabled(self.escopoCombo.currentData() == 'filtro')
+
+    def escopo_calculo(self, layer):
+        """Request das feições a calcular, descrição do escopo e total de
+        feições (-1 se só o provedor souber).
+
+        O filtro vai no próprio request: fids, expressão (que o provedor
+        compila para SQL quando pode) ou retângulo (índice espacial), de modo
+        que a camada não é percorrida inteira. Levanta ValueError se o
+        escopo não puder ser aplicado."""
+        escopo = self.escopoCombo.currentData()
+        request = QgsFeatureRequest()
+
+        if escopo == 'selecionadas':
+            fids = sorted(layer.selectedFeatureIds())
+            if not fids:
+                raise ValueError("Nenhuma feição selecionada na camada.")
+            request.setFilterFids(fids)
+            return request, [escopo, fids], len(fids)
+
+        if escopo == 'filtro':
+            expressao = self.filtroEdit.expression().strip()
+            if not expressao:
+                raise ValueError("Informe a expressão do filtro.")
+            filtro = QgsExpression(expressao)
+            if filtro.hasParserError():
+                raise ValueError(f"Erro no filtro: {filtro.parserErrorString()}")
+            context = QgsExpressionContext()
+            context.appendScopes(QgsExpressionContextUtils.globalProjectLayerScopes(layer))
+            request.setFilterExpression(expressao)
+            request.setExpressionContext(context)
+            return request, [escopo, expressao], -1
+
+        if escopo == 'extensao':
+            canvas = self.iface.mapCanvas()
+            transform = QgsCoordinateTransform(canvas.mapSettings().destinationCrs(),
+                                               layer.crs(), QgsProject.instance())
+            retangulo = transform.transformBoundingBox(canvas.extent())
+            request.setFilterRect(retangulo)
+            return request, [escopo, retangulo.toString()], -1
+
+        return request, [escopo], layer.featureCount()
+
+    def atualizar_vivo_check(self):
+        """Marca a opção de campo vivo quando os campos já são mantidos atualizados"""
+        layer = self.coluna_combo.currentData()
+        campos = self.campos_calculo()
+        vivos = campos_vivos(layer) if layer else {}
+        self.vivoCheck.setChecked(bool(campos) and all(nome in vivos for nome, *_ in campos))
+
+    def gravar_campos_vivos(self, layer, campos, vivo):
+        """Registra os campos como vivos, ou deixa de mantê-los atualizados"""
+        definicoes = campos_vivos(layer)
+        for nome, _, expression_string, *_ in campos:
+            if vivo:
+                definicoes[nome] = expression_string
+            else:
+                definicoes.pop(nome, None)
+        definir_campos_vivos(layer, definicoes)
 
     def validar_camada_selecionada(self):
         """Valida se há uma camada selecionada"""
@@ -187,20 +574,71 @@ class BaseCalculadoraTabela(QDialog, FORM_CLASS):
 
     def obter_expressao_calculo(self):
         """Obtém a expressão de cálculo baseada no formato selecionado"""
-        if self.format_options:
-            selected_format = self.formatacao_combo.currentText()
-            return self.format_options[selected_format]
-        else:
-            return self.expression_string
+        return self.expressao_formato(self.formatacao_combo.currentText())
+
+    def obter_funcao_nativa(self):
+        """Função nativa do formato selecionado, ou None para usar a expressão."""
+        return self.funcao_formato(self.formatacao_combo.currentText())
+
+    def obter_medida(self):
+        """Medida (medida, operação, casas) do formato selecionado, ou None."""
+        if not self.measures:
+            return None
+        return self.measures.get(self.formatacao_combo.currentText())
+
+    def campos_calculo(self):
+        """Campos a calcular: lista de (nome, tipo, expressão, função nativa
+        ou None, medida ou None), na forma de texto formatado; ver definir_tipos"""
+        return [(self.field_name, self.field_type, self.obter_expressao_calculo(),
+                 self.obter_funcao_nativa(), self.obter_medida())]
 
-    def verificar_campo_existente(self, layer):
-        """Verifica se o campo já existe e pergunta ao usuário se deseja recalcular"""
+    def definir_tipos(self, layer, campos):
+        """Troca os campos com medida pela versão numérica, a menos que o texto
+        formatado seja pedido.
+
+        Campos que já existem como texto (criados por versões anteriores)
+        continuam recebendo o texto formatado, para não misturar números
+        crus com valores formatados na mesma coluna. Retorna os campos e os
+        nomes dos que foram mantidos como texto."""
+        if self.textoCheck.isChecked():
+            return campos, []
+
+        saida, mantidos = [], []
+        for campo in campos:
+            nome, _, _, _, medida = campo
+            indice = layer.fields().indexFromName(nome)
+            if medida and indice >= 0 and layer.fields().at(indice).type() == QVariant.String:
+                mantidos.append(nome)
+                saida.append(campo)
+            elif medida:
+                saida.append(campo_numerico(nome, medida))
+            else:
+                saida.append(campo)
+        return saida, mantidos
+
+    def verificar_tipos(self, layer, campos):
+        """Mensagem se algum campo texto já existir como numérico (o texto
+        formatado não seria convertido), ou None"""
+        for nome, tipo, *_ in campos:
+            indice = layer.fields().indexFromName(nome)
+            if indice >= 0 and tipo == QVariant.String and layer.fields().at(indice).isNumeric():
+                return (f"O campo '{nome}' já existe como numérico.\n"
+                        f"Desmarque a opção de texto formatado para recalculá-lo.")
+        return None
+
+    def verificar_campo_existente(self, layer, campos):
+        """Verifica se os campos já existem e pergunta ao usuário se deseja recalcular"""
         field_names = [field.name() for field in layer.fields()]
-        if self.field_name in field_names:
+        existentes = [nome for nome, *_ in campos if nome in field_names]
+        if existentes:
+            if len(existentes) == 1:
+                texto = f"O campo '{existentes[0]}' já existe na camada."
+            else:
+                texto = f"Os campos '{', '.join(existentes)}' já existem na camada."
             reply = QMessageBox.question(
                 self,
                 "Campo já existe",
-                f"O campo '{self.field_name}' já existe na camada.\nDeseja recalcular os valores?",
+                f"{texto}\nDeseja recalcular os valores?",
                 QMessageBox.Yes | QMessageBox.No
             )
             if reply == QMessageBox.No:
@@ -208,82 +646,340 @@ class BaseCalculadoraTabela(QDialog, FORM_CLASS):
             return True
         return False
 
-    def criar_campo(self, layer):
-        """Cria o campo na camada se não existir"""
-        field = QgsField(self.field_name, self.field_type)
-        # Define tamanho para campos String
-        if self.field_type == QVariant.String:
-            field.setLength(254)
-        layer.addAttribute(field)
-        layer.updateFields()
+    def criar_campos(self, layer, campos, direto=False):
+        """Cria os campos que não existem na camada (na fonte de dados, se `direto`)"""
+        novos = []
+        for nome, tipo, _, _, medida in campos:
+            if nome in layer.fields().names():
+                continue
+            field = QgsField(nome, tipo)
+            # Define tamanho para campos String
+            if tipo == QVariant.String:
+                field.setLength(254)
+            # Largura e casas decimais da unidade escolhida
+            elif medida and medida[2] is not None:
+                field.setLength(20)
+                field.setPrecision(medida[2])
+            novos.append(field)
 
-    def preparar_expressao(self, layer, expression_string):
-        """Prepara e valida a expressão QGIS"""
-        expression = QgsExpression(expression_string)
-        context = QgsExpressionContext()
-        context.appendScopes(QgsExpressionContextUtils.globalProjectLayerScopes(layer))
-        expression.prepare(context)
+        if not novos:
+            return
+        if direto:
+            if not layer.dataProvider().addAttributes(novos):
+                raise Exception("A fonte de dados não permitiu criar o campo.")
+        else:
+            for field in novos:
+                layer.addAttribute(field)
+        layer.updateFields()
 
-        if expression.hasParserError():
-            raise Exception(f"Erro na expressão: {expression.parserErrorString()}")
+    def pode_gravar_direto(self, layer, campos):
+        """Verifica se a fonte de dados aceita a gravação direta; retorna a
+        mensagem do impedimento ou None."""
+        if layer.isEditable():
+            return "Encerre o modo de edição da camada para gravar direto na fonte de dados."
 
-        return expression, context
+        capacidades = layer.dataProvider().capabilities()
+        if not capacidades & QgsVectorDataProvider.ChangeAttributeValues:
+            return "A fonte de dados desta camada não permite alterar atributos."
+        faltando = [nome for nome, *_ in campos if nome not in layer.fields().names()]
+        if faltando and not capacidades & QgsVectorDataProvider.AddAttributes:
+            return "A fonte de dados desta camada não permite criar campos."
+        return None
 
-    def calcular_valores_feicoes(self, layer, expression, context, field_index):
-        """Calcula e atualiza os valores para todas as feições"""
-        # Agrupa todas as alterações em um único comando de edição
-        layer.beginEditCommand(f"Calcular Campo {self.field_name} (RMCGEO)")
+    def obter_valores(self, layer, campos, indices, request=None):
+        """Prepara, na thread principal, o cálculo que será percorrido pela tarefa.
 
-        feature_count = 0
-        error_count = 0
-        try:
-            for feature in layer.getFeatures():
-                context.setFeature(feature)
-                value = expression.evaluate(context)
-
-                # Verifica se houve erro na avaliação
-                if expression.hasEvalError():
-                    error_count += 1
-                    if error_count == 1:  # Mostra apenas o primeiro erro
-                        raise Exception(f"Erro ao calcular valor: {expression.evalErrorString()}")
-
-                value = self.formatar_valor(value)
-                layer.changeAttributeValue(feature.id(), field_index, value)
-                feature_count += 1
-            
-            # Se terminou o loop com sucesso, confirma o comando
-            layer.endEditCommand()
-            return feature_count
-        except Exception:
-            # Em caso de erro, cancela apenas este comando de cálculo
-            layer.destroyEditCommand()
-            raise
+        Gera (fid, {índice: valor}) para todos os campos das feições de
+        `request`. Medidas simples são calculadas direto na geometria; as
+        demais pela expressão. As feições são lidas de uma cópia da fonte da
+        camada, segura para uso fora da thread principal."""
+        valores = valores_feicoes(QgsVectorLayerFeatureSource(layer),
+                                  preparar_calculos(layer, campos), MedidorNativo(layer), request)
+        return ((fid, {indice: formatar_valor(valor) for indice, valor in zip(indices, lista)})
+                for fid, lista in valores)
 
-    def mostrar_resultado(self, field_exists, feature_count):
+    def mostrar_resultado(self, campos, field_exists, feature_count):
         """Mostra mensagem de sucesso ao usuário"""
         self.status_label.setText(f"Status: Concluído - {feature_count} feições processadas")
+        acao = 'atualizado' if field_exists else 'adicionado'
+        if len(campos) == 1:
+            texto = f"Campo '{campos[0][0]}' {acao} com sucesso!"
+        else:
+            nomes = ", ".join(nome for nome, *_ in campos)
+            texto = f"Campos {nomes} {acao}s com sucesso!"
         QMessageBox.information(
             self,
             "Sucesso",
-            f"Campo '{self.field_name}' {'atualizado' if field_exists else 'adicionado'} com sucesso!\n"
-            f"{feature_count} feições processadas."
+            f"{texto}\n{feature_count} feições processadas."
+        )
+
+    def em_execucao(self, executando):
+        """Alterna os controles entre o cálculo em andamento e o repouso"""
+        self.salvarButton.setEnabled(not executando)
+        self.coluna_combo.setEnabled(not executando)
+        self.formatacao_combo.setEnabled(not executando and bool(self.opcoes_formato()))
+        self.diretoCheck.setEnabled(not executando)
+        self.vivoCheck.setEnabled(not executando)
+        self.textoCheck.setEnabled(not executando)
+        self.escopoCombo.setEnabled(not executando)
+        self.filtroEdit.setEnabled(not executando and self.escopoCombo.currentData() == 'filtro')
+        self.cancelarButton.setVisible(executando)
+        self.progressBar.setVisible(executando)
+        self.progressBar.setValue(0)
+
+    def mostrar_progresso(self):
+        """Atualiza a barra e o status com o total gravado e a vazão"""
+        calculo = self.calculo
+        decorrido = time.perf_counter() - calculo['inicio']
+        vazao = (calculo['gravadas'] - calculo['retomadas']) / decorrido if decorrido > 0 else 0.0
+
+        if calculo['total'] > 0:
+            self.progressBar.setValue(int(100 * calculo['gravadas'] / calculo['total']))
+            self.status_label.setText(
+                f"Status: {calculo['gravadas']} de {calculo['total']} feições ({vazao:.0f} feições/s)")
+        else:
+            self.status_label.setText(f"Status: {calculo['gravadas']} feições ({vazao:.0f} feições/s)")
+
+    def aplicar_lote(self, lote):
+        """Grava na thread principal um lote {fid: {campo: valor}} calculado pela tarefa"""
+        calculo = self.calculo
+        layer = calculo['layer']
+        try:
+            if calculo['direto']:
+                provider = layer.dataProvider()
+                if not provider.changeAttributeValues(lote):
+                    erros = "; ".join(provider.errors()) or "erro desconhecido"
+                    raise Exception(f"A fonte de dados recusou a gravação: {erros}")
+                self.marcar_retomada(lote)
+            else:
+                for fid, atributos in lote.items():
+                    layer.changeAttributeValues(fid, atributos)
+        except Exception as e:
+            calculo['erro'] = str(e)
+            calculo['tarefa'].cancel()
+        else:
+            calculo['gravadas'] += len(lote)
+            self.mostrar_progresso()
+        finally:
+            calculo['tarefa'].lote_gravado()
+
+    def perguntar_retomada(self, chave):
+        """Oferece continuar um cálculo interrompido; retorna o ponto de retomada ou None"""
+        retomada = ler_retomada(chave)
+        if not retomada:
+            return None
+
+        reply = QMessageBox.question(
+            self,
+            "Cálculo interrompido",
+            f"Um cálculo anterior destes campos foi interrompido após "
+            f"{retomada['gravadas']} feições gravadas na fonte de dados.\n"
+            f"Deseja continuar de onde parou?",
+            QMessageBox.Yes | QMessageBox.No
         )
+        if reply == QMessageBox.Yes:
+            return retomada
+        apagar_retomada(chave)
+        return None
+
+    def marcar_retomada(self, lote):
+        """Registra o último fid de um lote já gravado na fonte de dados.
+
+        A retomada filtra as feições com fid maior que o registrado, então só
+        vale se a fonte entrega as feições em ordem crescente de fid (caso do
+        shapefile e do GeoPackage); do contrário o ponto é descartado."""
+        calculo = self.calculo
+        if not calculo['chave']:
+            return
+
+        fids = list(lote)
+        ultimo = calculo['ultimo_fid']
+        if (ultimo is not None and fids[0] <= ultimo) or any(a >= b for a, b in zip(fids, fids[1:])):
+            apagar_retomada(calculo['chave'])
+            calculo['chave'] = None
+            return
+
+        calculo['ultimo_fid'] = fids[-1]
+        gravar_retomada(calculo['chave'], {'ultimo_fid': fids[-1],
+                                           'gravadas': calculo['gravadas'] + len(fids)})
+
+    def cancelar_calculo(self):
+        """Pede o cancelamento da tarefa; a limpeza é feita ao terminar"""
+        if not self.calculo:
+            return
+        if self.calculo['banco']:
+            self.status_label.setText("Status: O cálculo no banco de dados não pode ser interrompido")
+            return
+        self.status_label.setText("Status: Cancelando...")
+        self.calculo['tarefa'].cancel()
+
+    def comando_banco(self, layer, campos):
+        """Destino e comando SQL para calcular os campos no banco, ou None
+        se a camada ou algum campo exigir o cálculo no QGIS"""
+        try:
+            destino = destino_banco(layer)
+            return destino, comando_sql(destino, campos, MedidorNativo(layer))
+        except Exception:
+            # Sem suporte (SemSuporteBanco) ou falha ao consultar o banco
+            return None
+
+    def executar_tarefa(self, tarefa):
+        self.calculo['tarefa'] = tarefa
+        self.calculo['inicio'] = time.perf_counter()
+        _tarefas_ativas.append(tarefa)
+        QgsApplication.taskManager().addTask(tarefa)
+
+    def calcular_no_qgis(self, valores):
+        """Lê e calcula as feições numa tarefa, gravando os lotes na thread principal"""
+        self.calculo['banco'] = False
+        lote = _LOTE_DIRETO if self.calculo['direto'] else _LOTE
+        tarefa = CalculoCampoTask(self.calculo['descricao'], valores, self.ao_terminar, lote)
+        tarefa.loteCalculado.connect(self.aplicar_lote)
+        self.executar_tarefa(tarefa)
+
+    def calcular_no_banco(self, destino, comando, valores):
+        """Executa o cálculo no banco; se o banco recusar, calcula no QGIS"""
+        self.calculo['banco'] = True
+        self.status_label.setText("Status: Calculando no banco de dados...")
+        self.progressBar.setRange(0, 0)
+
+        def ao_terminar_banco(resultado, erro):
+            _tarefas_ativas.remove(tarefa)
+            self.progressBar.setRange(0, 100)
+            if resultado:
+                self.calculo['gravadas'] = self.calculo['total']
+                self.ao_terminar(True, None)
+            else:
+                # Função ausente, banco bloqueado etc.: o caminho no QGIS grava tudo de novo
+                self.status_label.setText("Status: O banco recusou o cálculo; calculando no QGIS...")
+                self.calculo['erro_banco'] = erro
+                self.calcular_no_qgis(valores)
+
+        tarefa = CalculoBancoTask(self.calculo['descricao'], destino, comando, ao_terminar_banco)
+        self.executar_tarefa(tarefa)
+
+    def ao_terminar(self, resultado, erro_calculo):
+        """Confirma ou desfaz as alterações quando a tarefa termina"""
+        calculo = self.calculo
+        self.calculo = None
+        self.em_execucao(False)
+
+        layer = calculo['layer']
+        erro = calculo['erro'] or erro_calculo
+        sucesso = resultado and not erro
+
+        if calculo['direto']:
+            # Lotes já gravados na fonte de dados não podem ser desfeitos
+            layer.reload()
+        elif sucesso:
+            layer.endEditCommand()
+        else:
+            # Desfaz tudo o que este cálculo gravou no buffer de edição
+            layer.destroyEditCommand()
+            if calculo['iniciou_edicao']:
+                layer.rollBack()
+
+        layer.triggerRepaint()
+        self.iface.mapCanvas().refresh()
+
+        decorrido = time.perf_counter() - calculo['inicio']
+        processadas = calculo['gravadas'] - calculo['retomadas']
+        vazao = f"{processadas / decorrido:.0f} feições/s" if decorrido > 0 else ""
+
+        if sucesso:
+            if calculo['chave']:
+                apagar_retomada(calculo['chave'])
+            if calculo['erro_banco']:
+                QgsMessageLog.logMessage(
+                    f"Cálculo no banco recusado, feito no QGIS: {calculo['erro_banco']}",
+                    "RMCGEO", Qgis.Info)
+            self.gravar_campos_vivos(layer, calculo['campos'], calculo['vivo'])
+            self.mostrar_resultado(calculo['campos'], calculo['field_exists'], calculo['gravadas'])
+            self.status_label.setText(f"{self.status_label.text()} ({vazao})")
+            return
+
+        gravadas = ""
+        if calculo['direto'] and calculo['gravadas']:
+            gravadas = f"\n{calculo['gravadas']} feições já haviam sido gravadas na fonte de dados."
+            if calculo['chave']:
+                gravadas += "\nAo repetir o cálculo, ele poderá continuar de onde parou."
+
+        if erro:
+            self.status_label.setText("Status: Erro no processamento")
+            QMessageBox.critical(
+                self,
+                "Erro",
+                f"Erro ao adicionar/atualizar o campo:\n{erro}{gravadas}"
+            )
+        else:
+            self.status_label.setText("Status: Cálculo cancelado")
+            if gravadas:
+                QMessageBox.warning(self, "Cálculo cancelado", gravadas.strip())
+
+    def reject(self):
+        """Não fecha o diálogo com um cálculo em andamento: cancela primeiro"""
+        if self.calculo:
+            self.cancelar_calculo()
+            return
+        super().reject()
 
     def add_campo(self):
-        """Adiciona o campo calculado na camada selecionada"""
+        """Adiciona os campos calculados na camada selecionada"""
         # Valida a camada
         layer = self.validar_camada_selecionada()
         if not layer:
             return
 
-        # Obtém a expressão
-        current_expression = self.obter_expressao_calculo()
+        # Obtém os campos, com suas expressões e funções nativas
+        campos = self.campos_calculo()
+        if not campos:
+            QMessageBox.warning(self, "Aviso", "Selecione ao menos uma medida!")
+            return
+        nomes = ", ".join(nome for nome, *_ in campos)
+
+        campos, mantidos = self.definir_tipos(layer, campos)
+        if mantidos:
+            self.iface.messageBar().pushInfo(
+                "RMCGEO", f"Campo(s) {', '.join(mantidos)} já existe(m) como texto e "
+                          f"continua(m) recebendo o valor formatado.")
+
+        # Gravação direta na fonte de dados, fora do modo de edição
+        direto = self.diretoCheck.isChecked()
+        if direto:
+            impedimento = self.pode_gravar_direto(layer, campos)
+            if impedimento:
+                QMessageBox.warning(self, "Aviso", impedimento)
+                return
+
+        impedimento = self.verificar_tipos(layer, campos)
+        if impedimento:
+            QMessageBox.warning(self, "Aviso", impedimento)
+            return
 
         # Verifica se o campo já existe
-        field_exists = self.verificar_campo_existente(layer)
+        field_exists = self.verificar_campo_existente(layer, campos)
         if field_exists is None:  # Usuário cancelou
             return
 
+        # Feições a calcular
+        try:
+            request, escopo, total = self.escopo_calculo(layer)
+        except ValueError as e:
+            QMessageBox.warning(self, "Aviso", str(e))
+            return
+
+        # Na gravação direta, um cálculo interrompido pode continuar de onde parou
+        chave = chave_retomada(layer, campos, escopo) if direto else None
+        retomada = None
+        if chave and field_exists:
+            retomada = self.perguntar_retomada(chave)
+        elif chave:
+            apagar_retomada(chave)
+
+        if retomada:
+            filtrar_apos(request, int(retomada['ultimo_fid']))
+        retomadas = retomada['gravadas'] if retomada else 0
+
         # Atualiza o status
         self.status_label.setText("Status: Processando...")
 
@@ -291,43 +987,30 @@ class BaseCalculadoraTabela(QDialog, FORM_CLASS):
         was_editing = layer.isEditable()
 
         # Inicia a edição da camada se não estiver editando
-        if not was_editing:
+        if not was_editing and not direto:
             layer.startEditing()
 
         try:
-            # Se já estivermos editando, o EditCommand dentro de calcular_valores_feicoes
-            # cuidará da proteção e do Undo atômico.
-            
-            # Cria o campo se não existir
-            if not field_exists:
+            # Cria os campos que não existem
+            if any(nome not in layer.fields().names() for nome, *_ in campos):
                 # O addAttribute também deve ser protegido se a camada já estiver em edição
                 if was_editing:
-                    layer.beginEditCommand(f"Adicionar Coluna {self.field_name}")
-                
-                self.criar_campo(layer)
-                
-                if was_editing:
-                    layer.endEditCommand()
-
-            # Obtém o índice do campo
-            field_index = layer.fields().indexFromName(self.field_name)
+                    layer.beginEditCommand(f"Adicionar Coluna {nomes}")
 
-            # Prepara a expressão
-            expression, context = self.preparar_expressao(layer, current_expression)
+                self.criar_campos(layer, campos, direto)
 
-            # Calcula os valores (esta função agora tem seu próprio EditCommand interno)
-            feature_count = self.calcular_valores_feicoes(layer, expression, context, field_index)
+                if was_editing:
+                    layer.endEditCommand()
 
-            # Mostra resultado
-            self.mostrar_resultado(field_exists, feature_count)
+            # Índices dos campos na fonte de dados (podem diferir dos da camada)
+            fields = layer.dataProvider().fields() if direto else layer.fields()
+            indices = [fields.indexFromName(nome) for nome, *_ in campos]
 
-            # Atualiza a camada
-            layer.triggerRepaint()
-            self.iface.mapCanvas().refresh()
+            valores = self.obter_valores(layer, campos, indices, request)
 
         except Exception as e:
             # Mudança Crítica: Só damos Rollback se foi nossa ferramenta que iniciou a edição
-            if not was_editing:
+            if not was_editing and not direto:
                 layer.rollBack()
             
             self.status_label.setText("Status: Erro no processamento")
@@ -336,3 +1019,215 @@ class BaseCalculadoraTabela(QDialog, FORM_CLASS):
                 "Erro",
                 f"Erro ao adicionar/atualizar o campo:\n{str(e)}"
             )
+            return
+
+        # Todas as alterações dos lotes entram em um único comando de edição
+        if not direto:
+            layer.beginEditCommand(f"Calcular Campo {nomes} (RMCGEO)")
+
+        self.calculo = {
+            'descricao': f"Calcular Campo {nomes} (RMCGEO)",
+            'tarefa': None,
+            'banco': False,
+            'layer': layer,
+            'campos': campos,
+            'direto': direto,
+            'vivo': self.vivoCheck.isChecked(),
+            'field_exists': field_exists,
+            'iniciou_edicao': not was_editing and not direto,
+            'total': total,
+            'gravadas': retomadas,
+            'retomadas': retomadas,
+            'chave': chave,
+            'ultimo_fid': retomada['ultimo_fid'] if retomada else None,
+            'inicio': time.perf_counter(),
+            'erro': None,
+            'erro_banco': None,
+        }
+        self.em_execucao(True)
+
+        # Na gravação direta, PostGIS e GeoPackage calculam a camada toda num UPDATE
+        banco = self.comando_banco(layer, campos) if direto and escopo == ['todas'] else None
+        if banco:
+            self.calcular_no_banco(*banco, valores)
+        else:
+            self.calcular_no_qgis(valores)
+
+
+class CalculoCampoTask(QgsTask):
+    """Lê as feições e calcula os valores em segundo plano.
+
+    Os valores são entregues em lotes {fid: {campo: valor}} pelo sinal
+    loteCalculado e gravados na thread principal, que é a única que pode
+    alterar a camada. No máximo dois lotes ficam aguardando gravação, de
+    modo que a memória não cresce com o tamanho da camada."""
+
+    loteCalculado = pyqtSignal(object)
+
+    def __init__(self, descricao, valores, ao_terminar, tamanho_lote=_LOTE):
+        super().__init__(descricao, QgsTask.CanCancel)
+        self.valores = valores
+        self.ao_terminar = ao_terminar
+        self.tamanho_lote = tamanho_lote
+        self.livres = threading.Semaphore(2)
+        self.erro = None
+
+    def entregar(self, lote):
+        """Espera a gravação dos lotes anteriores e envia o lote; False se cancelado"""
+        while not self.livres.acquire(timeout=0.1):
+            if self.isCanceled():
+                return False
+        if self.isCanceled():
+            return False
+        self.loteCalculado.emit(lote)
+        return True
+
+    def lote_gravado(self):
+        self.livres.release()
+
+    def run(self):
+        try:
+            lote = {}
+            for fid, atributos in self.valores:
+                if self.isCanceled():
+                    return False
+                lote[fid] = atributos
+                if len(lote) >= self.tamanho_lote:
+                    if not self.entregar(lote):
+                        return False
+                    lote = {}
+
+            return self.entregar(lote) if lote else True
+
+        except Exception as e:
+            self.erro = str(e)
+            return False
+
+    def finished(self, result):
+        if self in _tarefas_ativas:
+            _tarefas_ativas.remove(self)
+        self.ao_terminar(result, self.erro)
+
+
+def campos_vivos(layer):
+    """Definições {campo: expressão} dos campos vivos da camada, gravadas
+    numa propriedade da camada (e, portanto, no projeto)"""
+    try:
+        return json.loads(layer.customProperty(CHAVE_CAMPOS_VIVOS, '') or '{}')
+    except ValueError:
+        return {}
+
+
+def definir_campos_vivos(layer, definicoes):
+    """Grava as definições dos campos vivos e liga ou desliga o monitor da camada"""
+    if definicoes:
+        layer.setCustomProperty(CHAVE_CAMPOS_VIVOS, json.dumps(definicoes))
+    else:
+        layer.removeCustomProperty(CHAVE_CAMPOS_VIVOS)
+    monitorar_camada(layer)
+
+
+def monitorar_camada(layer):
+    """Mantém um monitor apenas nas camadas que têm campos vivos"""
+    if not isinstance(layer, QgsVectorLayer):
+        return
+
+    definido = bool(campos_vivos(layer))
+    if definido and layer.id() not in _monitores:
+        _monitores[layer.id()] = MonitorCamposVivos(layer)
+    elif not definido and layer.id() in _monitores:
+        _monitores.pop(layer.id()).desligar()
+
+
+def _ao_adicionar_camadas(camadas):
+    for layer in camadas:
+        monitorar_camada(layer)
+
+
+def _ao_remover_camadas(ids):
+    for layer_id in ids:
+        if layer_id in _monitores:
+            _monitores.pop(layer_id).desligar()
+
+
+def ligar_campos_vivos():
+    """Passa a monitorar as camadas do projeto (atuais e futuras)"""
+    projeto = QgsProject.instance()
+    projeto.layersAdded.connect(_ao_adicionar_camadas)
+    projeto.layersWillBeRemoved.connect(_ao_remover_camadas)
+    _ao_adicionar_camadas(projeto.mapLayers().values())
+
+
+def desligar_campos_vivos():
+    projeto = QgsProject.instance()
+    try:
+        projeto.layersAdded.disconnect(_ao_adicionar_camadas)
+        projeto.layersWillBeRemoved.disconnect(_ao_remover_camadas)
+    except TypeError:
+        pass  # Nunca foram ligados
+    _ao_remover_camadas(list(_monitores))
+
+
+class MonitorCamposVivos:
+    """Mantém os campos vivos de uma camada atualizados durante a edição.
+
+    Guarda apenas os fids de feições adicionadas ou com a geometria alterada
+    e recalcula só essas ao salvar a camada. O custo acompanha o número de
+    edições, não o tamanho da camada.
+
+    O recálculo não é feito durante a edição: um comando de edição novo,
+    disparado também pelo Desfazer (que emite geometryChanged), apagaria a
+    pilha de Refazer e dobraria as entradas de Desfazer. Ao salvar, o que
+    for desfeito antes já não conta, e o valor reflete a geometria final."""
+
+    def __init__(self, layer):
+        self.layer = layer
+        self.sujas = set()
+
+        self.conexoes = [
+            (layer.geometryChanged, self.sujas.add),
+            (layer.featureAdded, self.sujas.add),
+            (layer.featureDeleted, self.sujas.discard),
+            (layer.beforeCommitChanges, self.recalcular),
+            (layer.afterRollBack, self.sujas.clear),
+        ]
+        for sinal, slot in self.conexoes:
+            sinal.connect(slot)
+
+    def desligar(self):
+        for sinal, slot in self.conexoes:
+            try:
+                sinal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass  # Camada já destruída
+
+    def recalcular(self, *args):
+        """Recalcula os campos vivos das feições marcadas, no buffer de edição,
+        logo antes de salvar"""
+        if not self.sujas or not self.layer.isEditable():
+            return
+
+        fids = list(self.sujas)
+        self.sujas.clear()
+        definicoes = {campo: expressao for campo, expressao in campos_vivos(self.layer).items()
+                      if self.layer.fields().indexFromName(campo) >= 0}
+        if not definicoes:
+            return
+
+        indices = [self.layer.fields().indexFromName(campo) for campo in definicoes]
+        campos = [(campo, None, expressao, None, None) for campo, expressao in definicoes.items()]
+
+        self.layer.beginEditCommand("Atualizar Campos Vivos (RMCGEO)")
+        try:
+            valores = valores_feicoes(self.layer, preparar_calculos(self.layer, campos),
+                                      MedidorNativo(self.layer),
+                                      QgsFeatureRequest().setFilterFids(fids))
+            for fid, lista in valores:
+                self.layer.changeAttributeValues(
+                    fid, {indice: formatar_valor(valor) for indice, valor in zip(indices, lista)})
+            self.layer.endEditCommand()
+        except Exception as e:
+            self.layer.destroyEditCommand()
+            QgsMessageLog.logMessage(
+                f"Erro ao atualizar os campos vivos de '{self.layer.name()}': {e}",
+                "RMCGEO", Qgis.Warning)
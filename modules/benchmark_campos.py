@@ -0,0 +1,88 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Comparação de desempenho entre o cálculo por expressão e o cálculo nativo
+ das calculadoras de campo. Uso no console Python do QGIS (com o nome da
+ pasta em que o plugin está instalado):
+
+     from rmcgeo.modules.benchmark_campos import comparar
+     from rmcgeo.modules.add_area_tabela import AreaTabelaDialog
+     comparar(iface.activeLayer(), AreaTabelaDialog(iface), "Metros² (m²)", limite=100000)
+
+ Nenhum valor é gravado na camada; apenas os dois caminhos de cálculo são
+ medidos e os resultados conferidos entre si.
+"""
+
+import time
+from itertools import islice
+
+from .base_field_calculator import (MedidorNativo, formatar_valor, preparar_expressao,
+                                    valores_feicoes)
+
+
+def _medir(valores, limite):
+    inicio = time.perf_counter()
+    resultado = [lista[0] for _, lista in islice(valores, limite)]
+    return time.perf_counter() - inicio, resultado
+
+
+def comparar(layer, dialogo, formato=None, limite=None):
+    """Mede os dois caminhos de cálculo de `dialogo` sobre `layer`.
+
+    Retorna um dicionário com os tempos (s), feições/s de cada caminho,
+    o ganho e quantos valores divergiram."""
+    if formato:
+        dialogo.formatacao_combo.setCurrentText(formato)
+
+    funcao = dialogo.obter_funcao_nativa()
+    if not funcao:
+        raise ValueError(f"O formato '{dialogo.formatacao_combo.currentText()}' não tem cálculo nativo.")
+
+    medidor = MedidorNativo(layer)
+    expression, context = preparar_expressao(layer, dialogo.obter_expressao_calculo())
+    tempo_expressao, por_expressao = _medir(
+        valores_feicoes(layer, [(expression, context, None)], medidor), limite)
+    tempo_nativo, nativos = _medir(
+        valores_feicoes(layer, [(None, None, funcao)], medidor), limite)
+
+    total = len(por_expressao)
+    divergentes = sum(
+        1 for a, b in zip(por_expressao, nativos)
+        if formatar_valor(a) != formatar_valor(b)
+    )
+
+    resultado = {
+        'formato': dialogo.formatacao_combo.currentText(),
+        'feicoes': total,
+        'tempo_expressao': tempo_expressao,
+        'tempo_nativo': tempo_nativo,
+        'feicoes_s_expressao': total / tempo_expressao if tempo_expressao else 0.0,
+        'feicoes_s_nativo': total / tempo_nativo if tempo_nativo else 0.0,
+        'ganho': tempo_expressao / tempo_nativo if tempo_nativo else 0.0,
+        'divergentes': divergentes,
+    }
+
+    print(
+        f"{resultado['formato']}: {total} feições | "
+        f"expressão {tempo_expressao:.2f} s ({resultado['feicoes_s_expressao']:.0f}/s) | "
+        f"nativo {tempo_nativo:.2f} s ({resultado['feicoes_s_nativo']:.0f}/s) | "
+        f"{resultado['ganho']:.1f}x | {divergentes} valores divergentes"
+    )
+    return resultado
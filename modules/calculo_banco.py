@@ -0,0 +1,182 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Cálculo de campos direto no banco de dados (PostGIS e GeoPackage): as
+ medidas das calculadoras são traduzidas para um UPDATE em SQL, de modo que
+ nenhuma feição precisa ser lida pelo QGIS.
+
+ Cada medida é descrita por (medida, operação, casas), por exemplo
+ ("area", "/ 10000", 2), a mesma usada para o campo numérico, que recebe
+ round(valor, casas); casas None grava o valor sem arredondar. Campos texto
+ dependem da formatação do idioma do QGIS e são sempre calculados no QGIS.
+"""
+
+from qgis.core import (QgsDataSourceUri, QgsProviderRegistry, QgsProject,
+                       QgsTask, QgsUnitTypes)
+from qgis.PyQt.QtCore import QVariant
+
+# Elipsoides equivalentes ao do tipo geography do PostGIS
+_ELIPSOIDES_WGS84 = ('EPSG:7030', 'WGS84')
+
+
+class SemSuporteBanco(Exception):
+    """A camada, o projeto ou a medida não permitem o cálculo no banco"""
+
+
+def _identificador(nome):
+    return '"' + nome.replace('"', '""') + '"'
+
+
+def _literal(texto):
+    return "'" + texto.replace("'", "''") + "'"
+
+
+def destino_banco(layer):
+    """Provedor, conexão, tabela, coluna de geometria e dialeto SQL da camada.
+
+    Levanta SemSuporteBanco se a camada não for uma tabela PostGIS ou
+    GeoPackage."""
+    provider = layer.dataProvider()
+    destino = {'provedor': provider.name(), 'filtro': layer.subsetString()}
+
+    if provider.name() == 'postgres':
+        uri = QgsDataSourceUri(layer.source())
+        if not uri.table() or uri.table().startswith('('):
+            raise SemSuporteBanco("A camada é uma consulta, não uma tabela.")
+        destino.update(
+            uri=layer.source(),
+            tabela=f"{_identificador(uri.schema() or 'public')}.{_identificador(uri.table())}",
+            geometria=_identificador(uri.geometryColumn()),
+            dialeto='postgres',
+        )
+        return destino
+
+    if provider.name() == 'ogr' and provider.storageType() == 'GPKG':
+        partes = QgsProviderRegistry.instance().decodeUri('ogr', layer.source())
+        tabela = partes.get('layerName')
+        if not tabela:
+            raise SemSuporteBanco("Não foi possível identificar a tabela do GeoPackage.")
+
+        conexao = QgsProviderRegistry.instance().providerMetadata('ogr').createConnection(partes['path'], {})
+        linhas = conexao.executeSql(
+            f"SELECT column_name FROM gpkg_geometry_columns WHERE table_name = {_literal(tabela)}")
+        if not linhas:
+            raise SemSuporteBanco("A tabela do GeoPackage não tem geometria.")
+
+        destino.update(
+            uri=partes['path'],
+            tabela=_identificador(tabela),
+            geometria=_identificador(linhas[0][0]),
+            dialeto='sqlite',
+        )
+        return destino
+
+    raise SemSuporteBanco("A camada não é PostGIS nem GeoPackage.")
+
+
+def medida_sql(medida, geometria, dialeto, medidor):
+    """SQL da medida na unidade do projeto, como $area, $perimeter, $length,
+    $x, $y, x(centroid()) e o azimute do primeiro ao último vértice."""
+    elipsoidal = medidor.distancia.willUseEllipsoid()
+
+    if medida in ('area', 'perimetro', 'comprimento'):
+        funcao = {'area': 'ST_Area', 'perimetro': 'ST_Perimeter', 'comprimento': 'ST_Length'}[medida]
+        if elipsoidal:
+            # Só o geography do PostGIS mede no elipsoide, e apenas no WGS84
+            if dialeto != 'postgres' or QgsProject.instance().ellipsoid() not in _ELIPSOIDES_WGS84:
+                raise SemSuporteBanco("O elipsoide do projeto não pode ser reproduzido no banco.")
+            sql = f"{funcao}(CAST(ST_Transform({geometria}, 4326) AS geography))"
+        else:
+            sql = f"{funcao}({geometria})"
+
+        if medida == 'area':
+            fator = QgsUnitTypes.fromUnitToUnitFactor(medidor.distancia.areaUnits(), medidor.unidade_area)
+        else:
+            fator = QgsUnitTypes.fromUnitToUnitFactor(medidor.distancia.lengthUnits(), medidor.unidade_distancia)
+        return sql if fator == 1 else f"({sql} * {fator!r})"
+
+    if medida == 'x':
+        return f"ST_X({geometria})"
+    if medida == 'y':
+        return f"ST_Y({geometria})"
+    if medida == 'centroide_x':
+        return f"ST_X(ST_Centroid({geometria}))"
+    if medida == 'centroide_y':
+        return f"ST_Y(ST_Centroid({geometria}))"
+    if medida == 'azimute':
+        return (f"degrees(ST_Azimuth(ST_StartPoint(ST_GeometryN({geometria}, 1)), "
+                f"ST_EndPoint(ST_GeometryN({geometria}, ST_NumGeometries({geometria})))))")
+
+    raise SemSuporteBanco(f"Medida '{medida}' sem equivalente em SQL.")
+
+
+def comando_sql(destino, campos, medidor):
+    """UPDATE único que calcula os campos numéricos (nome, tipo, expressão,
+    função, medida) no banco. Levanta SemSuporteBanco se algum campo for
+    texto ou não tiver SQL.
+
+    Por ser um único comando, o banco grava todas as colunas ou nenhuma."""
+    dialeto = destino['dialeto']
+    onde = f" WHERE ({destino['filtro']})" if destino['filtro'] else ""
+
+    medidas = []
+    for nome, tipo, _, _, spec in campos:
+        if not spec:
+            raise SemSuporteBanco(f"O campo '{nome}' não tem cálculo em SQL.")
+        if tipo == QVariant.String:
+            raise SemSuporteBanco(f"O campo '{nome}' é texto formatado pelo QGIS.")
+        medida, operacao, casas = spec
+        coluna = _identificador(nome)
+        valor = f"({medida_sql(medida, destino['geometria'], dialeto, medidor)} {operacao})"
+
+        if casas is None:
+            medidas.append(f"{coluna} = {valor}")
+        elif dialeto == 'postgres':
+            medidas.append(f"{coluna} = CAST(round(CAST({valor} AS numeric), {casas}) AS double precision)")
+        else:
+            medidas.append(f"{coluna} = round({valor}, {casas})")
+
+    return f"UPDATE {destino['tabela']} SET {', '.join(medidas)}{onde}"
+
+
+class CalculoBancoTask(QgsTask):
+    """Executa o comando de cálculo no banco em segundo plano.
+
+    Não pode ser interrompida: o UPDATE roda inteiro numa única instrução."""
+
+    def __init__(self, descricao, destino, comando, ao_terminar):
+        super().__init__(descricao, QgsTask.Flags())
+        self.destino = destino
+        self.comando = comando
+        self.ao_terminar = ao_terminar
+        self.erro = None
+
+    def run(self):
+        try:
+            metadados = QgsProviderRegistry.instance().providerMetadata(self.destino['provedor'])
+            conexao = metadados.createConnection(self.destino['uri'], {})
+            conexao.executeSql(self.comando)
+            return True
+        except Exception as e:
+            self.erro = str(e)
+            return False
+
+    def finished(self, result):
+        self.ao_terminar(result, self.erro)
@@ -0,0 +1,236 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+import math
+from qgis.core import (
+    Qgis, QgsApplication, QgsFeatureRequest, QgsGeometry, QgsMapLayerType,
+    QgsTask, QgsWkbTypes
+)
+from qgis.PyQt.QtWidgets import QInputDialog, QMessageBox
+from .chanfro_tool import validate_chamfer, extend_line_end_to_point
+from .line_parts import line_parts
+
+# Mantém referência às tarefas em execução (o gerenciador não as segura)
+_tarefas_ativas = []
+
+
+class ChanfroLoteTask(QgsTask):
+    """Fecha em segundo plano todos os cantos quase coincidentes de uma camada.
+
+    As geometrias são copiadas na thread principal; o cálculo roda na tarefa
+    e as alterações são aplicadas em um único comando de edição no final."""
+
+    def __init__(self, iface, layer, geometrias, tolerancia):
+        super().__init__("Chanfro em Lote (RMCGEO)", QgsTask.CanCancel)
+        self.iface = iface
+        self.layer = layer
+        self.geometrias = geometrias
+        self.tolerancia = tolerancia
+        self.novas_geometrias = {}
+        self.resumo = {"candidatos": 0, "fechados": 0, "conectados": 0, "rejeitados": 0}
+        self.erro = None
+
+    def indexar_extremidades(self):
+        """Cria um hash espacial (grade) com as extremidades de todas as linhas."""
+        extremidades = []
+        grade = {}
+
+        for fid, geom in self.geometrias.items():
+            for points in line_parts(geom):
+                if len(points) < 2 or points[0] == points[-1]:
+                    continue
+
+                for at_start, point in ((True, points[0]), (False, points[-1])):
+                    celula = (math.floor(point.x() / self.tolerancia),
+                              math.floor(point.y() / self.tolerancia))
+                    grade.setdefault(celula, []).append(len(extremidades))
+                    extremidades.append((fid, at_start, point, celula))
+
+        return extremidades, grade
+
+    def encontrar_pares(self, extremidades, grade):
+        """Lista os pares de extremidades de feições diferentes dentro da tolerância."""
+        pares = []
+
+        for i, (fid, _, point, (cx, cy)) in enumerate(extremidades):
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for j in grade.get((cx + dx, cy + dy), ()):
+                        if j <= i or extremidades[j][0] == fid:
+                            continue
+
+                        distance = point.distance(extremidades[j][2])
+                        if distance <= self.tolerancia:
+                            pares.append((distance, i, j))
+
+        pares.sort(key=lambda par: par[0])
+        return pares
+
+    def run(self):
+        try:
+            extremidades, grade = self.indexar_extremidades()
+            pares = self.encontrar_pares(extremidades, grade)
+            self.resumo["candidatos"] = len(pares)
+
+            atuais = dict(self.geometrias)
+            usadas = set()
+
+            for n, (distance, i, j) in enumerate(pares):
+                if self.isCanceled():
+                    return False
+
+                self.setProgress(100.0 * n / len(pares))
+
+                # Cada extremidade participa de no máximo um canto
+                if i in usadas or j in usadas:
+                    continue
+
+                fid_a, start_a, point_a, _ = extremidades[i]
+                fid_b, start_b, point_b, _ = extremidades[j]
+
+                if distance == 0:
+                    self.resumo["conectados"] += 1
+                    usadas.update((i, j))
+                    continue
+
+                is_valid, intersection_point, _ = validate_chamfer(atuais[fid_a], atuais[fid_b])
+
+                # A interseção precisa estar junto das extremidades do par,
+                # não em outro canto das mesmas linhas
+                if not is_valid or \
+                   point_a.distance(intersection_point) > self.tolerancia or \
+                   point_b.distance(intersection_point) > self.tolerancia:
+                    self.resumo["rejeitados"] += 1
+                    continue
+
+                extended_a = extend_line_end_to_point(atuais[fid_a], intersection_point, start_a)
+                extended_b = extend_line_end_to_point(atuais[fid_b], intersection_point, start_b)
+
+                if not extended_a or not extended_b:
+                    self.resumo["rejeitados"] += 1
+                    continue
+
+                atuais[fid_a] = extended_a
+                atuais[fid_b] = extended_b
+                self.novas_geometrias[fid_a] = extended_a
+                self.novas_geometrias[fid_b] = extended_b
+                usadas.update((i, j))
+                self.resumo["fechados"] += 1
+
+            self.setProgress(100)
+            return True
+
+        except Exception as e:
+            self.erro = str(e)
+            return False
+
+    def finished(self, result):
+        """Aplica as correções na thread principal."""
+        if self in _tarefas_ativas:
+            _tarefas_ativas.remove(self)
+
+        if not result:
+            if self.erro:
+                self.iface.messageBar().pushMessage(
+                    "Chanfro em Lote", f"Erro no processamento: {self.erro}", level=Qgis.Critical)
+            else:
+                self.iface.messageBar().pushMessage(
+                    "Chanfro em Lote", "Operação cancelada.", level=Qgis.Warning)
+            return
+
+        if self.novas_geometrias:
+            if not self.layer.isEditable():
+                self.iface.messageBar().pushMessage(
+                    "Chanfro em Lote",
+                    "A camada saiu do modo de edição. Nenhuma alteração foi aplicada.",
+                    level=Qgis.Warning
+                )
+                return
+
+            # Todas as correções em um único comando (um único Desfazer)
+            self.layer.beginEditCommand("Chanfro em Lote (RMCGEO)")
+            try:
+                for fid, geom in self.novas_geometrias.items():
+                    self.layer.changeGeometry(fid, geom)
+                self.layer.endEditCommand()
+            except Exception as e:
+                self.layer.destroyEditCommand()
+                self.iface.messageBar().pushMessage(
+                    "Chanfro em Lote", f"Erro ao aplicar as correções: {str(e)}", level=Qgis.Critical)
+                return
+
+            self.layer.updateExtents()
+            self.layer.triggerRepaint()
+
+        self.iface.messageBar().pushMessage(
+            "Chanfro em Lote",
+            f"{self.resumo['fechados']} cantos fechados, "
+            f"{self.resumo['conectados']} já conectados, "
+            f"{self.resumo['rejeitados']} rejeitados "
+            f"({self.resumo['candidatos']} pares candidatos).",
+            level=Qgis.Success if self.resumo["fechados"] else Qgis.Info,
+            duration=10
+        )
+
+
+def run(iface):
+    layer = iface.activeLayer()
+    if not layer or layer.type() != QgsMapLayerType.VectorLayer or \
+       layer.geometryType() != QgsWkbTypes.LineGeometry:
+        QMessageBox.warning(
+            iface.mainWindow(),
+            "Camada Inválida",
+            "Por favor, selecione uma camada de linhas para trabalhar com o Chanfro em Lote."
+        )
+        return
+
+    if not layer.isEditable():
+        QMessageBox.warning(
+            iface.mainWindow(),
+            "Modo de Edição",
+            "Por favor, habilite a edição da camada de linha antes de usar esta ferramenta."
+        )
+        return
+
+    tolerancia, ok = QInputDialog.getDouble(
+        iface.mainWindow(),
+        "Chanfro em Lote",
+        "Distância máxima entre as extremidades (unidades da camada):",
+        1.0, 0.0001, 1000000.0, 4
+    )
+    if not ok:
+        return
+
+    # Com feições selecionadas, processa apenas a seleção
+    request = QgsFeatureRequest().setNoAttributes()
+    features = layer.getSelectedFeatures(request) if layer.selectedFeatureCount() else layer.getFeatures(request)
+    geometrias = {f.id(): QgsGeometry(f.geometry()) for f in features if f.hasGeometry()}
+
+    task = ChanfroLoteTask(iface, layer, geometrias, tolerancia)
+    _tarefas_ativas.append(task)
+    QgsApplication.taskManager().addTask(task)
+
+    iface.messageBar().pushMessage(
+        "Chanfro em Lote",
+        f"Analisando {len(geometrias)} linhas em segundo plano...",
+        level=Qgis.Info,
+        duration=5
+    )
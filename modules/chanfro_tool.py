@@ -29,6 +29,7 @@ from qgis.gui import QgsMapTool, QgsRubberBand
 from qgis.PyQt.QtCore import Qt
 from qgis.PyQt.QtGui import QColor
 from qgis.PyQt.QtWidgets import QMessageBox
+from .line_parts import line_parts, part_near_points, part_endpoints, extend_part
 
 
 class ChanfroTool(QgsMapTool):
@@ -46,6 +47,12 @@ class ChanfroTool(QgsMapTool):
         self.hover_feature = None
         self.hover_layer = None
 
+        # Cache da validação do chanfro por (fid1, fid2, versões das geometrias)
+        self.chamfer_cache = {}
+        self.geometry_versions = {}
+        self.preview_key = None
+        self.cache_layer = None
+
         try:
             self.setCursor(Qt.CursorShape.CrossCursor)  # Qt6
         except AttributeError:
@@ -85,15 +92,91 @@ class ChanfroTool(QgsMapTool):
             self.canvas.unsetMapTool(self)
             return
 
+        self.connect_cache_layer(active_layer)
+        self.iface.currentLayerChanged.connect(self.on_current_layer_changed)
+
+    def on_current_layer_changed(self, layer):
+        """Troca a camada do cache e descarta a seleção feita na camada anterior."""
+        self.reset_tool()
+        self.clear_hover_highlight()
+        if isinstance(layer, QgsVectorLayer) and self.is_line_layer(layer):
+            self.connect_cache_layer(layer)
+        else:
+            self.disconnect_cache_layer()
+
+    def connect_cache_layer(self, layer):
+        """Conecta os sinais que invalidam o cache de validação do chanfro."""
+        self.disconnect_cache_layer()
+        self.cache_layer = layer
+        layer.geometryChanged.connect(self.on_geometry_changed)
+        layer.afterRollBack.connect(self.clear_chamfer_cache)
+        layer.afterCommitChanges.connect(self.clear_chamfer_cache)
+
+    def disconnect_cache_layer(self):
+        if self.cache_layer is None:
+            return
+        try:
+            self.cache_layer.geometryChanged.disconnect(self.on_geometry_changed)
+            self.cache_layer.afterRollBack.disconnect(self.clear_chamfer_cache)
+            self.cache_layer.afterCommitChanges.disconnect(self.clear_chamfer_cache)
+        except (TypeError, RuntimeError):
+            pass
+        self.cache_layer = None
+        self.clear_chamfer_cache()
+
+    def on_geometry_changed(self, fid, geometry):
+        """Incrementa a versão da geometria alterada, invalidando suas entradas no cache."""
+        self.geometry_versions[fid] = self.geometry_versions.get(fid, 0) + 1
+        self.preview_key = None
+
+    def clear_chamfer_cache(self):
+        self.chamfer_cache.clear()
+        self.geometry_versions.clear()
+        self.preview_key = None
+
+    def chamfer_key(self, layer, fid1, fid2):
+        return (layer.id(), fid1, fid2,
+                self.geometry_versions.get(fid1, 0), self.geometry_versions.get(fid2, 0))
+
+    def cached_chamfer(self, geom1, geom2, key=None):
+        """Valida o chanfro e estende as linhas, reaproveitando o resultado memorizado
+        para o mesmo par de feições enquanto suas geometrias não mudarem."""
+        if key is not None and key in self.chamfer_cache:
+            return self.chamfer_cache[key]
+
+        is_valid, intersection_point, error_message = self.validate_chamfer(geom1, geom2)
+        extended_first = extended_second = None
+
+        if is_valid and intersection_point:
+            extended_first = self.extend_line_to_point(geom1, intersection_point)
+            extended_second = self.extend_line_to_point(geom2, intersection_point)
+
+        result = (is_valid, intersection_point, error_message, extended_first, extended_second)
+
+        if key is not None:
+            if len(self.chamfer_cache) >= 256:
+                self.chamfer_cache.clear()
+            self.chamfer_cache[key] = result
+
+        return result
+
     def canvasMoveEvent(self, event):
         point = self.toMapCoordinates(event.pos())
         self.update_hover_highlight(point)
 
         if self.step == 1 and self.first_line and self.hover_feature:
             if self.hover_feature.id() != self.first_line.id():
+                key = self.chamfer_key(self.hover_layer, self.first_line.id(), self.hover_feature.id())
+
+                # Mesmo candidato sob o mouse: o preview atual continua válido
+                if key == self.preview_key:
+                    return
+
+                self.preview_key = key
                 self.create_chamfer_preview(
                     self.first_line.geometry(),
-                    self.hover_feature.geometry()
+                    self.hover_feature.geometry(),
+                    key
                 )
 
     def canvasPressEvent(self, event):
@@ -157,14 +240,13 @@ class ChanfroTool(QgsMapTool):
         if self.first_line.id() == self.second_line.id():
             return
 
-        is_valid, intersection_point, error_message = self.validate_chamfer(first_geom, second_geom)
+        key = self.chamfer_key(layer, self.first_line.id(), self.second_line.id())
+        is_valid, intersection_point, error_message, extended_first, extended_second = \
+            self.cached_chamfer(first_geom, second_geom, key)
 
         if not is_valid:
             return
 
-        extended_first = self.extend_line_to_point(first_geom, intersection_point)
-        extended_second = self.extend_line_to_point(second_geom, intersection_point)
-
         if not extended_first or not extended_second:
             self.show_message(
                 "Erro ao estender as linhas!",
@@ -188,21 +270,19 @@ class ChanfroTool(QgsMapTool):
             layer.destroyEditCommand()
             self.show_message(f"Erro inesperado: {str(e)}", Qgis.Critical)
 
-    def create_chamfer_preview(self, geom1, geom2):
+    def create_chamfer_preview(self, geom1, geom2, key=None):
         """Cria um preview visual do chanfro mostrando as extensões e o ponto de interseção."""
         # Limpa previews anteriores
         self.preview_rubber_band.reset()
         self.intersection_rubber_band.reset()
 
-        # Valida o chanfro
-        is_valid, intersection_point, _ = self.validate_chamfer(geom1, geom2)
+        # Valida o chanfro (memorizado por par de feições quando key é informada)
+        is_valid, intersection_point, _, extended_first, extended_second = \
+            self.cached_chamfer(geom1, geom2, key)
 
         if not is_valid or not intersection_point:
             return
 
-        extended_first = self.extend_line_to_point(geom1, intersection_point)
-        extended_second = self.extend_line_to_point(geom2, intersection_point)
-
         if extended_first and extended_second:
             extended_first_canvas = self.transform_geometry_to_canvas_crs(extended_first, self.first_line and self.hover_layer)
             extended_second_canvas = self.transform_geometry_to_canvas_crs(extended_second, self.hover_layer)
@@ -219,264 +299,29 @@ class ChanfroTool(QgsMapTool):
 
     def _get_line_points(self, geom):
         """Extrai pontos de uma geometria de linha (multipart ou simples)."""
-        return geom.asMultiPolyline()[0] if geom.isMultipart() else geom.asPolyline()
+        return get_line_points(geom)
 
     def calculate_angle_between_lines(self, geom1, geom2, intersection_point):
         """Calcula o ângulo entre duas linhas considerando suas extremidades
         mais próximas do ponto de interseção."""
-        points1 = self._get_line_points(geom1)
-        points2 = self._get_line_points(geom2)
-
-        if len(points1) < 2 or len(points2) < 2:
-            return None, None, None, None, None
-
-        # Determina qual extremidade de cada linha está mais próxima da interseção
-        first1 = points1[0]
-        last1 = points1[-1]
-        first2 = points2[0]
-        last2 = points2[-1]
-
-        dist_to_first1 = first1.distance(intersection_point)
-        dist_to_last1 = last1.distance(intersection_point)
-        dist_to_first2 = first2.distance(intersection_point)
-        dist_to_last2 = last2.distance(intersection_point)
-
-        if dist_to_last1 < dist_to_first1:
-            p1_start = points1[-2] if len(points1) > 1 else points1[0]
-            p1_end = points1[-1]
-        else:
-            p1_end = points1[0]
-            p1_start = points1[1] if len(points1) > 1 else points1[-1]
-
-        if dist_to_last2 < dist_to_first2:
-            p2_start = points2[-2] if len(points2) > 1 else points2[0]
-            p2_end = points2[-1]
-        else:
-            p2_end = points2[0]
-            p2_start = points2[1] if len(points2) > 1 else points2[-1]
-
-        dx1 = p1_end.x() - p1_start.x()
-        dy1 = p1_end.y() - p1_start.y()
-
-        dx2 = p2_end.x() - p2_start.x()
-        dy2 = p2_end.y() - p2_start.y()
-        mag1 = math.sqrt(dx1 * dx1 + dy1 * dy1)
-        mag2 = math.sqrt(dx2 * dx2 + dy2 * dy2)
-
-        if mag1 == 0 or mag2 == 0:
-            return None, None, None, None, None
-
-        dx1_norm = dx1 / mag1
-        dy1_norm = dy1 / mag1
-        dx2_norm = dx2 / mag2
-        dy2_norm = dy2 / mag2
-
-        dot_product = dx1_norm * dx2_norm + dy1_norm * dy2_norm
-
-        dot_product = max(-1.0, min(1.0, dot_product))
-
-        angle_rad = math.acos(abs(dot_product))
-        angle_deg = math.degrees(angle_rad)
-
-        return angle_deg, p1_start, p1_end, p2_start, p2_end
+        return calculate_angle_between_lines(geom1, geom2, intersection_point)
 
     def validate_chamfer(self, geom1, geom2):
-        """Valida se o chanfro pode ser executado.
-        O chanfro é válido apenas se a interseção ocorrer além das extremidades das linhas."""
-        if not geom1 or not geom2:
-            return False, None, "Geometrias inválidas"
-
-        points1 = self._get_line_points(geom1)
-        points2 = self._get_line_points(geom2)
-
-        if len(points1) < 2 or len(points2) < 2:
-            return False, None, "Linhas com poucos pontos"
-
-        if geom1.intersects(geom2):
-            intersection = geom1.intersection(geom2)
-            if not intersection.isEmpty():
-                return False, None, "As linhas já se intersectam"
-
-        intersection_point = self.find_extended_intersection(geom1, geom2)
-
-        if not intersection_point:
-            return False, None, "Linhas paralelas ou sem interseção válida"
-
-        angle_result = self.calculate_angle_between_lines(geom1, geom2, intersection_point)
-
-        if angle_result[0] is None:
-            return False, None, "Erro ao calcular o ângulo entre as linhas"
-
-        angle_deg, p1_start, p1_end, p2_start, p2_end = angle_result
-
-        MIN_ANGLE_DEGREES = 5.0
-
-        if angle_deg < MIN_ANGLE_DEGREES:
-            return False, None, f"As linhas são quase paralelas (ângulo: {angle_deg:.1f}°).\nO chanfro seria desproporcional.\nÂngulo mínimo: {MIN_ANGLE_DEGREES}°"
-
-        first1 = points1[0]
-        last1 = points1[-1]
-        first2 = points2[0]
-        last2 = points2[-1]
-
-        dist_to_first1 = first1.distance(intersection_point)
-        dist_to_last1 = last1.distance(intersection_point)
-        dist_to_first2 = first2.distance(intersection_point)
-        dist_to_last2 = last2.distance(intersection_point)
-
-        line1_length = geom1.length()
-        tolerance = line1_length * 0.01
-
-        if abs((dist_to_first1 + dist_to_last1) - line1_length) < tolerance:
-            return False, None, "A interseção está no meio da primeira linha.\nO chanfro só pode ser criado nas extremidades."
-
-        line2_length = geom2.length()
-        tolerance2 = line2_length * 0.01
-
-        if abs((dist_to_first2 + dist_to_last2) - line2_length) < tolerance2:
-            return False, None, "A interseção está no meio da segunda linha.\nO chanfro só pode ser criado nas extremidades."
-
-        dx1 = p1_end.x() - p1_start.x()
-        dy1 = p1_end.y() - p1_start.y()
-
-        dx2 = p2_end.x() - p2_start.x()
-        dy2 = p2_end.y() - p2_start.y()
-
-        dx1_int = intersection_point.x() - p1_end.x()
-        dy1_int = intersection_point.y() - p1_end.y()
-
-        dot1 = dx1 * dx1_int + dy1 * dy1_int
-
-        dx2_int = intersection_point.x() - p2_end.x()
-        dy2_int = intersection_point.y() - p2_end.y()
-
-        dot2 = dx2 * dx2_int + dy2 * dy2_int
-
-        min_dot_threshold = -line1_length * 0.1
-
-        if dot1 < min_dot_threshold and dot2 < min_dot_threshold:
-            return False, None, "A interseção está na direção oposta.\nAs linhas não convergem."
-
-        return True, intersection_point, ""
+        """Valida se o chanfro pode ser executado."""
+        return validate_chamfer(geom1, geom2)
 
     def find_extended_intersection(self, geom1, geom2):
-        points1 = self._get_line_points(geom1)
-        points2 = self._get_line_points(geom2)
-
-        if len(points1) < 2 or len(points2) < 2:
-            return None
-
-        combinations = [
-            ((points1[-2], points1[-1]), (points2[-2], points2[-1])),
-            ((points1[-2], points1[-1]), (points2[1], points2[0])),
-            ((points1[1], points1[0]), (points2[-2], points2[-1])),
-            ((points1[1], points1[0]), (points2[1], points2[0]))
-        ]
-
-        valid_intersections = []
-
-        for (p1_start, p1_end), (p2_start, p2_end) in combinations:
-            # Calcula os vetores de direção
-            dx1 = p1_end.x() - p1_start.x()
-            dy1 = p1_end.y() - p1_start.y()
-
-            dx2 = p2_end.x() - p2_start.x()
-            dy2 = p2_end.y() - p2_start.y()
-
-            cross = dx1 * dy2 - dy1 * dx2
-
-            if abs(cross) < 1e-10:
-                continue
-
-            dx = p2_end.x() - p1_end.x()
-            dy = p2_end.y() - p1_end.y()
-
-            t1 = (dx * dy2 - dy * dx2) / cross
-            t2 = (dx * dy1 - dy * dx1) / cross
-
-            intersection_x = p1_end.x() + t1 * dx1
-            intersection_y = p1_end.y() + t1 * dy1
-            intersection_point = QgsPointXY(intersection_x, intersection_y)
-
-            if t1 >= -0.01 and t2 >= -0.01:
-                dist_sum = p1_end.distance(intersection_point) + p2_end.distance(intersection_point)
-                valid_intersections.append((intersection_point, dist_sum, t1, t2))
-
-        if not valid_intersections:
-            # Se nenhuma interseção válida, retorna a primeira calculada (compatibilidade)
-            p1_start = points1[-2]
-            p1_end = points1[-1]
-            p2_start = points2[-2]
-            p2_end = points2[-1]
-
-            dx1 = p1_end.x() - p1_start.x()
-            dy1 = p1_end.y() - p1_start.y()
-            dx2 = p2_end.x() - p2_start.x()
-            dy2 = p2_end.y() - p2_start.y()
-
-            cross = dx1 * dy2 - dy1 * dx2
-            if abs(cross) < 1e-10:
-                return None
-
-            dx = p2_end.x() - p1_end.x()
-            dy = p2_end.y() - p1_end.y()
-            t1 = (dx * dy2 - dy * dx2) / cross
-
-            intersection_x = p1_end.x() + t1 * dx1
-            intersection_y = p1_end.y() + t1 * dy1
-            return QgsPointXY(intersection_x, intersection_y)
-
-        valid_intersections.sort(key=lambda x: x[1])
-        return valid_intersections[0][0]
+        return find_extended_intersection(geom1, geom2)
 
     def extend_line_to_point(self, line_geom, target_point):
-        if not line_geom or not target_point:
-            return None
-
-        points = self._get_line_points(line_geom)
-
-        if len(points) < 2:
-            return None
-
-        last_point = points[-1]
-        second_last = points[-2]
-
-        line_dx = last_point.x() - second_last.x()
-        line_dy = last_point.y() - second_last.y()
-
-        target_dx = target_point.x() - last_point.x()
-        target_dy = target_point.y() - last_point.y()
-
-        dot_product = line_dx * target_dx + line_dy * target_dy
-
-        new_points = list(points)
-
-        if dot_product >= 0:
-            new_points.append(target_point)
-        else:
-            first_point = points[0]
-            second_point = points[1]
-
-            line_dx_start = first_point.x() - second_point.x()
-            line_dy_start = first_point.y() - second_point.y()
-
-            target_dx_start = target_point.x() - first_point.x()
-            target_dy_start = target_point.y() - first_point.y()
-
-            dot_product_start = line_dx_start * target_dx_start + line_dy_start * target_dy_start
-
-            if dot_product_start >= 0:
-                new_points.insert(0, target_point)
-            else:
-                new_points.append(target_point)
-
-        return QgsGeometry.fromPolylineXY(new_points)
+        return extend_line_to_point(line_geom, target_point)
 
     def reset_tool(self):
         """Reseta a ferramenta para uma nova operação."""
         self.first_line = None
         self.second_line = None
         self.step = 0
+        self.preview_key = None
         self.first_rubber_band.reset()
         self.second_rubber_band.reset()
         self.preview_rubber_band.reset()
@@ -630,6 +475,10 @@ class ChanfroTool(QgsMapTool):
             self.clear_hover_highlight()
             return
 
+        # As versões das geometrias só valem para a camada cujos sinais estão conectados
+        if active_layer is not self.cache_layer:
+            self.connect_cache_layer(active_layer)
+
         feature, layer, geom = self.find_closest_line_at_point(point, active_layer)
 
         if feature and geom:
@@ -690,9 +539,294 @@ class ChanfroTool(QgsMapTool):
         self.intersection_rubber_band.reset()
         self.clear_hover_highlight()
         self.reset_tool()
+        self.disconnect_cache_layer()
+        try:
+            self.iface.currentLayerChanged.disconnect(self.on_current_layer_changed)
+        except TypeError:
+            pass
         super().deactivate()
 
 
+def get_line_points(geom, reference=None):
+    """Vértices da parte da linha usada no chanfro, sem copiar a polilinha.
+
+    Em geometrias multipart usa a parte cuja extremidade está mais próxima da
+    referência (outra linha ou um ponto); sem referência, usa a primeira parte."""
+    if reference is None:
+        parts = line_parts(geom)
+        return parts[0] if parts else []
+
+    if isinstance(reference, QgsPointXY):
+        return part_near_points(geom, [reference])
+    return part_near_points(geom, part_endpoints(reference))
+
+
+def calculate_angle_between_lines(geom1, geom2, intersection_point):
+    """Calcula o ângulo entre duas linhas considerando suas extremidades
+    mais próximas do ponto de interseção."""
+    points1 = get_line_points(geom1, geom2)
+    points2 = get_line_points(geom2, geom1)
+
+    if len(points1) < 2 or len(points2) < 2:
+        return None, None, None, None, None
+
+    # Determina qual extremidade de cada linha está mais próxima da interseção
+    first1 = points1[0]
+    last1 = points1[-1]
+    first2 = points2[0]
+    last2 = points2[-1]
+
+    dist_to_first1 = first1.distance(intersection_point)
+    dist_to_last1 = last1.distance(intersection_point)
+    dist_to_first2 = first2.distance(intersection_point)
+    dist_to_last2 = last2.distance(intersection_point)
+
+    if dist_to_last1 < dist_to_first1:
+        p1_start = points1[-2] if len(points1) > 1 else points1[0]
+        p1_end = points1[-1]
+    else:
+        p1_end = points1[0]
+        p1_start = points1[1] if len(points1) > 1 else points1[-1]
+
+    if dist_to_last2 < dist_to_first2:
+        p2_start = points2[-2] if len(points2) > 1 else points2[0]
+        p2_end = points2[-1]
+    else:
+        p2_end = points2[0]
+        p2_start = points2[1] if len(points2) > 1 else points2[-1]
+
+    dx1 = p1_end.x() - p1_start.x()
+    dy1 = p1_end.y() - p1_start.y()
+
+    dx2 = p2_end.x() - p2_start.x()
+    dy2 = p2_end.y() - p2_start.y()
+    mag1 = math.sqrt(dx1 * dx1 + dy1 * dy1)
+    mag2 = math.sqrt(dx2 * dx2 + dy2 * dy2)
+
+    if mag1 == 0 or mag2 == 0:
+        return None, None, None, None, None
+
+    dx1_norm = dx1 / mag1
+    dy1_norm = dy1 / mag1
+    dx2_norm = dx2 / mag2
+    dy2_norm = dy2 / mag2
+
+    dot_product = dx1_norm * dx2_norm + dy1_norm * dy2_norm
+
+    dot_product = max(-1.0, min(1.0, dot_product))
+
+    angle_rad = math.acos(abs(dot_product))
+    angle_deg = math.degrees(angle_rad)
+
+    return angle_deg, p1_start, p1_end, p2_start, p2_end
+
+
+def validate_chamfer(geom1, geom2):
+    """Valida se o chanfro pode ser executado.
+    O chanfro é válido apenas se a interseção ocorrer além das extremidades das linhas."""
+    if not geom1 or not geom2:
+        return False, None, "Geometrias inválidas"
+
+    points1 = get_line_points(geom1, geom2)
+    points2 = get_line_points(geom2, geom1)
+
+    if len(points1) < 2 or len(points2) < 2:
+        return False, None, "Linhas com poucos pontos"
+
+    # Testes baratos (apenas extremidades) primeiro; o GEOS fica por último
+    intersection_point = find_extended_intersection(geom1, geom2)
+
+    if not intersection_point:
+        return False, None, "Linhas paralelas ou sem interseção válida"
+
+    angle_result = calculate_angle_between_lines(geom1, geom2, intersection_point)
+
+    if angle_result[0] is None:
+        return False, None, "Erro ao calcular o ângulo entre as linhas"
+
+    angle_deg, p1_start, p1_end, p2_start, p2_end = angle_result
+
+    MIN_ANGLE_DEGREES = 5.0
+
+    if angle_deg < MIN_ANGLE_DEGREES:
+        return False, None, f"As linhas são quase paralelas (ângulo: {angle_deg:.1f}°).\nO chanfro seria desproporcional.\nÂngulo mínimo: {MIN_ANGLE_DEGREES}°"
+
+    first1 = points1[0]
+    last1 = points1[-1]
+    first2 = points2[0]
+    last2 = points2[-1]
+
+    dist_to_first1 = first1.distance(intersection_point)
+    dist_to_last1 = last1.distance(intersection_point)
+    dist_to_first2 = first2.distance(intersection_point)
+    dist_to_last2 = last2.distance(intersection_point)
+
+    line1_length = points1.length()
+    tolerance = line1_length * 0.01
+
+    if abs((dist_to_first1 + dist_to_last1) - line1_length) < tolerance:
+        return False, None, "A interseção está no meio da primeira linha.\nO chanfro só pode ser criado nas extremidades."
+
+    line2_length = points2.length()
+    tolerance2 = line2_length * 0.01
+
+    if abs((dist_to_first2 + dist_to_last2) - line2_length) < tolerance2:
+        return False, None, "A interseção está no meio da segunda linha.\nO chanfro só pode ser criado nas extremidades."
+
+    dx1 = p1_end.x() - p1_start.x()
+    dy1 = p1_end.y() - p1_start.y()
+
+    dx2 = p2_end.x() - p2_start.x()
+    dy2 = p2_end.y() - p2_start.y()
+
+    dx1_int = intersection_point.x() - p1_end.x()
+    dy1_int = intersection_point.y() - p1_end.y()
+
+    dot1 = dx1 * dx1_int + dy1 * dy1_int
+
+    dx2_int = intersection_point.x() - p2_end.x()
+    dy2_int = intersection_point.y() - p2_end.y()
+
+    dot2 = dx2 * dx2_int + dy2 * dy2_int
+
+    min_dot_threshold = -line1_length * 0.1
+
+    if dot1 < min_dot_threshold and dot2 < min_dot_threshold:
+        return False, None, "A interseção está na direção oposta.\nAs linhas não convergem."
+
+    # Só consulta o GEOS quando as caixas envolventes se sobrepõem
+    if geom1.boundingBox().intersects(geom2.boundingBox()) and geom1.intersects(geom2):
+        intersection = geom1.intersection(geom2)
+        if not intersection.isEmpty():
+            return False, None, "As linhas já se intersectam"
+
+    return True, intersection_point, ""
+
+
+def find_extended_intersection(geom1, geom2):
+    points1 = get_line_points(geom1, geom2)
+    points2 = get_line_points(geom2, geom1)
+
+    if len(points1) < 2 or len(points2) < 2:
+        return None
+
+    combinations = [
+        ((points1[-2], points1[-1]), (points2[-2], points2[-1])),
+        ((points1[-2], points1[-1]), (points2[1], points2[0])),
+        ((points1[1], points1[0]), (points2[-2], points2[-1])),
+        ((points1[1], points1[0]), (points2[1], points2[0]))
+    ]
+
+    valid_intersections = []
+
+    for (p1_start, p1_end), (p2_start, p2_end) in combinations:
+        # Calcula os vetores de direção
+        dx1 = p1_end.x() - p1_start.x()
+        dy1 = p1_end.y() - p1_start.y()
+
+        dx2 = p2_end.x() - p2_start.x()
+        dy2 = p2_end.y() - p2_start.y()
+
+        cross = dx1 * dy2 - dy1 * dx2
+
+        if abs(cross) < 1e-10:
+            continue
+
+        dx = p2_end.x() - p1_end.x()
+        dy = p2_end.y() - p1_end.y()
+
+        t1 = (dx * dy2 - dy * dx2) / cross
+        t2 = (dx * dy1 - dy * dx1) / cross
+
+        intersection_x = p1_end.x() + t1 * dx1
+        intersection_y = p1_end.y() + t1 * dy1
+        intersection_point = QgsPointXY(intersection_x, intersection_y)
+
+        if t1 >= -0.01 and t2 >= -0.01:
+            dist_sum = p1_end.distance(intersection_point) + p2_end.distance(intersection_point)
+            valid_intersections.append((intersection_point, dist_sum, t1, t2))
+
+    if not valid_intersections:
+        # Se nenhuma interseção válida, retorna a primeira calculada (compatibilidade)
+        p1_start = points1[-2]
+        p1_end = points1[-1]
+        p2_start = points2[-2]
+        p2_end = points2[-1]
+
+        dx1 = p1_end.x() - p1_start.x()
+        dy1 = p1_end.y() - p1_start.y()
+        dx2 = p2_end.x() - p2_start.x()
+        dy2 = p2_end.y() - p2_start.y()
+
+        cross = dx1 * dy2 - dy1 * dx2
+        if abs(cross) < 1e-10:
+            return None
+
+        dx = p2_end.x() - p1_end.x()
+        dy = p2_end.y() - p1_end.y()
+        t1 = (dx * dy2 - dy * dx2) / cross
+
+        intersection_x = p1_end.x() + t1 * dx1
+        intersection_y = p1_end.y() + t1 * dy1
+        return QgsPointXY(intersection_x, intersection_y)
+
+    valid_intersections.sort(key=lambda x: x[1])
+    return valid_intersections[0][0]
+
+
+def extend_line_to_point(line_geom, target_point):
+    if not line_geom or not target_point:
+        return None
+
+    points = get_line_points(line_geom, target_point)
+
+    if len(points) < 2:
+        return None
+
+    last_point = points[-1]
+    second_last = points[-2]
+
+    line_dx = last_point.x() - second_last.x()
+    line_dy = last_point.y() - second_last.y()
+
+    target_dx = target_point.x() - last_point.x()
+    target_dy = target_point.y() - last_point.y()
+
+    dot_product = line_dx * target_dx + line_dy * target_dy
+
+    at_start = False
+
+    if dot_product < 0:
+        first_point = points[0]
+        second_point = points[1]
+
+        line_dx_start = first_point.x() - second_point.x()
+        line_dy_start = first_point.y() - second_point.y()
+
+        target_dx_start = target_point.x() - first_point.x()
+        target_dy_start = target_point.y() - first_point.y()
+
+        dot_product_start = line_dx_start * target_dx_start + line_dy_start * target_dy_start
+
+        at_start = dot_product_start >= 0
+
+    # Altera apenas a parte envolvida, preservando as demais partes
+    return extend_part(line_geom, points.index, target_point, at_start)
+
+
+def extend_line_end_to_point(line_geom, target_point, at_start):
+    """Estende uma extremidade específica da linha até o ponto informado."""
+    if not line_geom or not target_point:
+        return None
+
+    points = get_line_points(line_geom, target_point)
+
+    if len(points) < 2:
+        return None
+
+    return extend_part(line_geom, points.index, target_point, at_start)
+
+
 def run(iface):
     canvas = iface.mapCanvas()
     tool = ChanfroTool(canvas, iface)
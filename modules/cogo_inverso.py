@@ -0,0 +1,216 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ COGO inverso: tabela de vértices com azimute, rumo e distância de cada lado
+ das feições existentes.
+"""
+
+import csv
+import math
+from collections import namedtuple
+
+from qgis.core import (
+    Qgis, QgsFeature, QgsFeatureRequest, QgsField, QgsMapLayerType, QgsProject,
+    QgsVectorLayer, QgsWkbTypes
+)
+from qgis.PyQt.QtCore import QVariant
+from qgis.PyQt.QtWidgets import QFileDialog, QInputDialog, QMessageBox
+
+from .angulos import azimute_para_rumo, decimal_para_dms, formatar_dms
+
+Lado = namedtuple('Lado', [
+    'feicao', 'parte', 'anel', 'de', 'para', 'x', 'y',
+    'azimute', 'azimute_dec', 'rumo', 'distancia'
+])
+
+CAMPOS = (
+    ('feicao', QVariant.LongLong),
+    ('parte', QVariant.Int),
+    ('anel', QVariant.Int),
+    ('de', QVariant.String),
+    ('para', QVariant.String),
+    ('x', QVariant.Double),
+    ('y', QVariant.Double),
+    ('azimute', QVariant.String),
+    ('azimute_dec', QVariant.Double),
+    ('rumo', QVariant.String),
+    ('distancia', QVariant.Double),
+)
+
+SAIDA_CAMADA = "Camada de tabela"
+SAIDA_CSV = "Arquivo CSV"
+
+# Feições enviadas ao provedor por vez ao criar a camada de tabela
+_LOTE = 1000
+
+
+def formatar_azimute_rumo(azimute):
+    """Retorna o azimute e o rumo com quadrante formatados em GMS."""
+    rumo, quadrante = azimute_para_rumo(azimute)
+    return (formatar_dms(decimal_para_dms(azimute)),
+            f"{formatar_dms(decimal_para_dms(rumo))} {quadrante}")
+
+
+def lados_feicao(fid, geometria):
+    """Gera os lados de todas as partes e anéis de uma geometria.
+
+    Os vértices são nomeados V1, V2, ... em sequência dentro da feição;
+    em anéis fechados o último lado volta ao primeiro vértice do anel."""
+    numero = 0
+    for p, parte in enumerate(geometria.constGet().coordinateSequence()):
+        for r, anel in enumerate(parte):
+            n = len(anel)
+            if n < 2:
+                continue
+
+            fechado = n > 2 and anel[0].x() == anel[-1].x() and anel[0].y() == anel[-1].y()
+            vertices = n - 1 if fechado else n
+
+            for i in range(n - 1):
+                x1, y1 = anel[i].x(), anel[i].y()
+                dx, dy = anel[i + 1].x() - x1, anel[i + 1].y() - y1
+
+                azimute = math.degrees(math.atan2(dx, dy)) % 360.0
+                azimute_gms, rumo = formatar_azimute_rumo(azimute)
+
+                yield Lado(
+                    fid, p + 1, r + 1,
+                    f"V{numero + i + 1}", f"V{numero + (i + 1) % vertices + 1}",
+                    x1, y1, azimute_gms, azimute, rumo, math.hypot(dx, dy)
+                )
+
+            numero += vertices
+
+
+def lados_camada(features):
+    """Gera os lados de todas as feições, sem guardá-los em memória."""
+    for feature in features:
+        if feature.hasGeometry():
+            yield from lados_feicao(feature.id(), feature.geometry())
+
+
+def exportar_csv(caminho, lados):
+    """Grava os lados em CSV (';' e vírgula decimal) linha a linha."""
+    total = 0
+    with open(caminho, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow([nome for nome, _ in CAMPOS])
+        for lado in lados:
+            writer.writerow([
+                lado.feicao, lado.parte, lado.anel, lado.de, lado.para,
+                f"{lado.x:.3f}".replace('.', ','), f"{lado.y:.3f}".replace('.', ','),
+                lado.azimute, f"{lado.azimute_dec:.6f}".replace('.', ','),
+                lado.rumo, f"{lado.distancia:.3f}".replace('.', ',')
+            ])
+            total += 1
+    return total
+
+
+def exportar_camada(nome, lados):
+    """Cria uma camada de tabela (sem geometria) com os lados, enviando as
+    feições ao provedor em lotes."""
+    layer = QgsVectorLayer("None", nome, "memory")
+    provider = layer.dataProvider()
+    provider.addAttributes([QgsField(campo, tipo) for campo, tipo in CAMPOS])
+    layer.updateFields()
+
+    fields = layer.fields()
+    lote = []
+    total = 0
+    for lado in lados:
+        feat = QgsFeature(fields)
+        feat.setAttributes(list(lado))
+        lote.append(feat)
+        if len(lote) >= _LOTE:
+            provider.addFeatures(lote)
+            total += len(lote)
+            lote = []
+
+    if lote:
+        provider.addFeatures(lote)
+        total += len(lote)
+
+    QgsProject.instance().addMapLayer(layer)
+    return total
+
+
+def run(iface):
+    layer = iface.activeLayer()
+    if not layer or layer.type() != QgsMapLayerType.VectorLayer or \
+       layer.geometryType() not in (QgsWkbTypes.LineGeometry, QgsWkbTypes.PolygonGeometry):
+        QMessageBox.warning(
+            iface.mainWindow(),
+            "Camada Inválida",
+            "Por favor, selecione uma camada de linhas ou polígonos."
+        )
+        return
+
+    if layer.crs().isGeographic():
+        QMessageBox.warning(
+            iface.mainWindow(),
+            "Sistema de Coordenadas Inválido",
+            "Esta ferramenta funciona apenas com sistemas de coordenadas projetados.\n\n"
+            f"Sistema atual da camada: {layer.crs().description()}"
+        )
+        return
+
+    saida, ok = QInputDialog.getItem(
+        iface.mainWindow(),
+        "Tabela de Azimutes e Distâncias",
+        "Exportar para:",
+        [SAIDA_CAMADA, SAIDA_CSV],
+        0,
+        False
+    )
+    if not ok:
+        return
+
+    # Com feições selecionadas, processa apenas a seleção
+    request = QgsFeatureRequest().setNoAttributes()
+    features = layer.getSelectedFeatures(request) if layer.selectedFeatureCount() else layer.getFeatures(request)
+    lados = lados_camada(features)
+
+    if saida == SAIDA_CSV:
+        caminho, _ = QFileDialog.getSaveFileName(
+            iface.mainWindow(),
+            "Salvar Tabela de Azimutes e Distâncias",
+            f"{layer.name()}_azimutes.csv",
+            "CSV (*.csv)"
+        )
+        if not caminho:
+            return
+
+        try:
+            total = exportar_csv(caminho, lados)
+        except OSError as e:
+            iface.messageBar().pushMessage(
+                "Erro", f"Não foi possível gravar o arquivo: {str(e)}", level=Qgis.Critical)
+            return
+        destino = caminho
+    else:
+        total = exportar_camada(f"{layer.name()}_azimutes", lados)
+        destino = f"a camada {layer.name()}_azimutes"
+
+    iface.messageBar().pushMessage(
+        "Sucesso",
+        f"{total} lados exportados para {destino}.",
+        level=Qgis.Success,
+        duration=5
+    )
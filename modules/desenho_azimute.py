@@ -21,10 +21,11 @@
 """
 
 from .rumo_azimute_base import BaseBearingTool
+from .angulos import decimal_para_dms, formatar_dms
 from qgis.PyQt import uic, QtWidgets
 from qgis.PyQt.QtCore import QSize
 from qgis.PyQt.QtGui import QIcon
-from qgis.PyQt.QtWidgets import QTableWidgetItem, QMessageBox, QHeaderView, QAbstractItemView
+from qgis.PyQt.QtWidgets import QMessageBox, QHeaderView
 from qgis.core import Qgis
 import os
 
@@ -42,38 +43,28 @@ class AzimuthDistanceTool(BaseBearingTool):
 
     def setup_table(self):
         """Configura a tabela com 2 colunas para azimute e distância."""
-        table = self.dlg.coordenadasTable
-        header = table.horizontalHeader()
+        super().setup_table()
+        header = self.dlg.coordenadasTable.horizontalHeader()
         # Compatibilidade Qt5/Qt6:
         try:
             header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)  # Qt6
         except AttributeError:
             header.setSectionResizeMode(QHeaderView.Stretch)  # Qt5
 
-        table.setColumnCount(2)
-
-        # Compatibilidade Qt5/Qt6:
-        try:
-            # Qt6
-            table.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked | 
-                                 QAbstractItemView.EditTrigger.EditKeyPressed)
-        except AttributeError:
-            # Qt5
-            table.setEditTriggers(QAbstractItemView.DoubleClicked | 
-                             QAbstractItemView.EditKeyPressed)
-
-        table.cellChanged.connect(self.ao_mudar_celula)
-
     def show_dialog(self):
         """Mostra o diálogo para entrada de azimute e distância."""
         if not self.dlg:
             self.dlg = AzimuthDistanceDialog(self.iface)
             # Configurar tabela
             self.setup_table()
+            self.setup_calculo()
             # Conectar botões
             self.dlg.inserirButton.clicked.connect(self.insert_values)
             self.dlg.desfazerButton.clicked.connect(self.undo_last_insert)
             self.dlg.salvarButton.clicked.connect(self.save_and_close)
+            self.dlg.importarButton.clicked.connect(self.importar_pernadas)
+            self.dlg.sessoesButton.clicked.connect(self.restaurar_sessao)
+            self.dlg.fechamentoButton.clicked.connect(self.verificar_fechamento)
             # Conectar eventos de mudança nos inputs para atualizar preview
             self.dlg.azimuteInput.textChanged.connect(self.atualizar_preview)
             self.dlg.distanciaInput.textChanged.connect(self.atualizar_preview)
@@ -81,18 +72,7 @@ class AzimuthDistanceTool(BaseBearingTool):
 
     def format_azimuth(self, dms_str):
         """Formata o azimute com símbolos de graus, minutos e segundos."""
-        try:
-            parts = dms_str.strip().split()
-            if len(parts) == 1:
-                return f"{float(parts[0]):.0f}°"
-            elif len(parts) == 2:
-                return f"{float(parts[0]):.0f}° {float(parts[1]):.0f}'"
-            elif len(parts) == 3:
-                return f"{float(parts[0]):.0f}° {float(parts[1]):.0f}' {float(parts[2]):.2f}\""
-            else:
-                return dms_str
-        except ValueError:
-            return dms_str
+        return formatar_dms(dms_str)
 
     def insert_values(self):
         """Insere os valores atuais na tabela."""
@@ -127,21 +107,8 @@ class AzimuthDistanceTool(BaseBearingTool):
                 )
                 return
 
-            self.inserted_values.append((azimuth, distance))
-
-            # Desconectar o sinal para evitar recursão ao adicionar itens
-            table = self.dlg.coordenadasTable
-            table.cellChanged.disconnect(self.ao_mudar_celula)
-
-            row = table.rowCount()
-            table.insertRow(row)
-
             # Mostrar o valor formatado na tabela
-            table.setItem(row, 0, QTableWidgetItem(self.format_azimuth(azimuth_dms)))
-            table.setItem(row, 1, QTableWidgetItem(f"{distance:.2f}m"))
-
-            # Reconectar o sinal após inserir os itens
-            table.cellChanged.connect(self.ao_mudar_celula)
+            self.inserir_pernada(azimuth, distance, (self.format_azimuth(azimuth_dms),))
 
             self.dlg.azimuteInput.clear()
             self.dlg.distanciaInput.clear()
@@ -155,71 +122,33 @@ class AzimuthDistanceTool(BaseBearingTool):
                 level=Qgis.Warning
             )
 
-    def ao_mudar_celula(self, row, column):
-        """Atualiza os valores quando a tabela é editada pelo usuário."""
-        try:
-            table = self.dlg.coordenadasTable
+    def textos_pernada(self, pernada):
+        """Texto exibido na tabela para uma pernada importada."""
+        # Pernadas informadas por rumo são exibidas pelo azimute equivalente
+        dms = pernada.angulo_dms if pernada.quadrante is None else decimal_para_dms(pernada.azimute)
+        return (self.format_azimuth(dms),)
 
-            if row >= len(self.inserted_values):
-                return
+    def editar_celula(self, row, column, cell_text):
+        """Valida um valor editado na tabela; retorna False para rejeitá-lo."""
+        if column == 1:
+            return self.editar_distancia(row, cell_text)
 
-            cell_text = table.item(row, column).text()
-
-            if column == 0:
-                # Remove símbolo de grau, minuto e segundo se existir
-                clean_text = cell_text.replace('°', ' ').replace("'", ' ').replace('"', ' ')
-                clean_text = ' '.join(clean_text.split())
-
-                azimuth = self.dms_to_decimal(clean_text)
-                if azimuth is None or azimuth < 0 or azimuth > 360:
-                    self.iface.messageBar().pushMessage(
-                        "Erro", 
-                        "Azimute inválido. O valor deve estar entre 0 e 360 graus.",
-                        level=Qgis.Warning
-                    )
-
-                    table.cellChanged.disconnect(self.ao_mudar_celula)
-                    old_azimuth = self.inserted_values[row][0]
-                    table.setItem(row, column, QTableWidgetItem(f"{old_azimuth:.2f}°"))
-                    table.cellChanged.connect(self.ao_mudar_celula)
-                    return
-
-                original_distance = self.inserted_values[row][1]
-                self.inserted_values[row] = (azimuth, original_distance)
-
-            elif column == 1:  # Distância
-                clean_text = cell_text.replace('m', '').strip()
-
-                try:
-                    distance = float(clean_text)
-                    if distance <= 0:
-                        raise ValueError("Distância deve ser maior que zero")
-
-                    original_azimuth = self.inserted_values[row][0]
-                    self.inserted_values[row] = (original_azimuth, distance)
-
-                    table.cellChanged.disconnect(self.ao_mudar_celula)
-                    table.setItem(row, column, QTableWidgetItem(f"{distance:.2f}m"))
-                    table.cellChanged.connect(self.ao_mudar_celula)
-
-                except ValueError:
-                    self.iface.messageBar().pushMessage(
-                        "Erro", 
-                        "Distância inválida. Use um valor numérico maior que zero.",
-                        level=Qgis.Warning
-                    )
-
-                    table.cellChanged.disconnect(self.ao_mudar_celula)
-                    old_distance = self.inserted_values[row][1]
-                    table.setItem(row, column, QTableWidgetItem(f"{old_distance:.2f}m"))
-                    table.cellChanged.connect(self.ao_mudar_celula)
-                    return
+        # Remove símbolo de grau, minuto e segundo se existir
+        clean_text = cell_text.replace('°', ' ').replace("'", ' ').replace('"', ' ')
+        clean_text = ' '.join(clean_text.split())
 
-            self.atualizar_preview()
+        azimuth = self.dms_to_decimal(clean_text)
+        if azimuth is None or azimuth < 0 or azimuth > 360:
+            self.iface.messageBar().pushMessage(
+                "Erro", 
+                "Azimute inválido. O valor deve estar entre 0 e 360 graus.",
+                level=Qgis.Warning
+            )
+            return False
 
-        except Exception as e:
-            print(f"DEBUG: Erro ao atualizar valor na tabela: {str(e)}")
-            self.atualizar_preview()
+        self.atualizar_pernada(row, azimuth, self.pernadas.distancias[row], (self.format_azimuth(clean_text),))
+        self.atualizar_preview()
+        return True
 
     def atualizar_preview(self):
         """Atualiza o preview com o estado atual."""
@@ -21,10 +21,11 @@
 """
 
 from .rumo_azimute_base import BaseBearingTool
+from .angulos import azimute_para_rumo, decimal_para_dms, formatar_dms, rumo_para_azimute
 from qgis.PyQt import uic, QtWidgets
 from qgis.PyQt.QtCore import QSize
 from qgis.PyQt.QtGui import QIcon
-from qgis.PyQt.QtWidgets import QTableWidgetItem, QMessageBox, QHeaderView, QAbstractItemView
+from qgis.PyQt.QtWidgets import QMessageBox, QHeaderView
 from qgis.core import Qgis
 import os
 
@@ -36,12 +37,15 @@ FORM_CLASS, _ = uic.loadUiType(os.path.join(
 class RumoDistanceTool(BaseBearingTool):
     """Ferramenta para desenhar linhas usando rumo (quadrante) e distância."""
 
+    colunas = ("Rumo", "Quadrante", "Distância")
+
     def get_nome_camada(self):
         """Retorna o nome da camada."""
         return "Linhas_Rumo"
 
     def setup_table(self):
         """Configura a tabela com 3 colunas para rumo, quadrante e distância."""
+        super().setup_table()
         table = self.dlg.coordenadasTable
         header = table.horizontalHeader()
         # Compatibilidade Qt5/Qt6:
@@ -50,35 +54,25 @@ class RumoDistanceTool(BaseBearingTool):
         except AttributeError:
             header.setSectionResizeMode(QHeaderView.Interactive)  # Qt5
 
-        table.setColumnCount(3)
-
         # Define largura fixa das colunas (para 370px disponíveis)
         table.setColumnWidth(0, 140)  # Rumo
         table.setColumnWidth(1, 100)  # Quadrante
         table.setColumnWidth(2, 126)  # Distância
 
-        # Compatibilidade Qt5/Qt6:
-        try:
-            # Qt6
-            table.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked | 
-                                 QAbstractItemView.EditTrigger.EditKeyPressed)
-        except AttributeError:
-            # Qt5
-            table.setEditTriggers(QAbstractItemView.DoubleClicked | 
-                             QAbstractItemView.EditKeyPressed)
-
-        table.cellChanged.connect(self.ao_mudar_celula)
-
     def show_dialog(self):
         """Mostra o diálogo para entrada de rumo e distância."""
         if not self.dlg:
             self.dlg = RumoDistanceDialog(self.iface)
             # Configurar tabela
             self.setup_table()
+            self.setup_calculo()
             # Conectar botões
             self.dlg.inserirButton.clicked.connect(self.insert_values)
             self.dlg.desfazerButton.clicked.connect(self.undo_last_insert)
             self.dlg.salvarButton.clicked.connect(self.save_and_close)
+            self.dlg.importarButton.clicked.connect(self.importar_pernadas)
+            self.dlg.sessoesButton.clicked.connect(self.restaurar_sessao)
+            self.dlg.fechamentoButton.clicked.connect(self.verificar_fechamento)
             self.dlg.rumoInput.textChanged.connect(self.atualizar_preview)
             self.dlg.quadranteCombo.currentTextChanged.connect(self.atualizar_preview)
             self.dlg.distanciaInput.textChanged.connect(self.atualizar_preview)
@@ -87,40 +81,13 @@ class RumoDistanceTool(BaseBearingTool):
     def converter_rumo_azimute(self, rumo_decimal, quadrante):
         """Converte rumo decimal e quadrante para azimute"""
         try:
-            if rumo_decimal < 0 or rumo_decimal > 90:
-                return None
-
-            # Converter para azimute baseado no quadrante
-            if quadrante == 'NE':
-                azimuth = rumo_decimal
-            elif quadrante == 'SE':
-                azimuth = 180 - rumo_decimal
-            elif quadrante == 'SW':
-                azimuth = 180 + rumo_decimal
-            elif quadrante == 'NW':
-                azimuth = 360 - rumo_decimal
-            else:
-                return None
-
-            return azimuth
-
-        except (ValueError, AttributeError):
+            return rumo_para_azimute(rumo_decimal, quadrante)
+        except (ValueError, TypeError):
             return None
 
     def format_rumo_dms(self, dms_str):
         """Formata o rumo com símbolos de graus, minutos e segundos."""
-        try:
-            parts = dms_str.strip().split()
-            if len(parts) == 1:
-                return f"{float(parts[0]):.0f}°"
-            elif len(parts) == 2:
-                return f"{float(parts[0]):.0f}° {float(parts[1]):.0f}'"
-            elif len(parts) == 3:
-                return f"{float(parts[0]):.0f}° {float(parts[1]):.0f}' {float(parts[2]):.2f}\""
-            else:
-                return dms_str
-        except ValueError:
-            return dms_str
+        return formatar_dms(dms_str)
 
     def remove_dms_symbols(self, dms_str):
         """Remove os símbolos de graus, minutos e segundos de uma string."""
@@ -173,25 +140,8 @@ class RumoDistanceTool(BaseBearingTool):
                 )
                 return
 
-            # Criar string formatada do rumo para exibição
-            rumo_formatted = f"{self.format_rumo_dms(rumo_dms)} {quadrante}"
-            self.inserted_values.append((rumo_formatted, azimuth, distance))
-
-            # Desconectar o sinal para evitar recursão ao adicionar itens
-            table = self.dlg.coordenadasTable
-            table.cellChanged.disconnect(self.ao_mudar_celula)
-
-            row = table.rowCount()
-            table.insertRow(row)
-
             # Mostrar o valor formatado na tabela
-            rumo_only = self.format_rumo_dms(rumo_dms)
-            table.setItem(row, 0, QTableWidgetItem(rumo_only))
-            table.setItem(row, 1, QTableWidgetItem(quadrante))
-            table.setItem(row, 2, QTableWidgetItem(f"{distance:.2f}m"))
-
-            # Reconectar o sinal após inserir os itens
-            table.cellChanged.connect(self.ao_mudar_celula)
+            self.inserir_pernada(azimuth, distance, (self.format_rumo_dms(rumo_dms), quadrante))
 
             self.dlg.rumoInput.clear()
             self.dlg.distanciaInput.clear()
@@ -205,148 +155,58 @@ class RumoDistanceTool(BaseBearingTool):
                 level=Qgis.Warning
             )
 
-    def ao_mudar_celula(self, row, column):
-        """Atualiza os valores quando a tabela é editada pelo usuário."""
-        try:
-            table = self.dlg.coordenadasTable
+    def textos_pernada(self, pernada):
+        """Textos exibidos na tabela (rumo e quadrante) para uma pernada importada."""
+        if pernada.quadrante:
+            return (self.format_rumo_dms(pernada.angulo_dms), pernada.quadrante)
 
-            if row >= len(self.inserted_values):
-                return
+        # Pernadas informadas por azimute são convertidas para rumo
+        rumo_decimal, quadrante = azimute_para_rumo(pernada.azimute)
+        return (self.format_rumo_dms(decimal_para_dms(rumo_decimal)), quadrante)
 
-            cell_text = table.item(row, column).text()
-
-            if column == 0:  # Rumo
-                # Validar e atualizar o rumo
-                try:
-                    rumo_decimal = self.dms_to_decimal(cell_text)
-
-                    if rumo_decimal is None or rumo_decimal < 0 or rumo_decimal > 90:
-                        self.iface.messageBar().pushMessage(
-                            "Erro", 
-                            "Rumo inválido. O valor deve estar entre 0 e 90 graus.",
-                            level=Qgis.Warning
-                        )
-                        table.cellChanged.disconnect(self.ao_mudar_celula)
-                        old_rumo_full = self.inserted_values[row][0]
-                        old_rumo = ' '.join(old_rumo_full.split()[:-1])  # Remove o quadrante
-                        table.setItem(row, column, QTableWidgetItem(old_rumo))
-                        table.cellChanged.connect(self.ao_mudar_celula)
-                        return
-
-                    # Pegar o quadrante atual
-                    old_quadrant = self.inserted_values[row][0].split()[-1]
-
-                    # Recalcular azimute com novo rumo e quadrante existente
-                    new_azimuth = self.converter_rumo_azimute(rumo_decimal, old_quadrant)
-                    original_distance = self.inserted_values[row][2]
-
-                    # Formatar o rumo
-                    rumo_formatted_display = self.format_rumo_dms(cell_text)
-                    rumo_formatted = f"{rumo_formatted_display} {old_quadrant}"
-
-                    self.inserted_values[row] = (rumo_formatted, new_azimuth, original_distance)
-
-                    table.cellChanged.disconnect(self.ao_mudar_celula)
-                    table.setItem(row, column, QTableWidgetItem(rumo_formatted_display))
-                    table.cellChanged.connect(self.ao_mudar_celula)
-
-                    self.atualizar_preview()
-
-                except (ValueError, AttributeError):
-                    self.iface.messageBar().pushMessage(
-                        "Erro", 
-                        "Formato de rumo inválido. Use: '45' ou '45 30' ou '45 30 15'",
-                        level=Qgis.Warning
-                    )
-                    table.cellChanged.disconnect(self.ao_mudar_celula)
-                    old_rumo_full = self.inserted_values[row][0]
-                    old_rumo = ' '.join(old_rumo_full.split()[:-1])  # Remove o quadrante
-                    table.setItem(row, column, QTableWidgetItem(old_rumo))
-                    table.cellChanged.connect(self.ao_mudar_celula)
-                return
+    def editar_celula(self, row, column, cell_text):
+        """Valida um valor editado na tabela; retorna False para rejeitá-lo."""
+        if column == 2:
+            return self.editar_distancia(row, cell_text)
 
-            elif column == 1:
-                new_quadrant = cell_text.strip().upper()
-                old_quadrant = self.inserted_values[row][0].split()[-1]
-                if new_quadrant == old_quadrant:
-                    return
-
-                # Validar quadrante
-                valid_quadrants = ['NE', 'SE', 'SW', 'NW']
-                if new_quadrant not in valid_quadrants:
-                    self.iface.messageBar().pushMessage(
-                        "Erro", 
-                        "Quadrante inválido. Use: NE, SE, SW ou NW",
-                        level=Qgis.Warning
-                    )
-                    table.cellChanged.disconnect(self.ao_mudar_celula)
-                    table.setItem(row, column, QTableWidgetItem(old_quadrant))
-                    table.cellChanged.connect(self.ao_mudar_celula)
-                    return
-
-                # Atualizar o azimute baseado no novo quadrante
-                rumo_parts = self.inserted_values[row][0].split()
-                rumo_str_with_symbols = ' '.join(rumo_parts[:-1])  # Pega tudo menos o quadrante
-
-                # Remover símbolos de °, ', " antes de processar
-                rumo_str_clean = self.remove_dms_symbols(rumo_str_with_symbols)
-                rumo_decimal = self.dms_to_decimal(rumo_str_clean)
-
-                if rumo_decimal is None:
-                    return
-
-                new_azimuth = self.converter_rumo_azimute(rumo_decimal, new_quadrant)
-
-                if new_azimuth is None:
-                    return
-
-                original_distance = self.inserted_values[row][2]
-                rumo_formatted = f"{rumo_str_with_symbols} {new_quadrant}"
-                self.inserted_values[row] = (rumo_formatted, new_azimuth, original_distance)
-
-                # Atualizar a célula sem disparar o evento
-                table.cellChanged.disconnect(self.ao_mudar_celula)
-                table.setItem(row, column, QTableWidgetItem(new_quadrant))
-                table.cellChanged.connect(self.ao_mudar_celula)
-
-                # Atualizar preview
-                self.atualizar_preview()
-                return
+        rumo_display, quadrante = self.pernadas.textos[row]
 
-            elif column == 2:  # Distância
-                clean_text = cell_text.replace('m', '').strip()
+        if column == 0:  # Rumo
+            rumo_text = self.remove_dms_symbols(cell_text)
+            rumo_decimal = self.dms_to_decimal(rumo_text)
 
-                try:
-                    distance = float(clean_text)
-                    if distance <= 0:
-                        raise ValueError("Distância deve ser maior que zero")
+            if rumo_decimal is None or rumo_decimal < 0 or rumo_decimal > 90:
+                self.iface.messageBar().pushMessage(
+                    "Erro", 
+                    "Rumo inválido. O valor deve estar entre 0 e 90 graus. Use: '45' ou '45 30' ou '45 30 15'",
+                    level=Qgis.Warning
+                )
+                return False
 
-                    original_rumo = self.inserted_values[row][0]
-                    original_azimuth = self.inserted_values[row][1]
-                    self.inserted_values[row] = (original_rumo, original_azimuth, distance)
+            rumo_display = self.format_rumo_dms(rumo_text)
 
-                    table.cellChanged.disconnect(self.ao_mudar_celula)
-                    table.setItem(row, column, QTableWidgetItem(f"{distance:.2f}m"))
-                    table.cellChanged.connect(self.ao_mudar_celula)
+        else:  # Quadrante
+            quadrante = cell_text.strip().upper()
 
-                except ValueError:
-                    self.iface.messageBar().pushMessage(
-                        "Erro", 
-                        "Distância inválida. Use um valor numérico maior que zero.",
-                        level=Qgis.Warning
-                    )
+            # Validar quadrante
+            if quadrante not in ('NE', 'SE', 'SW', 'NW'):
+                self.iface.messageBar().pushMessage(
+                    "Erro", 
+                    "Quadrante inválido. Use: NE, SE, SW ou NW",
+                    level=Qgis.Warning
+                )
+                return False
 
-                    table.cellChanged.disconnect(self.ao_mudar_celula)
-                    old_distance = self.inserted_values[row][2]
-                    table.setItem(row, column, QTableWidgetItem(f"{old_distance:.2f}m"))
-                    table.cellChanged.connect(self.ao_mudar_celula)
-                    return
+            rumo_decimal = self.dms_to_decimal(self.remove_dms_symbols(rumo_display))
 
-            self.atualizar_preview()
+        # Recalcular azimute com o rumo e o quadrante
+        new_azimuth = self.converter_rumo_azimute(rumo_decimal, quadrante)
+        if new_azimuth is None:
+            return False
 
-        except Exception as e:
-            print(f"DEBUG: Erro ao atualizar valor na tabela: {str(e)}")
-            self.atualizar_preview()
+        self.atualizar_pernada(row, new_azimuth, self.pernadas.distancias[row], (rumo_display, quadrante))
+        self.atualizar_preview()
+        return True
 
     def atualizar_preview(self):
         """Atualiza o preview com o estado atual."""
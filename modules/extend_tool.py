@@ -29,6 +29,7 @@ from qgis.gui import QgsMapTool, QgsRubberBand
 from qgis.PyQt.QtCore import Qt
 from qgis.PyQt.QtGui import QColor
 from qgis.PyQt.QtWidgets import QMessageBox
+from .line_parts import line_parts, closest_part_index, extend_part
 
 
 class ExtendTool(QgsMapTool):
@@ -157,11 +158,17 @@ class ExtendTool(QgsMapTool):
             self.perform_extend()
             self.reset_tool()
 
-    def determine_extend_side(self, line_geom, mouse_point):
-        if line_geom.isMultipart():
-            points = line_geom.asMultiPolyline()[0]
-        else:
-            points = line_geom.asPolyline()
+    def get_part_points(self, line_geom, part_index):
+        """Vértices (sem cópia) de uma parte da linha."""
+        parts = line_parts(line_geom)
+        if not parts:
+            return []
+        return parts[part_index] if part_index < len(parts) else parts[0]
+
+    def determine_extend_side(self, line_geom, mouse_point, part_index=None):
+        if part_index is None:
+            part_index = closest_part_index(line_geom, mouse_point)
+        points = self.get_part_points(line_geom, part_index)
 
         if len(points) < 2:
             return 'end'
@@ -190,12 +197,10 @@ class ExtendTool(QgsMapTool):
 
         return 'end'
 
-    def extend_line_from_side(self, line_geom, target_geom, side):
-        """Estende a linha a partir de um lado específico até intersectar a linha alvo."""
-        if line_geom.isMultipart():
-            points = line_geom.asMultiPolyline()[0]
-        else:
-            points = line_geom.asPolyline()
+    def extend_line_from_side(self, line_geom, target_geom, side, part_index=0):
+        """Estende a linha a partir de um lado específico até intersectar a linha alvo.
+        Em geometrias multipart, apenas a parte indicada é estendida."""
+        points = self.get_part_points(line_geom, part_index)
 
         if len(points) < 2:
             return None
@@ -218,9 +223,7 @@ class ExtendTool(QgsMapTool):
             intersection = self.find_line_intersection(extended_geom, target_geom)
 
             if intersection:
-                new_points = list(points)
-                new_points.append(intersection)
-                return QgsGeometry.fromPolylineXY(new_points)
+                return extend_part(line_geom, points.index, intersection, False)
 
         else:
             p_after_first = points[1] if len(points) > 1 else last_point
@@ -237,8 +240,7 @@ class ExtendTool(QgsMapTool):
             intersection = self.find_line_intersection(extended_geom, target_geom)
 
             if intersection:
-                new_points = [intersection] + list(points)
-                return QgsGeometry.fromPolylineXY(new_points)
+                return extend_part(line_geom, points.index, intersection, True)
 
         return None
 
@@ -249,9 +251,10 @@ class ExtendTool(QgsMapTool):
         # Limpa preview anterior
         self.preview_rubber_band.reset()
 
-        side = self.determine_extend_side(line_geom, mouse_point)
+        part_index = closest_part_index(line_geom, mouse_point)
+        side = self.determine_extend_side(line_geom, mouse_point, part_index)
 
-        extended_geom = self.extend_line_from_side(line_geom, target_geom, side)
+        extended_geom = self.extend_line_from_side(line_geom, target_geom, side, part_index)
 
         if extended_geom and not extended_geom.isEmpty():
             extended_geom_canvas = self.transform_geometry_to_canvas_crs(
@@ -302,8 +305,9 @@ class ExtendTool(QgsMapTool):
                 print(f"Erro na transformação de CRS: {str(e)}")
                 return
 
-        side = self.determine_extend_side(line_geom, mouse_in_layer_crs)
-        extended_geom = self.extend_line_from_side(line_geom, target_geom_in_line_crs, side)
+        part_index = closest_part_index(line_geom, mouse_in_layer_crs)
+        side = self.determine_extend_side(line_geom, mouse_in_layer_crs, part_index)
+        extended_geom = self.extend_line_from_side(line_geom, target_geom_in_line_crs, side, part_index)
 
         if not extended_geom or extended_geom.equals(line_geom):
             return
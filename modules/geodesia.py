@@ -0,0 +1,173 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Problema geodésico direto (Vincenty), fator de escala e convergência
+ meridiana da projeção Transversa de Mercator, sem dependência do QGIS.
+"""
+
+import math
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+Elipsoide = namedtuple('Elipsoide', ['a', 'f', 'b', 'e2', 'ep2', 'raio_medio'])
+Zona = namedtuple('Zona', ['elipsoide', 'lon0', 'k0'])
+
+_MAX_ITERACOES = 200
+_TOLERANCIA = 1e-12
+
+
+@lru_cache(maxsize=16)
+def elipsoide(a, f):
+    """Constantes derivadas do elipsoide (semieixo maior e achatamento)."""
+    b = a * (1 - f)
+    e2 = f * (2 - f)
+    ep2 = e2 / (1 - e2)
+    return Elipsoide(a, f, b, e2, ep2, (2 * a + b) / 3)
+
+
+@lru_cache(maxsize=64)
+def parametros_tm(proj_string):
+    """Retorna (meridiano_central, k0) de uma projeção TM/UTM na sintaxe PROJ,
+    ou None se a projeção não for Transversa de Mercator."""
+    if not re.search(r'\+proj=(utm|tmerc|etmerc)\b', proj_string):
+        return None
+
+    zona = re.search(r'\+zone=(\d+)', proj_string)
+    if '+proj=utm' in proj_string and zona:
+        return int(zona.group(1)) * 6 - 183, 0.9996
+
+    lon0 = re.search(r'\+lon_0=([-\d.]+)', proj_string)
+    k0 = re.search(r'\+k(?:_0)?=([\d.]+)', proj_string)
+    return (float(lon0.group(1)) if lon0 else 0.0,
+            float(k0.group(1)) if k0 else 1.0)
+
+
+@lru_cache(maxsize=64)
+def zona(a, f, lon0, k0):
+    """Parâmetros de uma zona TM, reaproveitados entre as pernadas."""
+    return Zona(elipsoide(a, f), lon0, k0)
+
+
+def fator_elevacao(altitude, elip):
+    """Fator de redução da distância do terreno ao elipsoide."""
+    return elip.raio_medio / (elip.raio_medio + altitude)
+
+
+def escala_convergencia(lat, lon, zona_tm):
+    """Fator de escala pontual e convergência meridiana (graus) da projeção TM.
+
+    A convergência é positiva a leste do meridiano central no hemisfério norte;
+    azimute de quadrícula = azimute verdadeiro - convergência."""
+    phi = math.radians(lat)
+    dlon = math.radians(lon - zona_tm.lon0)
+    ep2 = zona_tm.elipsoide.ep2
+
+    cos_phi = math.cos(phi)
+    t2 = math.tan(phi) ** 2
+    eta2 = ep2 * cos_phi ** 2
+    a2 = (dlon * cos_phi) ** 2
+
+    k = zona_tm.k0 * (
+        1 + (1 + eta2) * a2 / 2
+        + (5 - 4 * t2 + 42 * eta2 + 13 * eta2 ** 2 - 28 * ep2) * a2 ** 2 / 24
+        + (61 - 148 * t2 + 16 * t2 ** 2) * a2 ** 3 / 720
+    )
+
+    gamma = dlon * math.sin(phi) * (
+        1 + a2 / 3 * (1 + 3 * eta2 + 2 * eta2 ** 2)
+        + a2 ** 2 / 15 * (2 - t2)
+    )
+
+    return k, math.degrees(gamma)
+
+
+def direto(lat, lon, azimute, distancia, elip):
+    """Problema geodésico direto de Vincenty.
+
+    Retorna (latitude, longitude, azimute_final) em graus."""
+    a, f, b = elip.a, elip.f, elip.b
+
+    alpha1 = math.radians(azimute)
+    sin_alpha1, cos_alpha1 = math.sin(alpha1), math.cos(alpha1)
+
+    tan_u1 = (1 - f) * math.tan(math.radians(lat))
+    cos_u1 = 1 / math.sqrt(1 + tan_u1 ** 2)
+    sin_u1 = tan_u1 * cos_u1
+
+    sigma1 = math.atan2(tan_u1, cos_alpha1)
+    sin_alpha = cos_u1 * sin_alpha1
+    cos2_alpha = 1 - sin_alpha ** 2
+    u2 = cos2_alpha * (a ** 2 - b ** 2) / b ** 2
+    coef_a = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    coef_b = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+
+    sigma = distancia / (b * coef_a)
+    for _ in range(_MAX_ITERACOES):
+        cos_2sigma_m = math.cos(2 * sigma1 + sigma)
+        sin_sigma, cos_sigma = math.sin(sigma), math.cos(sigma)
+        delta_sigma = coef_b * sin_sigma * (
+            cos_2sigma_m + coef_b / 4 * (
+                cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+                - coef_b / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+            )
+        )
+        anterior = sigma
+        sigma = distancia / (b * coef_a) + delta_sigma
+        if abs(sigma - anterior) < _TOLERANCIA:
+            break
+
+    cos_2sigma_m = math.cos(2 * sigma1 + sigma)
+    sin_sigma, cos_sigma = math.sin(sigma), math.cos(sigma)
+
+    x = sin_u1 * sin_sigma - cos_u1 * cos_sigma * cos_alpha1
+    lat2 = math.atan2(
+        sin_u1 * cos_sigma + cos_u1 * sin_sigma * cos_alpha1,
+        (1 - f) * math.sqrt(sin_alpha ** 2 + x ** 2)
+    )
+    lam = math.atan2(sin_sigma * sin_alpha1, cos_u1 * cos_sigma - sin_u1 * sin_sigma * cos_alpha1)
+    c = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+    dlon = lam - (1 - c) * f * sin_alpha * (
+        sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2))
+    )
+    alpha2 = math.atan2(sin_alpha, -x)
+
+    return math.degrees(lat2), lon + math.degrees(dlon), math.degrees(alpha2) % 360.0
+
+
+def propagar_geodesico(lat, lon, azimutes, distancias, elip, altitude=0.0):
+    """Resolve o problema direto para todas as pernadas em uma única passada.
+
+    As distâncias de terreno são reduzidas ao elipsoide pela altitude média.
+    Retorna a lista de (latitude, longitude) do fim de cada pernada."""
+    fator = fator_elevacao(altitude, elip)
+    pontos = []
+    for azimute, distancia in zip(azimutes, distancias):
+        lat, lon, _ = direto(lat, lon, azimute, distancia * fator, elip)
+        pontos.append((lat, lon))
+    return pontos
+
+
+def reduzir_pernada(lat, lon, azimute, distancia, zona_tm, altitude=0.0):
+    """Converte azimute verdadeiro e distância de terreno para azimute e
+    distância de quadrícula (convergência e fator de escala combinado)."""
+    k, gamma = escala_convergencia(lat, lon, zona_tm)
+    fator = k * fator_elevacao(altitude, zona_tm.elipsoide)
+    return azimute - gamma, distancia * fator
@@ -0,0 +1,223 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Leitura em fluxo de pernadas (azimute/rumo e distância) a partir de CSV,
+ TXT ou texto de memorial descritivo.
+"""
+
+import csv
+import re
+from collections import namedtuple
+
+from .angulos import interpretar_angulo, normalizar_quadrante, numero, rumo_para_azimute
+
+# rumo e quadrante ficam None quando a pernada foi informada por azimute
+Pernada = namedtuple('Pernada', ['azimute', 'distancia', 'angulo_dms', 'quadrante'])
+
+_ANGULO = r"(\d{1,3}(?:[.,]\d+)?\s*°?\s*(?:\d{1,2}(?:[.,]\d+)?\s*['′]\s*)?(?:\d{1,2}(?:[.,]\d+)?\s*(?:\"|″|''|”))?)"
+_DISTANCIA = r"dist[âa]ncia\s+(?:de\s+)?(\d[\d.]*(?:,\d+)?)\s*m"
+
+# "...azimute de 45°30'15" e distância de 120,35 m..."
+# "...rumo de 45°30'15" NE e distância de 120,35 m..." ou "rumo N 45°30'15" E"
+_MEMORIAL = re.compile(
+    r"(?:azimute\s+(?:plano\s+)?(?:de\s+)?" + _ANGULO +
+    r"|rumo\s+(?:de\s+)?([NS])?\s*" + _ANGULO + r"\s*(NE|SE|SW|NW|NO|SO|E|W|O)?\b)"
+    r"[^;]{0,80}?" + _DISTANCIA,
+    re.IGNORECASE
+)
+
+_COLUNAS = {
+    'azimute': ('azimute', 'azimuth', 'az'),
+    'rumo': ('rumo', 'bearing'),
+    'quadrante': ('quadrante', 'quadrant', 'quad'),
+    'distancia': ('distancia', 'distância', 'distance', 'dist'),
+}
+
+_TAMANHO_AMOSTRA = 64 * 1024
+
+
+class _DialetoPadrao(csv.excel):
+    """Planilhas brasileiras: ';' como separador e vírgula decimal."""
+    delimiter = ';'
+
+
+def detectar_codificacao(caminho):
+    """Retorna 'utf-8-sig' se o início do arquivo for UTF-8 válido, senão 'latin-1'."""
+    with open(caminho, 'rb') as f:
+        amostra = f.read(_TAMANHO_AMOSTRA)
+    try:
+        # Ignora um possível caractere multibyte cortado no fim da amostra
+        amostra.decode('utf-8')
+    except UnicodeDecodeError as e:
+        if e.start < len(amostra) - 3:
+            return 'latin-1'
+    return 'utf-8-sig'
+
+
+class ImportadorPoligonal:
+    """Lê pernadas de um arquivo sem carregá-lo inteiro na memória.
+
+    Linhas que não puderem ser interpretadas são contadas em `ignoradas`."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.ignoradas = 0
+
+    def pernadas(self):
+        codificacao = detectar_codificacao(self.caminho)
+
+        with open(self.caminho, 'r', encoding=codificacao, newline='') as f:
+            amostra = f.read(4096)
+            f.seek(0)
+
+            if _MEMORIAL.search(amostra) or re.search(r'\b(azimute|rumo)\s+(plano\s+)?de\b', amostra, re.IGNORECASE):
+                yield from self.ler_memorial(f)
+            elif self.caminho.lower().endswith('.csv'):
+                yield from self.ler_csv(f, amostra)
+            else:
+                yield from self.ler_txt(f)
+
+    def criar_pernada(self, angulo_texto, quadrante_texto, distancia_texto):
+        """Monta a pernada a partir dos textos do ângulo, quadrante e distância."""
+        try:
+            distancia = numero(distancia_texto)
+        except (ValueError, AttributeError):
+            return None
+
+        decimal, dms = interpretar_angulo(angulo_texto)
+        if decimal is None or distancia <= 0:
+            return None
+
+        if quadrante_texto:
+            quadrante = normalizar_quadrante(quadrante_texto)
+            azimute = rumo_para_azimute(decimal, quadrante)
+            if azimute is None:
+                return None
+            return Pernada(azimute, distancia, dms, quadrante)
+
+        if decimal > 360:
+            return None
+        return Pernada(decimal, distancia, dms, None)
+
+    def ler_memorial(self, arquivo):
+        """Procura as pernadas no texto corrido, lendo o arquivo por linhas."""
+        buffer = ''
+        for linha in arquivo:
+            buffer += linha.replace('\n', ' ')
+            fim = 0
+            for match in _MEMORIAL.finditer(buffer):
+                azimute, norte_sul, rumo, leste_oeste, distancia = match.groups()
+                if azimute:
+                    pernada = self.criar_pernada(azimute, None, distancia)
+                else:
+                    quadrante = (norte_sul or '') + (leste_oeste or '')
+                    pernada = self.criar_pernada(rumo, quadrante, distancia)
+
+                if pernada:
+                    yield pernada
+                else:
+                    self.ignoradas += 1
+                fim = match.end()
+
+            # Mantém apenas o trecho que ainda pode conter uma pernada incompleta
+            buffer = buffer[fim:][-2048:]
+
+    def dialeto_csv(self, amostra):
+        """Dialeto do CSV. A vírgula só é aceita como separador se não houver
+        ';' nem tabulação na amostra, pois nas planilhas brasileiras ela é o
+        separador decimal."""
+        separadores = ''.join(s for s in ';\t' if s in amostra) or ','
+        try:
+            return csv.Sniffer().sniff(amostra, delimiters=separadores)
+        except csv.Error:
+            return _DialetoPadrao
+
+    def ler_csv(self, arquivo, amostra):
+        dialeto = self.dialeto_csv(amostra)
+
+        leitor = csv.reader(arquivo, dialeto)
+        colunas = None
+
+        for n, linha in enumerate(leitor):
+            linha = [c.strip() for c in linha]
+            if not any(linha):
+                continue
+
+            if n == 0 and not re.search(r'\d', linha[0]):
+                colunas = self.mapear_colunas(linha)
+                continue
+
+            pernada = self.pernada_de_campos(linha, colunas)
+            if pernada:
+                yield pernada
+            else:
+                self.ignoradas += 1
+
+    def ler_txt(self, arquivo):
+        for linha in arquivo:
+            linha = linha.strip()
+            if not linha or linha.startswith('#'):
+                continue
+
+            campos = re.split(r'\s*[;\t]\s*', linha)
+            if len(campos) == 1:
+                # Separado por espaços: ângulo GMS + [quadrante] + distância
+                tokens = linha.split()
+                quadrante = None
+                for i, token in enumerate(tokens[:-1]):
+                    if normalizar_quadrante(token):
+                        quadrante = tokens.pop(i)
+                        break
+                campos = [' '.join(tokens[:-1])] + ([quadrante] if quadrante else []) + tokens[-1:]
+
+            pernada = self.pernada_de_campos(campos, None)
+            if pernada:
+                yield pernada
+            else:
+                self.ignoradas += 1
+
+    def mapear_colunas(self, cabecalho):
+        """Identifica as colunas pelo nome do cabeçalho."""
+        colunas = {}
+        for i, nome in enumerate(cabecalho):
+            nome = nome.strip().lower()
+            for chave, nomes in _COLUNAS.items():
+                if nome in nomes and chave not in colunas:
+                    colunas[chave] = i
+        return colunas if 'distancia' in colunas else None
+
+    def pernada_de_campos(self, campos, colunas):
+        """Interpreta uma linha tabular (2 colunas: azimute e distância;
+        3 colunas: rumo, quadrante e distância)."""
+        try:
+            if colunas:
+                distancia = campos[colunas['distancia']]
+                if 'rumo' in colunas and 'quadrante' in colunas:
+                    return self.criar_pernada(campos[colunas['rumo']], campos[colunas['quadrante']], distancia)
+                angulo = campos[colunas.get('azimute', 0)]
+                return self.criar_pernada(angulo, None, distancia)
+
+            if len(campos) == 2:
+                return self.criar_pernada(campos[0], None, campos[1])
+            if len(campos) == 3:
+                return self.criar_pernada(campos[0], campos[1], campos[2])
+        except IndexError:
+            pass
+        return None
@@ -0,0 +1,132 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from qgis.core import QgsGeometry, QgsPoint, QgsPointXY, QgsVertexId, QgsWkbTypes
+
+
+class LinePartView:
+    """Acesso aos vértices de uma parte de linha sem copiar a polilinha.
+
+    Lê diretamente da curva interna da geometria (constGet()), mantendo uma
+    referência à QgsGeometry para que a curva continue válida."""
+
+    def __init__(self, geometry, curve, index=0):
+        self.geometry = geometry
+        self.curve = curve
+        self.index = index
+
+    def __len__(self):
+        return self.curve.numPoints()
+
+    def __getitem__(self, i):
+        n = self.curve.numPoints()
+        if i < 0:
+            i += n
+        if i < 0 or i >= n:
+            raise IndexError(i)
+        return QgsPointXY(self.curve.xAt(i), self.curve.yAt(i))
+
+    def __iter__(self):
+        for vertex in self.curve.vertices():
+            yield QgsPointXY(vertex.x(), vertex.y())
+
+    def length(self):
+        return self.curve.length()
+
+
+def line_parts(geometry):
+    """Retorna uma visão (sem cópia) de cada parte de uma geometria de linha."""
+    if not geometry or geometry.isEmpty():
+        return []
+
+    abstract = geometry.constGet()
+    if QgsWkbTypes.isMultiType(abstract.wkbType()):
+        return [LinePartView(geometry, abstract.geometryN(i), i)
+                for i in range(abstract.numGeometries())]
+    return [LinePartView(geometry, abstract, 0)]
+
+
+def closest_part_index(geometry, point):
+    """Índice da parte com o segmento mais próximo do ponto."""
+    if not geometry or geometry.isEmpty() or not geometry.isMultipart():
+        return 0
+
+    _, _, next_vertex, _ = geometry.closestSegmentWithContext(point)
+    if next_vertex < 0:
+        return 0
+
+    # vertexIdFromVertexNr devolve (ok, QgsVertexId) no PyQGIS
+    ok, vertex_id = geometry.vertexIdFromVertexNr(next_vertex)
+    return max(vertex_id.part, 0) if ok else 0
+
+
+def part_near_points(geometry, reference_points):
+    """Parte cuja extremidade está mais próxima de algum dos pontos de referência.
+
+    Usa apenas as extremidades das partes, sem consultas ao GEOS."""
+    parts = line_parts(geometry)
+    if len(parts) <= 1 or not reference_points:
+        return parts[0] if parts else []
+
+    best_part = parts[0]
+    best_distance = float('inf')
+
+    for part in parts:
+        if len(part) < 2:
+            continue
+        for end in (part[0], part[-1]):
+            for reference in reference_points:
+                distance = end.sqrDist(reference)
+                if distance < best_distance:
+                    best_distance = distance
+                    best_part = part
+
+    return best_part
+
+
+def part_endpoints(geometry):
+    """Extremidades de todas as partes de uma geometria de linha."""
+    endpoints = []
+    for part in line_parts(geometry):
+        if len(part) >= 2:
+            endpoints.append(part[0])
+            endpoints.append(part[-1])
+    return endpoints
+
+
+def extend_part(geometry, part_index, point, at_start):
+    """Retorna uma cópia da geometria com um vértice acrescentado no início ou no
+    fim de uma parte, preservando as demais partes."""
+    new_geometry = QgsGeometry(geometry)
+    abstract = new_geometry.get()
+
+    if QgsWkbTypes.isMultiType(abstract.wkbType()):
+        curve = abstract.geometryN(part_index)
+    else:
+        curve = abstract
+
+    if at_start:
+        curve.insertVertex(QgsVertexId(0, 0, 0), QgsPoint(point.x(), point.y()))
+    else:
+        curve.insertVertex(QgsVertexId(0, 0, curve.numPoints()), QgsPoint(point.x(), point.y()))
+
+    return new_geometry
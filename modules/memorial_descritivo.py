@@ -0,0 +1,733 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Geração de memoriais descritivos de parcelas em HTML, ODT ou DOCX.
+"""
+
+import hashlib
+import html
+import math
+import os
+import re
+import sqlite3
+import threading
+import zipfile
+from collections import OrderedDict, namedtuple
+from xml.sax.saxutils import escape
+
+from qgis.core import (
+    Qgis, QgsApplication, QgsCoordinateTransform, QgsFeatureRequest, QgsGeometry,
+    QgsMapLayerType, QgsProject, QgsRectangle, QgsTask, QgsWkbTypes
+)
+from qgis.PyQt.QtWidgets import QFileDialog, QInputDialog, QMessageBox
+
+from .angulos import decimal_para_dms, formatar_dms
+from .confrontantes import IndiceConfrontantes
+from .registro_vertices import RegistroVertices
+
+# Dados de uma parcela copiados na thread principal
+Parcela = namedtuple('Parcela', ['fid', 'nome', 'geometria'])
+
+TITULO = 'titulo'
+SUBTITULO = 'subtitulo'
+PARAGRAFO = 'paragrafo'
+
+# Modelos do texto do memorial
+MODELO_CABECALHO = "Imóvel: {nome}\nÁrea: {area} m²\nPerímetro: {perimetro} m"
+MODELO_CONFRONTANTES = "Confrontantes: {confrontantes}."
+MODELO_INICIO = (
+    "Inicia-se a descrição deste perímetro no vértice {vertice}, "
+    "de coordenadas N {n} m e E {e} m"
+)
+MODELO_LADO = (
+    "; deste, segue{confrontacao} com azimute de {azimute} e distância de {distancia} m "
+    "até o vértice {vertice}, de coordenadas N {n} m e E {e} m"
+)
+MODELO_FIM = (
+    "; deste, segue{confrontacao} com azimute de {azimute} e distância de {distancia} m "
+    "até o vértice {vertice}, ponto inicial da descrição deste perímetro."
+)
+MODELO_CONFRONTACAO = " confrontando com {confrontantes},"
+MODELO_RODAPE = (
+    "Todas as coordenadas aqui descritas estão referenciadas ao sistema {crs}, "
+    "e todos os azimutes e distâncias, área e perímetro foram calculados no plano "
+    "de projeção."
+)
+
+# Memoriais já gerados nesta sessão, por parcela (chave inclui geometria,
+# códigos dos vértices e vizinhança); a trava protege o acesso das tarefas
+_cache_memoriais = OrderedDict()
+_TAMANHO_CACHE = 5000
+_trava_cache = threading.Lock()
+
+# Mantém referência às tarefas em execução (o gerenciador não as segura)
+_tarefas_ativas = []
+
+
+def formatar_numero(valor, casas=2):
+    """Formata número no padrão brasileiro (1.234,56)."""
+    texto = f"{valor:,.{casas}f}"
+    return texto.replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def aneis_horarios(geometria):
+    """Anéis da geometria no sentido horário, começando pelo vértice mais ao norte.
+
+    Retorna uma lista de (titulo, pontos) sem o ponto de fechamento repetido."""
+    aneis = []
+    partes = geometria.constGet().coordinateSequence()
+
+    for p, parte in enumerate(partes):
+        for r, anel in enumerate(parte):
+            pontos = [(v.x(), v.y()) for v in anel]
+            if len(pontos) > 1 and pontos[0] == pontos[-1]:
+                pontos.pop()
+            if len(pontos) < 3:
+                continue
+
+            # Área com sinal (fórmula de Gauss): positiva no sentido anti-horário
+            area = sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2)
+                       in zip(pontos, pontos[1:] + pontos[:1]))
+            if area > 0:
+                pontos.reverse()
+
+            inicio = max(range(len(pontos)), key=lambda i: (pontos[i][1], -pontos[i][0]))
+            pontos = pontos[inicio:] + pontos[:inicio]
+
+            if r == 0:
+                titulo = f"Perímetro {p + 1}" if len(partes) > 1 else "Perímetro"
+            else:
+                titulo = f"Perímetro interno {r}" + (f" da parte {p + 1}" if len(partes) > 1 else "")
+            aneis.append((titulo, pontos))
+
+    return aneis
+
+
+def descrever_perimetro(pontos, nomes, confrontacoes=None):
+    """Texto da descrição de um anel, lado a lado.
+
+    `confrontacoes` traz, para cada lado, a lista de confrontantes daquele lado."""
+    trechos = []
+    n = len(pontos)
+
+    x, y = pontos[0]
+    trechos.append(MODELO_INICIO.format(
+        vertice=nomes[0], n=formatar_numero(y, 3), e=formatar_numero(x, 3)))
+
+    for i in range(n):
+        x1, y1 = pontos[i]
+        x2, y2 = pontos[(i + 1) % n]
+        dx, dy = x2 - x1, y2 - y1
+
+        azimute = formatar_dms(decimal_para_dms(math.degrees(math.atan2(dx, dy)) % 360.0))
+        distancia = formatar_numero(math.hypot(dx, dy))
+
+        confrontacao = ""
+        if confrontacoes and confrontacoes[i]:
+            confrontacao = MODELO_CONFRONTACAO.format(confrontantes=", ".join(confrontacoes[i]))
+
+        modelo = MODELO_FIM if i == n - 1 else MODELO_LADO
+        trechos.append(modelo.format(
+            confrontacao=confrontacao, azimute=azimute, distancia=distancia, vertice=nomes[(i + 1) % n],
+            n=formatar_numero(y2, 3), e=formatar_numero(x2, 3)))
+
+    return ''.join(trechos)
+
+
+def vertices_parcela(parcela, registro=None):
+    """Anéis da parcela como (titulo, pontos, nomes).
+
+    Com um registro, os vértices recebem os códigos compartilhados da camada
+    (e as coordenadas registradas); sem ele, são numerados V1, V2, ..."""
+    aneis = []
+    numero = 0
+    for titulo, pontos in aneis_horarios(parcela.geometria):
+        if registro:
+            registrados = [registro.registrar(x, y) for x, y in pontos]
+            nomes = [codigo for codigo, _ in registrados]
+            pontos = [ponto for _, ponto in registrados]
+        else:
+            nomes = [f"V{numero + i + 1}" for i in range(len(pontos))]
+            numero += len(pontos)
+        aneis.append((titulo, pontos, nomes))
+    return aneis
+
+
+def assinatura_geometria(geometria):
+    return hashlib.md5(bytes(geometria.asWkb())).hexdigest()
+
+
+def vizinhanca_parcela(parcela, aneis, indice, assinaturas):
+    """Quem está junto aos vértices da parcela (dono, nome e hash da
+    geometria), com a tolerância do índice.
+
+    Se a vizinhança não mudou, os confrontantes de cada lado também não
+    mudaram; basta uma consulta ao índice em vez de uma por lado."""
+    xs = [x for _, pontos, _ in aneis for x, _ in pontos]
+    ys = [y for _, pontos, _ in aneis for _, y in pontos]
+    donos = indice.donos_proximos(QgsRectangle(min(xs), min(ys), max(xs), max(ys)))
+    return indice.tolerancia, frozenset((dono, indice.nomes[dono], assinaturas[dono])
+                                        for dono in donos if dono != parcela.fid)
+
+
+def chave_parcela(parcela, crs, aneis, vizinhanca):
+    """Identifica o conteúdo de um memorial para o cache, antes de procurar
+    os confrontantes de cada lado."""
+    vertices = tuple((nome, ponto) for _, pontos, nomes in aneis for nome, ponto in zip(nomes, pontos))
+    return (parcela.fid, parcela.nome, assinatura_geometria(parcela.geometria), crs, vertices, vizinhanca)
+
+
+def gerar_memorial(parcela, crs, registro=None, indice=None, assinaturas=None, aneis=None):
+    """Retorna os blocos (tipo, texto) do memorial de uma parcela.
+
+    Com um índice de confrontantes, cada lado informa com quem confronta e o
+    cabeçalho lista todos os confrontantes na ordem do percurso. O índice
+    exige as `assinaturas` (hash da geometria por dono) da chave do cache.
+    `aneis` são os vértices já registrados da parcela, se houver."""
+    if aneis is None:
+        aneis = vertices_parcela(parcela, registro)
+    vizinhanca = vizinhanca_parcela(parcela, aneis, indice, assinaturas) if indice and aneis else None
+
+    chave = chave_parcela(parcela, crs, aneis, vizinhanca)
+    with _trava_cache:
+        if chave in _cache_memoriais:
+            _cache_memoriais.move_to_end(chave)
+            return _cache_memoriais[chave]
+
+    confrontacoes = [indice.tabela(parcela.fid, pontos) if indice else []
+                     for _, pontos, _ in aneis]
+    confrontantes = []
+    for anel in confrontacoes:
+        for lado in anel:
+            for nome in lado:
+                if nome not in confrontantes:
+                    confrontantes.append(nome)
+
+    geometria = parcela.geometria
+    blocos = [
+        (TITULO, "MEMORIAL DESCRITIVO"),
+        (PARAGRAFO, MODELO_CABECALHO.format(
+            nome=parcela.nome,
+            area=formatar_numero(geometria.area()),
+            perimetro=formatar_numero(geometria.length()))),
+        (PARAGRAFO, MODELO_CONFRONTANTES.format(
+            confrontantes=", ".join(confrontantes) if confrontantes else "não identificados")),
+    ]
+
+    for (titulo, pontos, nomes), lados in zip(aneis, confrontacoes):
+        blocos.append((SUBTITULO, titulo))
+        blocos.append((PARAGRAFO, descrever_perimetro(pontos, nomes, lados)))
+
+    blocos.append((PARAGRAFO, MODELO_RODAPE.format(crs=crs)))
+
+    with _trava_cache:
+        _cache_memoriais[chave] = blocos
+        if len(_cache_memoriais) > _TAMANHO_CACHE:
+            _cache_memoriais.popitem(last=False)
+    return blocos
+
+
+class EscritorHtml:
+    """Grava os memoriais em um único arquivo HTML, parcela a parcela."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.arquivo = None
+
+    def __enter__(self):
+        self.arquivo = open(self.caminho, 'w', encoding='utf-8')
+        self.arquivo.write(
+            '<!DOCTYPE html>\n<html lang="pt-BR">\n<head>\n<meta charset="utf-8">\n'
+            '<title>Memorial Descritivo</title>\n<style>\n'
+            'body { font-family: Arial, sans-serif; max-width: 21cm; margin: auto; }\n'
+            'h1 { text-align: center; font-size: 14pt; }\n'
+            'h2 { font-size: 12pt; }\n'
+            'p { text-align: justify; white-space: pre-line; }\n'
+            'section { page-break-before: always; }\n'
+            'section:first-of-type { page-break-before: auto; }\n'
+            '</style>\n</head>\n<body>\n'
+        )
+        return self
+
+    def escrever(self, blocos):
+        self.arquivo.write('<section>\n')
+        for tipo, texto in blocos:
+            tag = {TITULO: 'h1', SUBTITULO: 'h2'}.get(tipo, 'p')
+            self.arquivo.write(f'<{tag}>{html.escape(texto)}</{tag}>\n')
+        self.arquivo.write('</section>\n')
+
+    def __exit__(self, *args):
+        self.arquivo.write('</body>\n</html>\n')
+        self.arquivo.close()
+
+
+class EscritorZip:
+    """Base dos formatos em pacote ZIP: o XML principal é gravado em fluxo
+    diretamente dentro do arquivo compactado."""
+
+    documento = None
+    inicio = ''
+    fim = ''
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.zip = None
+        self.fluxo = None
+        self.primeiro = True
+
+    def arquivos_fixos(self):
+        """Arquivos do pacote gravados antes do documento: [(nome, conteúdo, compactar)]."""
+        return []
+
+    def __enter__(self):
+        self.zip = zipfile.ZipFile(self.caminho, 'w', zipfile.ZIP_DEFLATED)
+        for nome, conteudo, compactar in self.arquivos_fixos():
+            self.zip.writestr(
+                nome, conteudo, zipfile.ZIP_DEFLATED if compactar else zipfile.ZIP_STORED)
+        self.fluxo = self.zip.open(self.documento, 'w')
+        self.gravar(self.inicio)
+        return self
+
+    def gravar(self, texto):
+        self.fluxo.write(texto.encode('utf-8'))
+
+    def escrever(self, blocos):
+        if not self.primeiro:
+            self.gravar(self.quebra_pagina())
+        self.primeiro = False
+
+        for tipo, texto in blocos:
+            for linha in texto.split('\n'):
+                self.gravar(self.paragrafo(tipo, escape(linha)))
+
+    def __exit__(self, *args):
+        self.gravar(self.fim)
+        self.fluxo.close()
+        self.zip.close()
+
+
+class EscritorOdt(EscritorZip):
+    """Documento de texto OpenDocument (LibreOffice)."""
+
+    documento = 'content.xml'
+    inicio = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<office:document-content '
+        'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+        'xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0" '
+        'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+        'xmlns:fo="urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0" '
+        'office:version="1.2">'
+        '<office:automatic-styles>'
+        '<style:style style:name="Titulo" style:family="paragraph">'
+        '<style:paragraph-properties fo:text-align="center"/>'
+        '<style:text-properties fo:font-size="14pt" fo:font-weight="bold"/></style:style>'
+        '<style:style style:name="Subtitulo" style:family="paragraph">'
+        '<style:text-properties fo:font-weight="bold"/></style:style>'
+        '<style:style style:name="Texto" style:family="paragraph">'
+        '<style:paragraph-properties fo:text-align="justify"/></style:style>'
+        '<style:style style:name="Quebra" style:family="paragraph">'
+        '<style:paragraph-properties fo:break-before="page"/></style:style>'
+        '</office:automatic-styles>'
+        '<office:body><office:text>'
+    )
+    fim = '</office:text></office:body></office:document-content>'
+
+    def arquivos_fixos(self):
+        return [
+            # O mimetype deve ser o primeiro arquivo, sem compactação
+            ('mimetype', 'application/vnd.oasis.opendocument.text', False),
+            ('META-INF/manifest.xml',
+             '<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" '
+             'manifest:version="1.2">'
+             '<manifest:file-entry manifest:full-path="/" '
+             'manifest:media-type="application/vnd.oasis.opendocument.text"/>'
+             '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+             '</manifest:manifest>', True),
+        ]
+
+    def paragrafo(self, tipo, texto):
+        estilo = {TITULO: 'Titulo', SUBTITULO: 'Subtitulo'}.get(tipo, 'Texto')
+        return f'<text:p text:style-name="{estilo}">{texto}</text:p>'
+
+    def quebra_pagina(self):
+        return '<text:p text:style-name="Quebra"/>'
+
+
+class EscritorDocx(EscritorZip):
+    """Documento do Microsoft Word (Office Open XML)."""
+
+    documento = 'word/document.xml'
+    inicio = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        '<w:body>'
+    )
+    fim = '</w:body></w:document>'
+
+    def arquivos_fixos(self):
+        return [
+            ('[Content_Types].xml',
+             '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+             '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+             '<Default Extension="rels" '
+             'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+             '<Default Extension="xml" ContentType="application/xml"/>'
+             '<Override PartName="/word/document.xml" ContentType='
+             '"application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+             '</Types>', True),
+            ('_rels/.rels',
+             '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+             '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+             '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/'
+             '2006/relationships/officeDocument" Target="word/document.xml"/>'
+             '</Relationships>', True),
+        ]
+
+    def paragrafo(self, tipo, texto):
+        if tipo == TITULO:
+            return ('<w:p><w:pPr><w:jc w:val="center"/></w:pPr><w:r><w:rPr><w:b/>'
+                    f'<w:sz w:val="28"/></w:rPr><w:t xml:space="preserve">{texto}</w:t></w:r></w:p>')
+        if tipo == SUBTITULO:
+            return f'<w:p><w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">{texto}</w:t></w:r></w:p>'
+        return ('<w:p><w:pPr><w:jc w:val="both"/></w:pPr>'
+                f'<w:r><w:t xml:space="preserve">{texto}</w:t></w:r></w:p>')
+
+    def quebra_pagina(self):
+        return '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
+
+ESCRITORES = {
+    '.html': EscritorHtml,
+    '.odt': EscritorOdt,
+    '.docx': EscritorDocx,
+}
+
+
+def escritor_para(caminho):
+    """Escolhe o formato de saída pela extensão do arquivo."""
+    for extensao, classe in ESCRITORES.items():
+        if caminho.lower().endswith(extensao):
+            return classe(caminho)
+    return None
+
+
+class MemorialTask(QgsTask):
+    """Gera em segundo plano os memoriais de todas as parcelas em um único arquivo.
+
+    Roda em uma QgsTask em vez de um pool de processos: dentro do QGIS o
+    interpretador é embutido e novos processos iniciariam outra instância
+    do aplicativo. As parcelas (e as vias, se houver) são copiadas na thread
+    principal; todas entram no cálculo dos confrontantes, mas só as de
+    `selecionadas` (se informado) geram memorial."""
+
+    def __init__(self, iface, parcelas, crs, caminho, selecionadas=None,
+                 registro=None, caminho_registro=None, vias=(), tolerancia=0.01):
+        super().__init__("Memorial Descritivo (RMCGEO)", QgsTask.CanCancel)
+        self.iface = iface
+        self.parcelas = parcelas
+        self.selecionadas = selecionadas
+        self.vias = vias
+        self.tolerancia = tolerancia
+        self.registro = registro
+        self.caminho_registro = caminho_registro
+        self.crs = crs
+        self.caminho = caminho
+        self.gerados = 0
+        self.erro = None
+
+    def indice_confrontantes(self):
+        """Indexa os lados de todas as parcelas e vias; retorna o índice e o
+        hash da geometria de cada dono, usado na chave do cache.
+
+        Os vértices ajustados ao registro podem se deslocar até a tolerância,
+        por isso o teste de divisa admite o dobro dela."""
+        indice = IndiceConfrontantes(2 * self.tolerancia)
+        assinaturas = {}
+        for parcela in self.parcelas:
+            indice.adicionar(parcela.fid, parcela.nome, parcela.geometria)
+            assinaturas[parcela.fid] = assinatura_geometria(parcela.geometria)
+        for via in self.vias:
+            indice.adicionar(('via', via.fid), via.nome, via.geometria)
+            assinaturas[('via', via.fid)] = assinatura_geometria(via.geometria)
+        return indice, assinaturas
+
+    def run(self):
+        try:
+            alvos = self.parcelas
+            if self.selecionadas:
+                alvos = [parcela for parcela in self.parcelas if parcela.fid in self.selecionadas]
+
+            indice, assinaturas = self.indice_confrontantes()
+            total = len(alvos)
+
+            # Registra os vértices de toda a camada em uma única passada, em
+            # ordem de fid, para que os códigos não dependam da seleção; os
+            # anéis registrados entram na chave do cache de cada memorial
+            registrados = {}
+            if self.registro:
+                for parcela in sorted(self.parcelas, key=lambda p: p.fid):
+                    registrados[parcela.fid] = vertices_parcela(parcela, self.registro)
+
+            with escritor_para(self.caminho) as escritor:
+                for n, parcela in enumerate(alvos):
+                    if self.isCanceled():
+                        return False
+                    self.setProgress(100.0 * n / total)
+
+                    escritor.escrever(gerar_memorial(
+                        parcela, self.crs, self.registro, indice, assinaturas,
+                        registrados.get(parcela.fid)))
+                    self.gerados += 1
+
+            return True
+
+        except Exception as e:
+            self.erro = str(e)
+            return False
+
+    def finished(self, result):
+        if self in _tarefas_ativas:
+            _tarefas_ativas.remove(self)
+
+        # Cancelado ou com erro: o arquivo ficou pela metade
+        if not result and os.path.exists(self.caminho):
+            try:
+                os.remove(self.caminho)
+            except OSError:
+                pass
+
+        if result and self.registro and self.caminho_registro:
+            try:
+                self.registro.salvar(self.caminho_registro)
+            except sqlite3.Error as e:
+                self.iface.messageBar().pushMessage(
+                    "Memorial Descritivo",
+                    f"Não foi possível gravar os códigos dos vértices: {str(e)}",
+                    level=Qgis.Warning
+                )
+
+        if result:
+            self.iface.messageBar().pushMessage(
+                "Memorial Descritivo",
+                f"{self.gerados} memoriais gravados em {self.caminho}.",
+                level=Qgis.Success,
+                duration=10
+            )
+        elif self.erro:
+            self.iface.messageBar().pushMessage(
+                "Memorial Descritivo", f"Erro ao gerar os memoriais: {self.erro}", level=Qgis.Critical)
+        else:
+            self.iface.messageBar().pushMessage(
+                "Memorial Descritivo", "Operação cancelada.", level=Qgis.Warning)
+
+
+def caminho_registro(layer):
+    """Arquivo SQLite com os códigos dos vértices: na pasta do projeto ou,
+    se o projeto não foi salvo, ao lado do arquivo da camada."""
+    pasta = QgsProject.instance().homePath()
+    if pasta:
+        return os.path.join(pasta, 'rmcgeo_vertices.sqlite')
+
+    fonte = layer.source().split('|')[0]
+    if os.path.isfile(fonte):
+        return os.path.splitext(fonte)[0] + '_vertices.sqlite'
+    return None
+
+
+def abrir_registro(iface, layer, tolerancia, prefixo, titulo):
+    """Cria o registro de vértices da camada com os códigos já atribuídos
+    em gerações anteriores. Retorna (registro, arquivo) ou (registro, None)
+    se não houver onde persistir os códigos."""
+    registro = RegistroVertices(layer.source(), tolerancia, prefixo.strip() or "V-")
+    arquivo = caminho_registro(layer)
+    if arquivo:
+        try:
+            registro.carregar(arquivo)
+        except sqlite3.Error as e:
+            iface.messageBar().pushMessage(
+                titulo,
+                f"Não foi possível ler os códigos dos vértices: {str(e)}",
+                level=Qgis.Warning
+            )
+            arquivo = None
+    else:
+        iface.messageBar().pushMessage(
+            titulo,
+            "Salve o projeto para manter os códigos dos vértices entre gerações.",
+            level=Qgis.Info,
+            duration=5
+        )
+    return registro, arquivo
+
+
+def copiar_parcelas(layer, campo=None):
+    """Copia as parcelas da camada (fid, nome e geometria) na thread principal."""
+    request = QgsFeatureRequest()
+    if campo:
+        request.setSubsetOfAttributes([campo], layer.fields())
+    else:
+        request.setNoAttributes()
+
+    parcelas = []
+    for feature in layer.getFeatures(request):
+        if not feature.hasGeometry():
+            continue
+        nome = str(feature[campo]) if campo else f"Parcela {feature.id()}"
+        parcelas.append(Parcela(feature.id(), nome, QgsGeometry(feature.geometry())))
+    return parcelas
+
+
+def copiar_vias(layer, crs):
+    """Copia as feições de uma camada de vias no SRC das parcelas."""
+    campo = layer.displayField()
+    request = QgsFeatureRequest()
+    if campo:
+        request.setSubsetOfAttributes([campo], layer.fields())
+    else:
+        request.setNoAttributes()
+
+    transform = None
+    if layer.crs() != crs:
+        transform = QgsCoordinateTransform(layer.crs(), crs, QgsProject.instance())
+
+    vias = []
+    for feature in layer.getFeatures(request):
+        if not feature.hasGeometry():
+            continue
+        geometria = QgsGeometry(feature.geometry())
+        if transform:
+            geometria.transform(transform)
+        nome = str(feature[campo]) if campo and feature[campo] else f"{layer.name()} {feature.id()}"
+        vias.append(Parcela(feature.id(), nome, geometria))
+    return vias
+
+
+def escolher_vias(iface, layer, titulo):
+    """Pergunta a camada de vias (ou outras áreas) que também aparece como
+    confrontante. Retorna as vias copiadas, lista vazia ou None se cancelado."""
+    sem_vias = "(Nenhuma)"
+    camadas = [
+        camada for camada in QgsProject.instance().mapLayers().values()
+        if camada.id() != layer.id() and camada.type() == QgsMapLayerType.VectorLayer
+        and camada.geometryType() in (QgsWkbTypes.LineGeometry, QgsWkbTypes.PolygonGeometry)
+    ]
+    nome_vias, ok = QInputDialog.getItem(
+        iface.mainWindow(),
+        titulo,
+        "Camada de vias confrontantes:",
+        [sem_vias] + [camada.name() for camada in camadas],
+        0,
+        False
+    )
+    if not ok:
+        return None
+
+    for camada in camadas:
+        if camada.name() == nome_vias:
+            return copiar_vias(camada, layer.crs())
+    return []
+
+
+def run(iface):
+    layer = iface.activeLayer()
+    if not layer or layer.type() != QgsMapLayerType.VectorLayer or \
+       layer.geometryType() != QgsWkbTypes.PolygonGeometry:
+        QMessageBox.warning(
+            iface.mainWindow(),
+            "Camada Inválida",
+            "Por favor, selecione uma camada de polígonos com as parcelas."
+        )
+        return
+
+    if layer.crs().isGeographic():
+        QMessageBox.warning(
+            iface.mainWindow(),
+            "Sistema de Coordenadas Inválido",
+            "O memorial descritivo precisa de uma camada em sistema de coordenadas projetado.\n\n"
+            f"Sistema atual da camada: {layer.crs().description()}"
+        )
+        return
+
+    sem_campo = "(ID da feição)"
+    campos = [sem_campo] + [field.name() for field in layer.fields()]
+    campo, ok = QInputDialog.getItem(
+        iface.mainWindow(),
+        "Memorial Descritivo",
+        "Campo com o nome da parcela:",
+        campos,
+        0,
+        False
+    )
+    if not ok:
+        return
+
+    caminho, filtro = QFileDialog.getSaveFileName(
+        iface.mainWindow(),
+        "Salvar Memorial Descritivo",
+        f"memorial_{layer.name()}.odt",
+        "Documento ODT (*.odt);;Documento DOCX (*.docx);;Página HTML (*.html)"
+    )
+    if not caminho:
+        return
+
+    if not escritor_para(caminho):
+        # Sem extensão no nome: usa a do filtro escolhido
+        extensao = re.search(r'\*(\.\w+)', filtro or '')
+        caminho += extensao.group(1) if extensao else '.odt'
+
+    prefixo, ok = QInputDialog.getText(
+        iface.mainWindow(),
+        "Memorial Descritivo",
+        "Prefixo dos códigos dos vértices (ex.: V-, M-, P- ou ABCD-M-):",
+        text="V-"
+    )
+    if not ok:
+        return
+
+    tolerancia, ok = QInputDialog.getDouble(
+        iface.mainWindow(),
+        "Memorial Descritivo",
+        "Distância máxima para considerar vértices coincidentes (unidades da camada):",
+        0.01, 0.0001, 10.0, 4
+    )
+    if not ok:
+        return
+
+    vias = escolher_vias(iface, layer, "Memorial Descritivo")
+    if vias is None:
+        return
+
+    registro, arquivo_registro = abrir_registro(iface, layer, tolerancia, prefixo, "Memorial Descritivo")
+    parcelas = copiar_parcelas(layer, None if campo == sem_campo else campo)
+
+    selecionadas = set(layer.selectedFeatureIds()) if layer.selectedFeatureCount() else None
+    task = MemorialTask(iface, parcelas, layer.crs().description(), caminho, selecionadas,
+                        registro, arquivo_registro, vias, tolerancia)
+    _tarefas_ativas.append(task)
+    QgsApplication.taskManager().addTask(task)
+
+    iface.messageBar().pushMessage(
+        "Memorial Descritivo",
+        f"Gerando memoriais de {len(selecionadas or parcelas)} parcelas em segundo plano...",
+        level=Qgis.Info,
+        duration=5
+    )
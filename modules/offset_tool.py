@@ -655,34 +655,14 @@ def calculate_offset_side(geometry, mouse_point):
     if not geometry or not mouse_point:
         return 1
 
-    if geometry.isMultipart():
-        vertices = geometry.asMultiPolyline()[0]
-    else:
-        vertices = geometry.asPolyline()
+    # Segmento mais próximo considerando todas as partes, sem copiar os vértices
+    _, _, next_vertex, _ = geometry.closestSegmentWithContext(mouse_point)
 
-    if len(vertices) < 2:
+    if next_vertex < 1:
         return 1
 
-    min_distance = float('inf')
-    closest_segment = None
-
-    for i in range(len(vertices) - 1):
-        seg_start = vertices[i]
-        seg_end = vertices[i + 1]
-
-        # Calcula distância do mouse ao segmento
-        segment = QgsGeometry.fromPolylineXY([seg_start, seg_end])
-        mouse_geom = QgsGeometry.fromPointXY(mouse_point)
-        distance = segment.distance(mouse_geom)
-
-        if distance < min_distance:
-            min_distance = distance
-            closest_segment = (seg_start, seg_end)
-
-    if not closest_segment:
-        return 1
-
-    seg_start, seg_end = closest_segment
+    seg_start = geometry.vertexAt(next_vertex - 1)
+    seg_end = geometry.vertexAt(next_vertex)
 
     cross_product = (
         (mouse_point.x() - seg_start.x()) * (seg_end.y() - seg_start.y()) -
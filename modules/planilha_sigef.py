@@ -0,0 +1,335 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Exportação em lote da planilha ODS de vértices, lados e confrontantes no
+ leiaute de perímetros do SIGEF/INCRA.
+"""
+
+import math
+import re
+import sqlite3
+from xml.sax.saxutils import escape, quoteattr
+
+from qgis.core import (
+    Qgis, QgsApplication, QgsCoordinateReferenceSystem, QgsCoordinateTransform,
+    QgsMapLayerType, QgsPointXY, QgsProject, QgsTask, QgsWkbTypes
+)
+from qgis.PyQt.QtWidgets import QFileDialog, QInputDialog, QMessageBox
+
+from .angulos import decimal_para_dms, formatar_dms
+from .confrontantes import IndiceConfrontantes
+from .memorial_descritivo import (
+    EscritorZip, abrir_registro, copiar_parcelas, escolher_vias, vertices_parcela
+)
+
+# Colunas da aba de perímetro do SIGEF, seguidas do lado que parte do vértice
+COLUNAS = (
+    "código", "longitude", "sigma_x", "latitude", "sigma_y", "altitude", "sigma_z",
+    "método_posicionamento", "tipo_limite", "cns", "matrícula", "descrição",
+    "azimute", "distância",
+)
+
+# SIRGAS 2000 geográfico, exigido pelo SIGEF
+_SRC_SIGEF = "EPSG:4674"
+
+_NOME_INVALIDO = re.compile(r'[\[\]*?:/\\\']')
+
+# Mantém referência às tarefas em execução (o gerenciador não as segura)
+_tarefas_ativas = []
+
+
+def formatar_sigef(valor, casas=3):
+    """Coordenada geográfica no formato do SIGEF ('-48 12 34,567')."""
+    sinal = '-' if valor < 0 else ''
+    return f"{sinal}{decimal_para_dms(abs(valor), casas)}".replace('.', ',')
+
+
+def lados_anel(pontos):
+    """Azimutes (graus) e distâncias de todos os lados de um anel fechado,
+    calculados em uma única passada sobre os pares de vértices consecutivos."""
+    seguintes = pontos[1:] + pontos[:1]
+    deltas = [(x2 - x1, y2 - y1) for (x1, y1), (x2, y2) in zip(pontos, seguintes)]
+    azimutes = [math.degrees(math.atan2(dx, dy)) % 360.0 for dx, dy in deltas]
+    distancias = [math.hypot(dx, dy) for dx, dy in deltas]
+    return azimutes, distancias
+
+
+class EscritorOds(EscritorZip):
+    """Planilha OpenDocument gravada em fluxo, aba por aba e linha por linha."""
+
+    documento = 'content.xml'
+    inicio = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<office:document-content '
+        'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+        'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+        'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+        'office:version="1.2">'
+        '<office:body><office:spreadsheet>'
+    )
+    fim = '</office:spreadsheet></office:body></office:document-content>'
+
+    def __init__(self, caminho):
+        super().__init__(caminho)
+        self.nomes = set()
+
+    def arquivos_fixos(self):
+        return [
+            # O mimetype deve ser o primeiro arquivo, sem compactação
+            ('mimetype', 'application/vnd.oasis.opendocument.spreadsheet', False),
+            ('META-INF/manifest.xml',
+             '<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" '
+             'manifest:version="1.2">'
+             '<manifest:file-entry manifest:full-path="/" '
+             'manifest:media-type="application/vnd.oasis.opendocument.spreadsheet"/>'
+             '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+             '</manifest:manifest>', True),
+        ]
+
+    def nome_aba(self, nome):
+        """Nome de aba válido e único (até 31 caracteres, sem []*?:/\\')."""
+        base = _NOME_INVALIDO.sub('_', nome)[:31] or "perimetro"
+        nome, n = base, 1
+        while nome in self.nomes:
+            n += 1
+            sufixo = f"_{n}"
+            nome = base[:31 - len(sufixo)] + sufixo
+        self.nomes.add(nome)
+        return nome
+
+    def abrir_aba(self, nome, cabecalho):
+        self.gravar(f'<table:table table:name={quoteattr(self.nome_aba(nome))}>')
+        self.linha(cabecalho)
+
+    def linha(self, valores):
+        celulas = []
+        for valor in valores:
+            if valor is None or valor == '':
+                celulas.append('<table:table-cell/>')
+            elif isinstance(valor, float):
+                # Valor numérico com exibição em vírgula decimal
+                exibido = f"{valor:.2f}".replace('.', ',')
+                celulas.append(
+                    f'<table:table-cell office:value-type="float" office:value="{valor!r}">'
+                    f'<text:p>{exibido}</text:p></table:table-cell>')
+            else:
+                celulas.append(
+                    f'<table:table-cell office:value-type="string"><text:p>{escape(str(valor))}</text:p></table:table-cell>')
+        self.gravar(f'<table:table-row>{"".join(celulas)}</table:table-row>')
+
+    def fechar_aba(self):
+        self.gravar('</table:table>')
+
+
+class PlanilhaSigefTask(QgsTask):
+    """Grava em segundo plano a planilha de todas as parcelas em um único arquivo.
+
+    Cada anel de cada parcela vira uma aba no leiaute de perímetro do SIGEF;
+    o documento é gravado em fluxo, sem montar a planilha inteira na memória."""
+
+    def __init__(self, iface, parcelas, transform, caminho, selecionadas=None,
+                 registro=None, caminho_registro=None, vias=(), tolerancia=0.01):
+        super().__init__("Planilha SIGEF (RMCGEO)", QgsTask.CanCancel)
+        self.iface = iface
+        self.parcelas = parcelas
+        self.transform = transform
+        self.caminho = caminho
+        self.selecionadas = selecionadas
+        self.registro = registro
+        self.caminho_registro = caminho_registro
+        self.vias = vias
+        self.tolerancia = tolerancia
+        self.vertices = 0
+        self.gerados = 0
+        self.erro = None
+
+    def linhas_anel(self, fid, pontos, nomes, indice):
+        """Linhas da aba de um anel: um vértice por linha, com o lado que parte dele."""
+        azimutes, distancias = lados_anel(pontos)
+        confrontacoes = indice.tabela(fid, pontos)
+
+        for (x, y), codigo, azimute, distancia, lado in zip(
+                pontos, nomes, azimutes, distancias, confrontacoes):
+            geografico = self.transform.transform(QgsPointXY(x, y))
+            yield (
+                codigo,
+                formatar_sigef(geografico.x()), None,
+                formatar_sigef(geografico.y()), None,
+                None, None, None, None, None, None,
+                ", ".join(lado),
+                formatar_dms(decimal_para_dms(azimute)),
+                distancia,
+            )
+
+    def run(self):
+        try:
+            alvos = self.parcelas
+            if self.selecionadas:
+                alvos = [parcela for parcela in self.parcelas if parcela.fid in self.selecionadas]
+
+            # Mesma tolerância do memorial: os vértices ajustados ao registro
+            # podem se deslocar até ela
+            indice = IndiceConfrontantes(2 * self.tolerancia)
+            for parcela in self.parcelas:
+                indice.adicionar(parcela.fid, parcela.nome, parcela.geometria)
+            for via in self.vias:
+                indice.adicionar(('via', via.fid), via.nome, via.geometria)
+
+            if self.registro:
+                for parcela in sorted(self.parcelas, key=lambda p: p.fid):
+                    vertices_parcela(parcela, self.registro)
+
+            total = len(alvos)
+            with EscritorOds(self.caminho) as escritor:
+                for n, parcela in enumerate(alvos):
+                    if self.isCanceled():
+                        return False
+                    self.setProgress(100.0 * n / total)
+
+                    aneis = vertices_parcela(parcela, self.registro)
+                    for k, (_, pontos, nomes) in enumerate(aneis):
+                        sufixo = f" perimetro_{k + 1}" if len(aneis) > 1 else ""
+                        escritor.abrir_aba(f"{parcela.nome}{sufixo}", COLUNAS)
+                        for linha in self.linhas_anel(parcela.fid, pontos, nomes, indice):
+                            escritor.linha(linha)
+                            self.vertices += 1
+                        escritor.fechar_aba()
+                    self.gerados += 1
+
+            return True
+
+        except Exception as e:
+            self.erro = str(e)
+            return False
+
+    def finished(self, result):
+        if self in _tarefas_ativas:
+            _tarefas_ativas.remove(self)
+
+        if result and self.registro and self.caminho_registro:
+            try:
+                self.registro.salvar(self.caminho_registro)
+            except sqlite3.Error as e:
+                self.iface.messageBar().pushMessage(
+                    "Planilha SIGEF",
+                    f"Não foi possível gravar os códigos dos vértices: {str(e)}",
+                    level=Qgis.Warning
+                )
+
+        if result:
+            self.iface.messageBar().pushMessage(
+                "Planilha SIGEF",
+                f"{self.gerados} parcelas ({self.vertices} vértices) gravadas em {self.caminho}.",
+                level=Qgis.Success,
+                duration=10
+            )
+        elif self.erro:
+            self.iface.messageBar().pushMessage(
+                "Planilha SIGEF", f"Erro ao gerar a planilha: {self.erro}", level=Qgis.Critical)
+        else:
+            self.iface.messageBar().pushMessage(
+                "Planilha SIGEF", "Operação cancelada.", level=Qgis.Warning)
+
+
+def run(iface):
+    layer = iface.activeLayer()
+    if not layer or layer.type() != QgsMapLayerType.VectorLayer or \
+       layer.geometryType() != QgsWkbTypes.PolygonGeometry:
+        QMessageBox.warning(
+            iface.mainWindow(),
+            "Camada Inválida",
+            "Por favor, selecione uma camada de polígonos com as parcelas."
+        )
+        return
+
+    if layer.crs().isGeographic():
+        QMessageBox.warning(
+            iface.mainWindow(),
+            "Sistema de Coordenadas Inválido",
+            "A planilha precisa de uma camada em sistema de coordenadas projetado.\n\n"
+            f"Sistema atual da camada: {layer.crs().description()}"
+        )
+        return
+
+    sem_campo = "(ID da feição)"
+    campos = [sem_campo] + [field.name() for field in layer.fields()]
+    campo, ok = QInputDialog.getItem(
+        iface.mainWindow(),
+        "Planilha SIGEF",
+        "Campo com o nome da parcela:",
+        campos,
+        0,
+        False
+    )
+    if not ok:
+        return
+
+    caminho, _ = QFileDialog.getSaveFileName(
+        iface.mainWindow(),
+        "Salvar Planilha SIGEF",
+        f"sigef_{layer.name()}.ods",
+        "Planilha ODS (*.ods)"
+    )
+    if not caminho:
+        return
+    if not caminho.lower().endswith('.ods'):
+        caminho += '.ods'
+
+    prefixo, ok = QInputDialog.getText(
+        iface.mainWindow(),
+        "Planilha SIGEF",
+        "Prefixo dos códigos dos vértices (código do credenciado e tipo, ex.: ABCD-M-):",
+        text="V-"
+    )
+    if not ok:
+        return
+
+    tolerancia, ok = QInputDialog.getDouble(
+        iface.mainWindow(),
+        "Planilha SIGEF",
+        "Distância máxima para considerar vértices coincidentes (unidades da camada):",
+        0.01, 0.0001, 10.0, 4
+    )
+    if not ok:
+        return
+
+    vias = escolher_vias(iface, layer, "Planilha SIGEF")
+    if vias is None:
+        return
+
+    registro, arquivo_registro = abrir_registro(iface, layer, tolerancia, prefixo, "Planilha SIGEF")
+    parcelas = copiar_parcelas(layer, None if campo == sem_campo else campo)
+
+    transform = QgsCoordinateTransform(
+        layer.crs(), QgsCoordinateReferenceSystem(_SRC_SIGEF), QgsProject.instance())
+
+    selecionadas = set(layer.selectedFeatureIds()) if layer.selectedFeatureCount() else None
+    task = PlanilhaSigefTask(iface, parcelas, transform, caminho, selecionadas,
+                             registro, arquivo_registro, vias, tolerancia)
+    _tarefas_ativas.append(task)
+    QgsApplication.taskManager().addTask(task)
+
+    iface.messageBar().pushMessage(
+        "Planilha SIGEF",
+        f"Gerando a planilha de {len(selecionadas or parcelas)} parcelas em segundo plano...",
+        level=Qgis.Info,
+        duration=5
+    )
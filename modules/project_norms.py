@@ -23,9 +23,17 @@
 import os
 from qgis.PyQt import QtWidgets, uic
 from qgis.PyQt.QtCore import Qt, QCoreApplication
-from qgis.core import QgsProject, QgsWkbTypes, QgsGeometry, QgsDistanceArea, QgsMapLayerProxyModel
+from qgis.core import (
+    QgsProject, QgsWkbTypes, QgsGeometry, QgsDistanceArea, QgsMapLayerProxyModel,
+    QgsCoordinateTransform
+)
 from qgis.gui import QgsMapLayerComboBox
 
+from .confrontantes import IndiceConfrontantes
+
+# Distância máxima (m) entre lados de lote e via para considerar testada
+TOLERANCIA_TESTADA = 0.05
+
 # Carrega o arquivo .ui
 FORM_CLASS, _ = uic.loadUiType(os.path.join(
     os.path.dirname(os.path.dirname(__file__)), 'ui', 'project_norms.ui'))
@@ -81,6 +89,45 @@ class ProjectNormsDialog(QtWidgets.QDialog, FORM_CLASS):
 
         return total_area
 
+    def lotes_sem_testada(self, lotes_layer, viario_layer):
+        """Conta os lotes e quantos não têm nenhum lado confrontando com o sistema viário."""
+        indice = IndiceConfrontantes(TOLERANCIA_TESTADA)
+
+        transform = None
+        if viario_layer.crs() != lotes_layer.crs():
+            transform = QgsCoordinateTransform(
+                viario_layer.crs(), lotes_layer.crs(), QgsProject.instance())
+
+        for feature in viario_layer.getFeatures():
+            if feature.hasGeometry():
+                geom = QgsGeometry(feature.geometry())
+                if transform:
+                    geom.transform(transform)
+                indice.adicionar(('via', feature.id()), "Sistema Viário", geom)
+
+        total = 0
+        sem_testada = 0
+        for feature in lotes_layer.getFeatures():
+            if not feature.hasGeometry():
+                continue
+            total += 1
+
+            testada = False
+            for parte in feature.geometry().constGet().coordinateSequence():
+                anel = parte[0] if parte else []
+                for i in range(len(anel) - 1):
+                    if indice.confrontantes_lado(
+                            feature.id(), anel[i].x(), anel[i].y(), anel[i + 1].x(), anel[i + 1].y()):
+                        testada = True
+                        break
+                if testada:
+                    break
+
+            if not testada:
+                sem_testada += 1
+
+        return total, sem_testada
+
     def calculate(self):
         base_layer = self.comboBaseLayer.currentLayer()
         app_layer = self.comboAPP.currentLayer() # APP
@@ -169,6 +216,14 @@ class ProjectNormsDialog(QtWidgets.QDialog, FORM_CLASS):
 
         summary_text += f"• <b>Total da área ocupada (Gleba Total): {pct_ocupacao_global:.2f}%</b><br>"
 
+        # Acesso dos lotes: cada lote deve ter ao menos um lado voltado para uma via
+        lotes_layer = self.comboLotes.currentLayer()
+        viario_layer = self.comboViario.currentLayer()
+        if lotes_layer and viario_layer and not lotes_layer.crs().isGeographic():
+            total_lotes, sem_testada = self.lotes_sem_testada(lotes_layer, viario_layer)
+            status_testada = "✅ OK" if sem_testada == 0 else "❌ VERIFICAR"
+            summary_text += f"• Lotes sem testada para o sistema viário: {sem_testada} de {total_lotes} - {status_testada}<br>"
+
         if pct_total_apm_s_parcelavel < 15.0 or pct_verde_s_parcelavel < 7.5 or pct_inst_s_parcelavel < 7.5:
             summary_text += "<br><span style='color: red;'>⚠️ Atenção: O projeto não atende aos requisitos mínimos de APMs.</span>"
         else:
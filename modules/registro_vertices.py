@@ -0,0 +1,135 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Registro de códigos únicos de vértices compartilhados entre parcelas,
+ persistido em um arquivo SQLite ao lado do projeto.
+"""
+
+import math
+import sqlite3
+
+_CRIAR_TABELA = """
+    CREATE TABLE IF NOT EXISTS vertices (
+        camada TEXT NOT NULL,
+        codigo TEXT NOT NULL,
+        prefixo TEXT NOT NULL,
+        numero INTEGER NOT NULL,
+        x REAL NOT NULL,
+        y REAL NOT NULL,
+        PRIMARY KEY (camada, codigo)
+    )
+"""
+
+
+class RegistroVertices:
+    """Atribui um código estável a cada vértice único de uma camada.
+
+    Vértices a menos de `tolerancia` de um já registrado recebem o mesmo
+    código (e as mesmas coordenadas). A busca usa um hash espacial em grade
+    com células do tamanho da tolerância. Códigos já gravados nunca são
+    renumerados; vértices novos continuam a numeração do prefixo."""
+
+    def __init__(self, camada, tolerancia=0.01, prefixo='V-', digitos=4):
+        self.camada = camada
+        self.tolerancia = tolerancia
+        self.prefixo = prefixo
+        self.digitos = digitos
+        self.grade = {}
+        self.codigos = []
+        self.numeracao = []
+        self.coordenadas = []
+        self.ultimo = {}
+        self.novos = []
+
+    def celula(self, x, y):
+        return (math.floor(x / self.tolerancia), math.floor(y / self.tolerancia))
+
+    def adicionar(self, codigo, prefixo, numero, x, y):
+        indice = len(self.codigos)
+        self.codigos.append(codigo)
+        self.numeracao.append((prefixo, numero))
+        self.coordenadas.append((x, y))
+        self.grade.setdefault(self.celula(x, y), []).append(indice)
+        self.ultimo[prefixo] = max(self.ultimo.get(prefixo, 0), numero)
+        return indice
+
+    def procurar(self, x, y):
+        """Índice do vértice registrado mais próximo dentro da tolerância, ou None."""
+        cx, cy = self.celula(x, y)
+        melhor = None
+        menor = self.tolerancia ** 2
+
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for indice in self.grade.get((cx + dx, cy + dy), ()):
+                    vx, vy = self.coordenadas[indice]
+                    distancia = (vx - x) ** 2 + (vy - y) ** 2
+                    if distancia <= menor:
+                        melhor, menor = indice, distancia
+        return melhor
+
+    def registrar(self, x, y):
+        """Retorna (codigo, (x, y)) do vértice, registrando-o se for novo."""
+        indice = self.procurar(x, y)
+        if indice is None:
+            numero = self.ultimo.get(self.prefixo, 0) + 1
+            codigo = f"{self.prefixo}{numero:0{self.digitos}d}"
+            indice = self.adicionar(codigo, self.prefixo, numero, x, y)
+            self.novos.append(indice)
+        return self.codigos[indice], self.coordenadas[indice]
+
+    def carregar(self, caminho):
+        """Lê os códigos já atribuídos a esta camada no arquivo SQLite."""
+        conexao = sqlite3.connect(caminho)
+        try:
+            conexao.execute(_CRIAR_TABELA)
+            cursor = conexao.execute(
+                "SELECT codigo, prefixo, numero, x, y FROM vertices WHERE camada = ? ORDER BY rowid",
+                (self.camada,)
+            )
+            for codigo, prefixo, numero, x, y in cursor:
+                self.adicionar(codigo, prefixo, numero, x, y)
+        finally:
+            conexao.close()
+
+    def salvar(self, caminho):
+        """Acrescenta ao arquivo SQLite apenas os vértices registrados nesta sessão."""
+        if not self.novos:
+            return
+
+        linhas = []
+        for indice in self.novos:
+            prefixo, numero = self.numeracao[indice]
+            x, y = self.coordenadas[indice]
+            linhas.append((self.camada, self.codigos[indice], prefixo, numero, x, y))
+
+        conexao = sqlite3.connect(caminho)
+        try:
+            with conexao:
+                conexao.execute(_CRIAR_TABELA)
+                conexao.executemany(
+                    "INSERT OR IGNORE INTO vertices (camada, codigo, prefixo, numero, x, y) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    linhas
+                )
+        finally:
+            conexao.close()
+
+        self.novos = []
@@ -24,15 +24,48 @@ from qgis.gui import QgsMapTool, QgsRubberBand
 from qgis.PyQt import QtWidgets
 from qgis.PyQt.QtCore import Qt
 from qgis.PyQt.QtGui import QColor
-from qgis.PyQt.QtWidgets import QHeaderView, QAbstractItemView
-from qgis.core import (QgsPointXY, QgsProject, Qgis,
-                      QgsGeometry, QgsVectorLayer, QgsFeature, QgsWkbTypes)
+from qgis.PyQt.QtWidgets import QHeaderView, QAbstractItemView, QFileDialog, QInputDialog, QMessageBox
+from qgis.core import (QgsPointXY, QgsProject, Qgis, QgsMapLayerType,
+                      QgsGeometry, QgsVectorLayer, QgsFeature, QgsWkbTypes,
+                      QgsCoordinateTransform, QgsEllipsoidUtils, QgsApplication,
+                      QgsMessageLog)
+from .angulos import decimal_para_dms
+from .importar_poligonal import ImportadorPoligonal, Pernada
+from .sessao_poligonal import EXTENSAO, SessaoPoligonal, listar_sessoes, podar_sessoes
+from .tabela_pernadas import PernadasModel
+from .ajuste_poligonal import METODOS, ajustar_poligonal, calcular_fechamento, formatar_precisao
+from .geodesia import elipsoide, parametros_tm, propagar_geodesico, reduzir_pernada, zona
+from collections import namedtuple
+from datetime import datetime
+import csv
 import math
+import os
+
+# Formatos de saída, na ordem do combo "Salvar como"
+SAIDA_SEGMENTOS = 'segmentos'
+SAIDA_LINHA = 'linha'
+SAIDA_POLIGONO = 'poligono'
+SAIDAS = (SAIDA_SEGMENTOS, SAIDA_LINHA, SAIDA_POLIGONO)
+
+# Modos de cálculo, na ordem do combo "Cálculo"
+CALCULO_PLANO = 'plano'
+CALCULO_CORRIGIDO = 'corrigido'
+CALCULO_GEODESICO = 'geodesico'
+CALCULOS = (CALCULO_PLANO, CALCULO_CORRIGIDO, CALCULO_GEODESICO)
+
+# SIRGAS 2000 / GRS80, usado quando o SRC não informa o elipsoide
+_GRS80 = (6378137.0, 1 / 298.257222101)
+
+ContextoGeodesico = namedtuple(
+    'ContextoGeodesico', ['elipsoide', 'zona', 'para_geografico', 'de_geografico'])
 
 
 class BaseBearingTool(QgsMapTool):
     """Classe base para ferramentas de azimute e rumo."""
 
+    # Cabeçalhos da tabela de pernadas (a última coluna é a distância)
+    colunas = ("Azimute", "Distância")
+
     def __init__(self, canvas, iface):
         super().__init__(canvas)
         self.canvas = canvas
@@ -46,20 +79,46 @@ class BaseBearingTool(QgsMapTool):
         except AttributeError:
             self.setCursor(Qt.CrossCursor)  # Qt5
 
-        self.inserted_values = [] # Lista para armazenar os valores inseridos
+        # Pernadas inseridas (azimutes, distâncias e textos exibidos na tabela)
+        self.pernadas = PernadasModel(self.colunas)
+        self.pernadas.editor = self.editar_celula
+
+        # Vértices acumulados da poligonal: [start_point, fim da pernada 0, fim da pernada 1, ...]
+        # Só é recalculado a partir da primeira pernada alterada
+        self.vertices_acumulados = []
+        self.primeiro_vertice_alterado = 0
+        self.pontos_desenhados = 0
+
+        # Método de ajuste escolhido em "Fechamento", aplicado ao salvar
+        self.metodo_ajuste = None
+
+        # Elipsoide, zona e transformações do SRC do mapa: (proj, contexto)
+        self.contexto_crs = None
+
+        # Arquivo onde as pernadas são salvas automaticamente a cada alteração
+        self.sessao = None
 
         # Criar rubber band para preview
         self.rubber_band = QgsRubberBand(self.canvas, QgsWkbTypes.LineGeometry)
         self.rubber_band.setColor(QColor(255, 0, 0))
         self.rubber_band.setWidth(2)
 
-    def create_memory_layer(self, layer_name="Linhas"):
-        """Cria uma camada temporária em UTM SIRGAS 2000 / UTM zone 22S."""
-        layer = QgsVectorLayer(f"LineString?crs=EPSG:31982", layer_name, "memory")
+        # Rubber band apenas do segmento que está sendo digitado
+        self.segment_rubber_band = QgsRubberBand(self.canvas, QgsWkbTypes.LineGeometry)
+        self.segment_rubber_band.setColor(QColor(255, 0, 0))
+        self.segment_rubber_band.setWidth(2)
+
+    def create_memory_layer(self, layer_name="Linhas", geometry_type=QgsWkbTypes.LineGeometry):
+        """Cria uma camada temporária no SRC do mapa."""
+        tipo = "Polygon" if geometry_type == QgsWkbTypes.PolygonGeometry else "LineString"
+        crs = self.canvas.mapSettings().destinationCrs()
+        layer = QgsVectorLayer(tipo, layer_name, "memory")
+        layer.setCrs(crs)
 
         if not layer.isValid():
             self.iface.messageBar().pushMessage(
-                "Erro", "Não foi possível criar a camada em UTM", level=Qgis.Critical)
+                "Erro", f"Não foi possível criar a camada em {crs.authid() or crs.description()}",
+                level=Qgis.Critical)
             return None
 
         QgsProject.instance().addMapLayer(layer)
@@ -90,7 +149,7 @@ class BaseBearingTool(QgsMapTool):
             return None
 
     def calculate_end_point(self, start_point, azimuth, distance):
-        """Calcula o ponto final baseado no azimute e distância em UTM."""
+        """Calcula o ponto final baseado no azimute e distância no plano do SRC do mapa."""
         try:
             # Converter azimute para radianos e ajustar para o norte
             azimuth_rad = math.radians(90 - azimuth)
@@ -106,79 +165,533 @@ class BaseBearingTool(QgsMapTool):
             return end_point
 
         except Exception as e:
-            print(f"DEBUG: ERRO ao calcular ponto final: {str(e)}")
+            QgsMessageLog.logMessage(f"Erro ao calcular ponto final: {e}", "RMCGEO", Qgis.Warning)
             return start_point
 
+    def setup_calculo(self):
+        """Conecta a escolha do modo de cálculo e da altitude média."""
+        self.dlg.calculoCombo.currentIndexChanged.connect(self.ao_mudar_calculo)
+        self.dlg.altitudeSpin.valueChanged.connect(self.ao_mudar_calculo)
+
+    def modo_calculo(self):
+        """Modo de cálculo escolhido no diálogo."""
+        if self.dlg and hasattr(self.dlg, 'calculoCombo'):
+            return CALCULOS[self.dlg.calculoCombo.currentIndex()]
+        return CALCULO_PLANO
+
+    def altitude_media(self):
+        """Altitude média informada para a redução das distâncias."""
+        if self.dlg and hasattr(self.dlg, 'altitudeSpin'):
+            return self.dlg.altitudeSpin.value()
+        return 0.0
+
+    def ao_mudar_calculo(self, *args):
+        """Recalcula todos os vértices com o novo modo de cálculo."""
+        self.dlg.altitudeSpin.setEnabled(self.modo_calculo() != CALCULO_PLANO)
+        self.invalidar_vertices(0)
+        self.atualizar_preview()
+
+    def contexto_geodesico(self):
+        """Elipsoide, zona TM e transformações do SRC do mapa.
+
+        Reaproveitados enquanto o SRC do mapa não muda."""
+        crs = self.canvas.mapSettings().destinationCrs()
+        proj = crs.toProj()
+        if self.contexto_crs and self.contexto_crs[0] == proj:
+            return self.contexto_crs[1]
+
+        parametros = QgsEllipsoidUtils.ellipsoidParameters(crs.ellipsoidAcronym())
+        if parametros.valid and parametros.inverseFlattening:
+            a, f = parametros.semiMajor, 1 / parametros.inverseFlattening
+        else:
+            a, f = _GRS80
+
+        tm = parametros_tm(proj)
+        zona_tm = zona(a, f, *tm) if tm else None
+
+        geografico = crs.toGeographicCrs()
+        contexto = ContextoGeodesico(
+            elipsoide(a, f),
+            zona_tm,
+            QgsCoordinateTransform(crs, geografico, QgsProject.instance()),
+            QgsCoordinateTransform(geografico, crs, QgsProject.instance())
+        )
+        self.contexto_crs = (proj, contexto)
+        return contexto
+
+    def calcular_trecho(self, start_point, azimutes, distancias):
+        """Calcula os vértices finais de uma sequência de pernadas a partir de
+        um ponto, de acordo com o modo de cálculo escolhido."""
+        modo = self.modo_calculo()
+        pontos = []
+
+        if modo == CALCULO_PLANO:
+            current_point = start_point
+            for azimuth, distance in zip(azimutes, distancias):
+                current_point = self.calculate_end_point(current_point, azimuth, distance)
+                pontos.append(current_point)
+            return pontos
+
+        contexto = self.contexto_geodesico()
+        altitude = self.altitude_media()
+        geografico = contexto.para_geografico.transform(start_point)
+
+        if modo == CALCULO_GEODESICO:
+            # Problema direto sobre o elipsoide para todas as pernadas de uma vez
+            for lat, lon in propagar_geodesico(
+                    geografico.y(), geografico.x(), azimutes, distancias,
+                    contexto.elipsoide, altitude):
+                pontos.append(contexto.de_geografico.transform(QgsPointXY(lon, lat)))
+            return pontos
+
+        # Azimute verdadeiro e distância de terreno reduzidos à quadrícula
+        # (convergência e fator de escala no início de cada pernada)
+        current_point = start_point
+        for azimuth, distance in zip(azimutes, distancias):
+            if contexto.zona:
+                azimuth, distance = reduzir_pernada(
+                    geografico.y(), geografico.x(), azimuth, distance, contexto.zona, altitude)
+            current_point = self.calculate_end_point(current_point, azimuth, distance)
+            geografico = contexto.para_geografico.transform(current_point)
+            pontos.append(current_point)
+        return pontos
+
+    def pernadas_quadricula(self):
+        """Azimutes e distâncias de quadrícula das pernadas, usados no fechamento.
+
+        No modo plano são os próprios valores informados; nos demais são
+        obtidos dos vértices calculados."""
+        if self.modo_calculo() == CALCULO_PLANO:
+            return self.pernadas.azimutes, self.pernadas.distancias
+
+        vertices = self.atualizar_vertices(self.start_point)
+        azimutes = []
+        distancias = []
+        for p1, p2 in zip(vertices, vertices[1:]):
+            dx, dy = p2.x() - p1.x(), p2.y() - p1.y()
+            azimutes.append(math.degrees(math.atan2(dx, dy)) % 360.0)
+            distancias.append(math.hypot(dx, dy))
+        return azimutes, distancias
+
+    def setup_table(self):
+        """Associa a tabela do diálogo ao modelo de pernadas."""
+        table = self.dlg.coordenadasTable
+        table.setModel(self.pernadas)
+
+        # Compatibilidade Qt5/Qt6:
+        try:
+            # Qt6
+            table.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked | 
+                                 QAbstractItemView.EditTrigger.EditKeyPressed)
+        except AttributeError:
+            # Qt5
+            table.setEditTriggers(QAbstractItemView.DoubleClicked | 
+                             QAbstractItemView.EditKeyPressed)
+
+    def pasta_sessoes(self):
+        """Pasta das sessões no perfil do usuário do QGIS."""
+        pasta = os.path.join(QgsApplication.qgisSettingsDirPath(), 'rmcgeo', 'sessoes')
+        os.makedirs(pasta, exist_ok=True)
+        return pasta
+
+    def crs_sessao(self):
+        """Identificação do SRC do mapa gravada na sessão."""
+        crs = self.canvas.mapSettings().destinationCrs()
+        return crs.authid() or crs.toWkt()
+
+    def autosalvar(self, alteracao):
+        """Repete no arquivo da sessão uma alteração feita nas pernadas.
+
+        A sessão é criada na primeira pernada; falhas de gravação apenas
+        desativam o salvamento automático desta poligonal."""
+        if self.sessao is False or not self.start_point:
+            return
+
+        try:
+            if self.sessao is None:
+                pasta = self.pasta_sessoes()
+                podar_sessoes(pasta)
+                nome = f"{datetime.now():%Y%m%d_%H%M%S_%f}_{self.get_nome_camada()}{EXTENSAO}"
+                self.sessao = SessaoPoligonal.criar(
+                    os.path.join(pasta, nome),
+                    self.start_point.x(), self.start_point.y(), self.crs_sessao())
+            alteracao(self.sessao)
+        except OSError as e:
+            self.sessao = False
+            self.iface.messageBar().pushMessage(
+                "Aviso",
+                f"Não foi possível salvar a sessão da poligonal: {str(e)}",
+                level=Qgis.Warning
+            )
+
+    def inserir_pernada(self, azimuth, distance, textos):
+        """Acrescenta uma pernada ao final da poligonal."""
+        self.pernadas.acrescentar([azimuth], [distance], [textos])
+        self.autosalvar(lambda sessao: sessao.acrescentar([azimuth], [distance]))
+
+    def carregar_pernadas(self, pernadas):
+        """Acrescenta várias pernadas importadas de uma só vez."""
+        azimutes = [pernada.azimute for pernada in pernadas]
+        distancias = [pernada.distancia for pernada in pernadas]
+        self.pernadas.acrescentar(
+            azimutes, distancias, [self.textos_pernada(pernada) for pernada in pernadas])
+        self.autosalvar(lambda sessao: sessao.acrescentar(azimutes, distancias))
+
+    def atualizar_pernada(self, row, azimuth, distance, textos):
+        """Substitui os valores de uma pernada e invalida os vértices seguintes."""
+        self.pernadas.atualizar(row, azimuth, distance, textos)
+        self.invalidar_vertices(row)
+        self.autosalvar(lambda sessao: sessao.alterar(row, azimuth, distance))
+
+    def editar_distancia(self, row, text):
+        """Valida a distância editada na tabela."""
+        try:
+            distance = float(text.replace('m', '').strip())
+            if distance <= 0:
+                raise ValueError("Distância deve ser maior que zero")
+        except ValueError:
+            self.iface.messageBar().pushMessage(
+                "Erro", 
+                "Distância inválida. Use um valor numérico maior que zero.",
+                level=Qgis.Warning
+            )
+            return False
+
+        self.atualizar_pernada(row, self.pernadas.azimutes[row], distance, self.pernadas.textos[row])
+        self.atualizar_preview()
+        return True
+
+    def invalidar_vertices(self, a_partir_de=0):
+        """Descarta os vértices acumulados a partir da pernada informada."""
+        del self.vertices_acumulados[a_partir_de + 1:]
+        self.primeiro_vertice_alterado = min(self.primeiro_vertice_alterado, a_partir_de + 1)
+
+    def atualizar_vertices(self, start_point):
+        """Retorna os vértices acumulados, calculando apenas as pernadas que faltam."""
+        if not start_point:
+            self.vertices_acumulados = []
+            self.primeiro_vertice_alterado = 0
+            return self.vertices_acumulados
+
+        if not self.vertices_acumulados or self.vertices_acumulados[0] != start_point:
+            self.vertices_acumulados = [QgsPointXY(start_point)]
+            self.primeiro_vertice_alterado = 0
+
+        # Pernadas removidas (desfazer)
+        total = len(self.pernadas) + 1
+        if len(self.vertices_acumulados) > total:
+            del self.vertices_acumulados[total:]
+            self.primeiro_vertice_alterado = min(self.primeiro_vertice_alterado, total)
+
+        inicio = len(self.vertices_acumulados) - 1
+        if inicio < len(self.pernadas):
+            self.vertices_acumulados.extend(self.calcular_trecho(
+                self.vertices_acumulados[-1],
+                self.pernadas.azimutes[inicio:],
+                self.pernadas.distancias[inicio:]
+            ))
+
+        return self.vertices_acumulados
+
+    def desenhar_poligonal(self, vertices):
+        """Atualiza o rubber band da poligonal movendo, removendo ou acrescentando
+        apenas os vértices que mudaram desde o último desenho."""
+        inicio = min(self.primeiro_vertice_alterado, self.pontos_desenhados)
+
+        for i in range(inicio, min(self.pontos_desenhados, len(vertices))):
+            self.rubber_band.movePoint(i, vertices[i])
+
+        while self.pontos_desenhados > len(vertices):
+            self.rubber_band.removeLastPoint(0, False)
+            self.pontos_desenhados -= 1
+
+        for point in vertices[self.pontos_desenhados:]:
+            self.rubber_band.addPoint(point, False)
+        self.pontos_desenhados = len(vertices)
+
+        self.primeiro_vertice_alterado = len(vertices)
+        self.rubber_band.updatePosition()
+        self.rubber_band.update()
+
+    def limpar_preview(self):
+        """Limpa os rubber bands de preview."""
+        if self.rubber_band:
+            self.rubber_band.reset(QgsWkbTypes.LineGeometry)
+        self.segment_rubber_band.reset(QgsWkbTypes.LineGeometry)
+        self.pontos_desenhados = 0
+        self.primeiro_vertice_alterado = 0
+
     def preview_line(self, start_point, azimuth, distance):
         """Mostra preview da linha usando rubber band."""
         if not self.rubber_band:
             return
 
-        self.rubber_band.reset()
-        current_point = start_point
-        points = [current_point]
+        # Linhas já inseridas: apenas os vértices alterados são recalculados
+        vertices = self.atualizar_vertices(start_point)
+        self.desenhar_poligonal(vertices)
 
-        # Desenhar linhas já inseridas
-        for value_tuple in self.inserted_values:
-            az = value_tuple[-2]
-            dist = value_tuple[-1]
-            end_point = self.calculate_end_point(current_point, az, dist)
-            points.append(end_point)
-            current_point = end_point
+        # Linha atual: apenas o último segmento é substituído
+        self.segment_rubber_band.reset(QgsWkbTypes.LineGeometry)
+        if vertices and azimuth is not None and distance is not None:
+            end_point = self.calcular_trecho(vertices[-1], [azimuth], [distance])[0]
+            self.segment_rubber_band.setToGeometry(
+                QgsGeometry.fromPolylineXY([vertices[-1], end_point]), None)
 
-        # Desenhar linha atual
-        if azimuth is not None and distance is not None:
-            end_point = self.calculate_end_point(current_point, azimuth, distance)
-            points.append(end_point)
+    def vertices_poligonal(self):
+        """Vértices a serem salvos, já ajustados se um método foi escolhido.
 
-        if len(points) > 1:
-            self.rubber_band.setToGeometry(
-                QgsGeometry.fromPolylineXY(points), None)
+        A poligonal é sempre tratada como fechada: o ajuste leva o último
+        vértice de volta ao ponto inicial, em qualquer modo de saída. A
+        ferramenta não recebe o ponto final conhecido de uma poligonal
+        aberta; nesse caso o método é "Sem ajuste"."""
+        vertices = self.atualizar_vertices(self.start_point)
+        if not self.metodo_ajuste or len(self.pernadas) < 2:
+            return vertices
 
-    def undo_last_insert(self):
-        """Remove o último valor inserido."""
-        if self.inserted_values:
-            self.inserted_values.pop()
-            table = self.dlg.coordenadasTable
+        inicio = (self.start_point.x(), self.start_point.y())
+        azimutes, distancias = self.pernadas_quadricula()
+
+        try:
+            pontos = ajustar_poligonal(azimutes, distancias, inicio, metodo=self.metodo_ajuste)
+        except ValueError as e:
+            self.iface.messageBar().pushMessage(
+                "Aviso", f"{str(e)} A poligonal será salva sem ajuste.", level=Qgis.Warning)
+            return vertices
+
+        return [QgsPointXY(x, y) for x, y in pontos]
 
-            # Desconectar o sinal para evitar problemas ao remover linha
-            table.cellChanged.disconnect(self.ao_mudar_celula)
+    def verificar_fechamento(self):
+        """Mostra o erro de fechamento da poligonal e permite escolher o ajuste.
 
-            table.removeRow(table.rowCount() - 1)
+        O erro é a distância do último vértice ao ponto inicial (poligonal
+        fechada); ver vertices_poligonal."""
+        if not self.start_point or len(self.pernadas) < 3:
+            self.iface.messageBar().pushMessage(
+                "Aviso", "Insira ao menos três pernadas para calcular o fechamento.",
+                level=Qgis.Warning)
+            return
 
-            # Reconectar o sinal após remover a linha
-            table.cellChanged.connect(self.ao_mudar_celula)
+        fechamento = calcular_fechamento(*self.pernadas_quadricula())
+
+        relatorio = (
+            f"Pernadas: {len(self.pernadas)}\n"
+            f"Perímetro: {fechamento.perimetro:.3f} m\n\n"
+            f"Erro em E: {fechamento.erro_e:+.3f} m\n"
+            f"Erro em N: {fechamento.erro_n:+.3f} m\n"
+            f"Erro linear: {fechamento.erro_linear:.3f} m\n"
+            f"Precisão: {formatar_precisao(fechamento.precisao)}"
+        )
+
+        if fechamento.erro_linear == 0:
+            QMessageBox.information(self.dlg, "Fechamento da Poligonal", relatorio)
+            self.metodo_ajuste = None
+            return
+
+        # Compatibilidade Qt5/Qt6:
+        try:
+            accept_role = QMessageBox.ButtonRole.AcceptRole  # Qt6
+            reject_role = QMessageBox.ButtonRole.RejectRole
+        except AttributeError:
+            accept_role = QMessageBox.AcceptRole  # Qt5
+            reject_role = QMessageBox.RejectRole
+
+        caixa = QMessageBox(self.dlg)
+        caixa.setWindowTitle("Fechamento da Poligonal")
+        caixa.setText(relatorio + "\n\nA poligonal é considerada fechada (volta ao ponto inicial)."
+                      "\nEscolha o ajuste a ser aplicado ao salvar:")
+        botoes = {caixa.addButton(nome, accept_role): metodo for metodo, nome in METODOS.items()}
+        sem_ajuste = caixa.addButton("Sem ajuste", reject_role)
+        # Compatibilidade Qt5/Qt6: exec_() foi renomeado para exec()
+        if hasattr(caixa, 'exec'):
+            caixa.exec()
+        else:
+            caixa.exec_()
+
+        clicado = caixa.clickedButton()
+        if clicado is sem_ajuste or clicado not in botoes:
+            self.metodo_ajuste = None
+            return
+
+        self.metodo_ajuste = botoes[clicado]
+        self.iface.messageBar().pushMessage(
+            "Fechamento",
+            f"Ajuste por {METODOS[self.metodo_ajuste]} será aplicado ao salvar.",
+            level=Qgis.Info,
+            duration=5
+        )
+
+    def importar_pernadas(self):
+        """Importa pernadas de um arquivo CSV, TXT ou texto de memorial descritivo."""
+        caminho, _ = QFileDialog.getOpenFileName(
+            self.dlg,
+            "Importar Poligonal",
+            "",
+            "Poligonal (*.csv *.txt);;Todos os arquivos (*)"
+        )
+        if not caminho:
+            return
+
+        importador = ImportadorPoligonal(caminho)
+        try:
+            pernadas = list(importador.pernadas())
+        except (OSError, csv.Error) as e:
+            self.iface.messageBar().pushMessage(
+                "Erro", f"Não foi possível ler o arquivo: {str(e)}", level=Qgis.Critical)
+            return
 
+        if not pernadas:
+            self.iface.messageBar().pushMessage(
+                "Aviso", "Nenhuma pernada válida encontrada no arquivo.", level=Qgis.Warning)
+            return
+
+        # Carrega todas as pernadas de uma vez; os vértices são calculados
+        # em uma única passada no próximo preview
+        self.carregar_pernadas(pernadas)
+        self.atualizar_preview()
+
+        mensagem = f"{len(pernadas)} pernadas importadas."
+        if importador.ignoradas:
+            mensagem += f" {importador.ignoradas} linhas ignoradas por estarem em formato inválido."
+        self.iface.messageBar().pushMessage(
+            "Sucesso", mensagem,
+            level=Qgis.Warning if importador.ignoradas else Qgis.Success,
+            duration=5
+        )
+
+    def undo_last_insert(self):
+        """Remove o último valor inserido."""
+        if len(self.pernadas):
+            self.pernadas.remover_ultima()
+            self.autosalvar(lambda sessao: sessao.remover_ultima())
             self.atualizar_preview()
 
-    def save_and_close(self):
-        """Adiciona as linhas na camada UTM mantendo em modo de edição."""
-        if not self.start_point or not self.inserted_values:
-            if self.dlg:
-                self.dlg.close()
-            self.canvas.unsetMapTool(self)
+    def restaurar_sessao(self):
+        """Lista as sessões salvas e carrega a escolhida no lugar das pernadas atuais."""
+        try:
+            sessoes = [sessao for sessao in listar_sessoes(self.pasta_sessoes()) if len(sessao)]
+        except OSError as e:
+            self.iface.messageBar().pushMessage(
+                "Erro", f"Não foi possível ler as sessões: {str(e)}", level=Qgis.Critical)
             return
 
-        # Tentar usar a camada selecionada ou criar uma nova em UTM
+        if not sessoes:
+            self.iface.messageBar().pushMessage(
+                "Aviso", "Nenhuma sessão de poligonal salva.", level=Qgis.Info, duration=5)
+            return
+
+        itens = [
+            f"{datetime.fromtimestamp(os.path.getmtime(sessao.caminho)):%d/%m/%Y %H:%M} - "
+            f"{len(sessao)} pernadas - {sessao.crs}"
+            for sessao in sessoes
+        ]
+        item, ok = QInputDialog.getItem(
+            self.dlg, "Restaurar Sessão", "Poligonal salva automaticamente:", itens, 0, False)
+        if not ok:
+            return
+        sessao = sessoes[itens.index(item)]
+
+        if sessao.crs != self.crs_sessao():
+            self.iface.messageBar().pushMessage(
+                "Aviso",
+                f"A sessão foi digitada em {sessao.crs}. Altere o SRC do projeto para restaurá-la.",
+                level=Qgis.Warning
+            )
+            return
+
+        if len(self.pernadas):
+            # Compatibilidade Qt5/Qt6:
+            try:
+                sim, nao = QMessageBox.StandardButton.Yes, QMessageBox.StandardButton.No  # Qt6
+            except AttributeError:
+                sim, nao = QMessageBox.Yes, QMessageBox.No  # Qt5
+
+            resposta = QMessageBox.question(
+                self.dlg, "Restaurar Sessão",
+                "As pernadas atuais serão substituídas pelas da sessão. Continuar?",
+                sim | nao)
+            if resposta != sim:
+                return
+
+        azimutes, distancias = sessao.pernadas()
+        textos = [self.textos_pernada(Pernada(azimute, distancia, decimal_para_dms(azimute), None))
+                  for azimute, distancia in zip(azimutes, distancias)]
+
+        self.pernadas.limpar()
+        self.pernadas.acrescentar(azimutes, distancias, textos)
+        self.start_point = QgsPointXY(sessao.x, sessao.y)
+        self.sessao = sessao
+        self.metodo_ajuste = None
+        self.invalidar_vertices(0)
+        self.atualizar_preview()
+
+    def modo_saida(self):
+        """Formato escolhido para as feições salvas."""
+        if self.dlg and hasattr(self.dlg, 'saidaCombo'):
+            return SAIDAS[self.dlg.saidaCombo.currentIndex()]
+        return SAIDA_SEGMENTOS
+
+    def geometrias_saida(self, vertices, modo):
+        """Monta todas as geometrias da poligonal em memória."""
+        if modo == SAIDA_LINHA:
+            return [QgsGeometry.fromPolylineXY(vertices)]
+
+        if modo == SAIDA_POLIGONO:
+            anel = list(vertices)
+            if anel[0] != anel[-1]:
+                anel.append(anel[0])
+            return [QgsGeometry.fromPolygonXY([anel])]
+
+        return [QgsGeometry.fromPolylineXY([inicio, fim])
+                for inicio, fim in zip(vertices, vertices[1:])
+                if inicio != fim]
+
+    def camada_destino(self, geometry_type):
+        """Usa a camada selecionada se for compatível, senão cria uma nova."""
+        nome_tipo = "polígono" if geometry_type == QgsWkbTypes.PolygonGeometry else "linha"
+
+        # Tentar usar a camada selecionada ou criar uma nova no SRC do mapa
         layer = self.canvas.currentLayer()
         if layer:
-            # Verificar se a camada é UTM
-            if layer.crs().authid() != 'EPSG:31982':
+            # Verificar se a camada está no SRC do mapa
+            if layer.crs() != self.canvas.mapSettings().destinationCrs():
                 self.iface.messageBar().pushMessage(
                     "Aviso", 
-                    "A camada selecionada não está em UTM. Criando nova camada UTM.",
+                    "A camada selecionada não está no SRC do mapa. Criando nova camada.",
                     level=Qgis.Warning
                 )
-                layer = self.create_memory_layer(self.get_nome_camada())
-            elif layer.geometryType() != QgsWkbTypes.LineGeometry:
+                layer = self.create_memory_layer(self.get_nome_camada(), geometry_type)
+            elif layer.type() != QgsMapLayerType.VectorLayer or layer.geometryType() != geometry_type:
                 self.iface.messageBar().pushMessage(
                     "Aviso", 
-                    "A camada selecionada não é do tipo linha. Criando nova camada.",
+                    f"A camada selecionada não é do tipo {nome_tipo}. Criando nova camada.",
                     level=Qgis.Warning
                 )
-                layer = self.create_memory_layer(self.get_nome_camada())
+                layer = self.create_memory_layer(self.get_nome_camada(), geometry_type)
         else:
-            layer = self.create_memory_layer(self.get_nome_camada())
+            layer = self.create_memory_layer(self.get_nome_camada(), geometry_type)
+
+        return layer
+
+    def save_and_close(self):
+        """Adiciona a poligonal na camada de destino mantendo em modo de edição.
+
+        Todas as feições são criadas em memória e inseridas de uma vez,
+        em um único comando de edição (um único Desfazer)."""
+        if not self.start_point or not len(self.pernadas):
+            if self.dlg:
+                self.dlg.close()
+            self.canvas.unsetMapTool(self)
+            return
+
+        modo = self.modo_saida()
+        if modo == SAIDA_POLIGONO and len(self.pernadas) < 2:
+            self.iface.messageBar().pushMessage(
+                "Aviso", "Insira ao menos duas pernadas para formar um polígono.",
+                level=Qgis.Warning)
+            return
+
+        geometry_type = QgsWkbTypes.PolygonGeometry if modo == SAIDA_POLIGONO else QgsWkbTypes.LineGeometry
+        layer = self.camada_destino(geometry_type)
 
         if not layer or not layer.isValid():
             return
@@ -188,44 +701,45 @@ class BaseBearingTool(QgsMapTool):
             if not layer.startEditing():
                 return
 
-        current_point = self.start_point
-        total_lines = len(self.inserted_values)
-
-        # Adicionar cada feature individualmente
-        features_added = 0
-        for i, value_tuple in enumerate(self.inserted_values):
-            try:
-                # Extrai azimute e distância (independente do tamanho da tupla)
-                azimuth = value_tuple[-2]
-                distance = value_tuple[-1]
+        vertices = self.vertices_poligonal()
+        geometrias = self.geometrias_saida(vertices, modo)
 
-                end_point = self.calculate_end_point(current_point, azimuth, distance)
-
-                # Criar a geometria da linha
-                line = QgsGeometry.fromPolylineXY([current_point, end_point])
-                if not line.isGeosValid():
-                    continue
-
-                # Criar e adicionar a feature
-                feat = QgsFeature(layer.fields())
-                feat.setGeometry(line)
-
-                # Tentar adicionar a feature
-                if layer.addFeature(feat):
-                    features_added += 1
+        if modo == SAIDA_POLIGONO and not geometrias[0].isGeosValid():
+            self.iface.messageBar().pushMessage(
+                "Erro",
+                "O polígono formado pela poligonal é inválido (possui autointerseção).",
+                level=Qgis.Critical
+            )
+            return
 
-                current_point = end_point
+        features = []
+        for geometria in geometrias:
+            feat = QgsFeature(layer.fields())
+            feat.setGeometry(geometria)
+            features.append(feat)
 
-            except Exception as e:
-                print(f"DEBUG: ERRO ao processar linha {i+1}: {str(e)}")
-                continue
+        layer.beginEditCommand("Desenho de Poligonal (RMCGEO)")
+        try:
+            added = layer.addFeatures(features)
+        except Exception as e:
+            layer.destroyEditCommand()
+            added = False
+            QgsMessageLog.logMessage(f"Erro ao adicionar feições: {e}", "RMCGEO", Qgis.Critical)
+        else:
+            if added:
+                layer.endEditCommand()
+            else:
+                layer.destroyEditCommand()
 
-        if features_added > 0:
+        if added and features:
             layer.updateExtents()
+            layer.triggerRepaint()
 
+            crs = layer.crs()
             self.iface.messageBar().pushMessage(
                 "Sucesso",
-                f"Foram adicionadas {features_added} linhas em UTM! A camada permanece em modo de edição.",
+                f"Foram adicionadas {len(features)} feições em {crs.authid() or crs.description()}! "
+                f"A camada permanece em modo de edição.",
                 level=Qgis.Success,
                 duration=3
             )
@@ -237,8 +751,8 @@ class BaseBearingTool(QgsMapTool):
                 duration=3
             )
 
-        if self.rubber_band:
-            self.rubber_band.reset()
+        self.metodo_ajuste = None
+        self.limpar_preview()
         if self.dlg:
             self.dlg.close()
         self.canvas.unsetMapTool(self)
@@ -259,6 +773,9 @@ class BaseBearingTool(QgsMapTool):
             self.show_dialog()
         else:
             self.start_point = self.toMapCoordinates(event.pos())
+            if self.sessao:
+                self.autosalvar(lambda sessao: sessao.mover_inicio(
+                    self.start_point.x(), self.start_point.y()))
             self.atualizar_preview()
 
     def canvasReleaseEvent(self, event):
@@ -272,14 +789,12 @@ class BaseBearingTool(QgsMapTool):
         if event.button() == right_button:
             if self.dlg and self.dlg.isVisible():
                 self.dlg.close()
-            if self.rubber_band:
-                self.rubber_band.reset()
+            self.limpar_preview()
             self.canvas.unsetMapTool(self)
 
     def deactivate(self):
         """Limpa recursos ao desativar a ferramenta."""
-        if self.rubber_band:
-            self.rubber_band.reset()
+        self.limpar_preview()
         if self.dlg:
             self.dlg.close()
         super().deactivate()
\ No newline at end of file
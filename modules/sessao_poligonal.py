@@ -0,0 +1,156 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Sessões de digitação de poligonais gravadas em arquivo binário compacto,
+ sem dependência do QGIS.
+
+ Formato (little-endian): cabeçalho 'RMCP', versão, x e y do ponto inicial,
+ SRC (tamanho + texto UTF-8), seguido de um registro de 16 bytes
+ (azimute, distância) por pernada.
+"""
+
+import glob
+import os
+import struct
+import sys
+from array import array
+
+EXTENSAO = '.rmcpol'
+
+_MAGICO = b'RMCP'
+_VERSAO = 1
+_CABECALHO = struct.Struct('<4sBddH')
+_PAR = struct.Struct('<dd')
+_POSICAO_INICIO = 5
+_REGISTRO = 16
+
+# Sessões mantidas na pasta; as mais antigas são apagadas
+_MAXIMO_SESSOES = 50
+
+
+def _para_arquivo(valores):
+    """Bytes little-endian de um array('d')."""
+    if sys.byteorder != 'little':
+        valores = array('d', valores)
+        valores.byteswap()
+    return valores.tobytes()
+
+
+class SessaoPoligonal:
+    """Arquivo de uma poligonal em digitação.
+
+    Cada alteração é repetida no arquivo assim que acontece: pernadas novas
+    são acrescentadas ao final, uma pernada editada é regravada no lugar e
+    desfazer apenas trunca o último registro. Um registro incompleto (queda
+    do QGIS no meio da gravação) é ignorado e sobrescrito."""
+
+    def __init__(self, caminho, x, y, crs, inicio):
+        self.caminho = caminho
+        self.x = x
+        self.y = y
+        self.crs = crs
+        self.inicio = inicio
+
+    @classmethod
+    def criar(cls, caminho, x, y, crs):
+        texto = crs.encode('utf-8')
+        with open(caminho, 'wb') as f:
+            f.write(_CABECALHO.pack(_MAGICO, _VERSAO, x, y, len(texto)))
+            f.write(texto)
+        return cls(caminho, x, y, crs, _CABECALHO.size + len(texto))
+
+    @classmethod
+    def abrir(cls, caminho):
+        """Lê apenas o cabeçalho; levanta ValueError se o arquivo não for uma sessão."""
+        with open(caminho, 'rb') as f:
+            dados = f.read(_CABECALHO.size)
+            if len(dados) < _CABECALHO.size:
+                raise ValueError("Arquivo de sessão incompleto.")
+            magico, versao, x, y, tamanho = _CABECALHO.unpack(dados)
+            if magico != _MAGICO or versao != _VERSAO:
+                raise ValueError("Arquivo de sessão em formato desconhecido.")
+            crs = f.read(tamanho).decode('utf-8')
+        return cls(caminho, x, y, crs, _CABECALHO.size + tamanho)
+
+    def __len__(self):
+        return max(0, os.path.getsize(self.caminho) - self.inicio) // _REGISTRO
+
+    def pernadas(self):
+        """Retorna (azimutes, distancias) como array('d'), lidos de uma só vez."""
+        total = len(self)
+        valores = array('d')
+        with open(self.caminho, 'rb') as f:
+            f.seek(self.inicio)
+            valores.frombytes(f.read(total * _REGISTRO))
+        if sys.byteorder != 'little':
+            valores.byteswap()
+        return valores[0::2], valores[1::2]
+
+    def acrescentar(self, azimutes, distancias):
+        valores = array('d', [0.0]) * (2 * len(azimutes))
+        valores[0::2] = array('d', azimutes)
+        valores[1::2] = array('d', distancias)
+
+        posicao = self.inicio + len(self) * _REGISTRO
+        with open(self.caminho, 'r+b') as f:
+            f.seek(posicao)
+            f.write(_para_arquivo(valores))
+            f.truncate()
+
+    def alterar(self, indice, azimute, distancia):
+        with open(self.caminho, 'r+b') as f:
+            f.seek(self.inicio + indice * _REGISTRO)
+            f.write(_PAR.pack(azimute, distancia))
+
+    def remover_ultima(self):
+        total = len(self)
+        if total:
+            with open(self.caminho, 'r+b') as f:
+                f.truncate(self.inicio + (total - 1) * _REGISTRO)
+
+    def mover_inicio(self, x, y):
+        self.x, self.y = x, y
+        with open(self.caminho, 'r+b') as f:
+            f.seek(_POSICAO_INICIO)
+            f.write(_PAR.pack(x, y))
+
+
+def listar_sessoes(pasta):
+    """Sessões válidas da pasta, da mais recente para a mais antiga."""
+    caminhos = sorted(glob.glob(os.path.join(pasta, '*' + EXTENSAO)),
+                      key=os.path.getmtime, reverse=True)
+    sessoes = []
+    for caminho in caminhos:
+        try:
+            sessoes.append(SessaoPoligonal.abrir(caminho))
+        except (OSError, ValueError):
+            continue
+    return sessoes
+
+
+def podar_sessoes(pasta, manter=_MAXIMO_SESSOES):
+    """Apaga as sessões mais antigas além das `manter` mais recentes."""
+    caminhos = sorted(glob.glob(os.path.join(pasta, '*' + EXTENSAO)),
+                      key=os.path.getmtime, reverse=True)
+    for caminho in caminhos[manter:]:
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
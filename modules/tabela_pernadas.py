@@ -0,0 +1,126 @@
+"""
+/***************************************************************************
+ RMCGeo
+                                 A QGIS plugin
+ Conjunto de ferramentas para simplificar tarefas geoespaciais.
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2025 by Rodolfo Martins de Carvalho
+        email                : rodolfomartins09@gmail.com
+        git sha              : $Format:%H$
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from array import array
+
+from qgis.PyQt.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+# Compatibilidade Qt5/Qt6:
+try:
+    DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole  # Qt6
+    EDIT_ROLE = Qt.ItemDataRole.EditRole
+    HORIZONTAL = Qt.Orientation.Horizontal
+    ITEM_FLAGS = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable
+except AttributeError:
+    DISPLAY_ROLE = Qt.DisplayRole  # Qt5
+    EDIT_ROLE = Qt.EditRole
+    HORIZONTAL = Qt.Horizontal
+    ITEM_FLAGS = Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+
+class PernadasModel(QAbstractTableModel):
+    """Pernadas da poligonal guardadas em arrays tipados.
+
+    A última coluna é sempre a distância; as anteriores exibem os textos
+    informados em `textos` (azimute, ou rumo e quadrante). Edições feitas na
+    tabela são repassadas para `editor(row, column, texto)`, que valida o
+    valor e chama `atualizar` se ele for aceito."""
+
+    def __init__(self, colunas, parent=None):
+        super().__init__(parent)
+        self.colunas = list(colunas)
+        self.azimutes = array('d')
+        self.distancias = array('d')
+        self.textos = []
+        self.editor = None
+
+    def __len__(self):
+        return len(self.azimutes)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.azimutes)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.colunas)
+
+    def headerData(self, section, orientation, role=DISPLAY_ROLE):
+        if role == DISPLAY_ROLE and orientation == HORIZONTAL:
+            return self.colunas[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        return ITEM_FLAGS
+
+    def data(self, index, role=DISPLAY_ROLE):
+        if not index.isValid() or role not in (DISPLAY_ROLE, EDIT_ROLE):
+            return None
+
+        row, column = index.row(), index.column()
+        if column == len(self.colunas) - 1:
+            return f"{self.distancias[row]:.2f}m"
+        return self.textos[row][column]
+
+    def setData(self, index, value, role=EDIT_ROLE):
+        if role != EDIT_ROLE or not index.isValid() or not self.editor:
+            return False
+
+        # Valores rejeitados não alteram o modelo; a célula volta ao texto anterior
+        return bool(self.editor(index.row(), index.column(), str(value)))
+
+    def acrescentar(self, azimutes, distancias, textos):
+        """Acrescenta várias pernadas com uma única notificação à tabela."""
+        if not azimutes:
+            return
+
+        inicio = len(self.azimutes)
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(azimutes) - 1)
+        self.azimutes.extend(azimutes)
+        self.distancias.extend(distancias)
+        self.textos.extend(tuple(t) for t in textos)
+        self.endInsertRows()
+
+    def atualizar(self, row, azimute, distancia, textos):
+        """Substitui uma pernada e notifica apenas a sua linha."""
+        self.azimutes[row] = azimute
+        self.distancias[row] = distancia
+        self.textos[row] = tuple(textos)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.colunas) - 1))
+
+    def remover_ultima(self):
+        """Remove a última pernada."""
+        row = len(self.azimutes) - 1
+        if row < 0:
+            return
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.azimutes.pop()
+        self.distancias.pop()
+        self.textos.pop()
+        self.endRemoveRows()
+
+    def limpar(self):
+        """Remove todas as pernadas."""
+        self.beginResetModel()
+        self.azimutes = array('d')
+        self.distancias = array('d')
+        self.textos = []
+        self.endResetModel()
@@ -33,15 +33,22 @@ from .modules.point_insert import run as run_point_insert
 from .modules.copy_coordenadas import run as run_copy_coord_def
 from .modules.desenho_azimute import run as run_azimuth_distance
 from .modules.desenho_rumo import run as run_rumo_distance
+from .modules.cogo_inverso import run as run_cogo_inverso
+from .modules.memorial_descritivo import run as run_memorial_descritivo
+from .modules.planilha_sigef import run as run_planilha_sigef
 from .modules.add_area_tabela import run as run_add_area_tabela
 from .modules.add_azimute_tabela import run as run_add_azimute_tabela
 from .modules.add_perimetro_tabela import run as run_add_perimetro_tabela
 from .modules.add_coord_x_tabela import run as run_add_coord_x_tabela
 from .modules.add_coord_y_tabela import run as run_add_coord_y_tabela
 from .modules.add_comprimento_tabela import run as run_add_comprimento_tabela
+from .modules.add_medidas_tabela import run as run_add_medidas_tabela
+from .modules.add_lote_tabela import run as run_add_lote_tabela
+from .modules.base_field_calculator import ligar_campos_vivos, desligar_campos_vivos
 from .modules.extend_tool import run as run_extend_tool
 from .modules.offset_tool import run as run_offset_tool
 from .modules.chanfro_tool import run as run_chanfro_tool
+from .modules.chanfro_lote import run as run_chanfro_lote
 from .modules.project_norms import run as run_project_norms
 from .modules.links_uteis import LinksUteisManager
 
@@ -94,6 +101,18 @@ class RMCGeo:
         submenu1.setIcon(QIcon(':/images/themes/default/mActionShowPluginManager.svg'))
         self.plugin_menu.addMenu(submenu1)
 
+        #Memorial Descritivo das parcelas (ODT, DOCX ou HTML)
+        self.action_memorial = QAction(QIcon(':/images/themes/default/mActionFileSave.svg'),
+        self.tr("Generate Descriptive Memorial"), self.iface.mainWindow())
+        self.action_memorial.triggered.connect(lambda: run_memorial_descritivo(self.iface))
+        submenu1.addAction(self.action_memorial)
+
+        #Planilha SIGEF/INCRA de vértices, lados e confrontantes (ODS)
+        self.action_sigef = QAction(QIcon(':/images/themes/default/mActionOpenTable.svg'),
+        self.tr("Export SIGEF Spreadsheet"), self.iface.mainWindow())
+        self.action_sigef.triggered.connect(lambda: run_planilha_sigef(self.iface))
+        submenu1.addAction(self.action_sigef)
+
         self.plugin_menu.addSeparator()
 
         menu_aplicativos = QMenu(self.tr("Applications"), self.plugin_menu)
@@ -112,6 +131,12 @@ class RMCGeo:
         self.action_rumo.triggered.connect(lambda: run_rumo_distance(self.iface))
         menu_aplicativos.addAction(self.action_rumo)
 
+        #Tabela de Azimutes e Distâncias das feições (COGO inverso)
+        self.action_cogo_inverso = QAction(QIcon(':/images/themes/default/mActionOpenTable.svg'),
+        self.tr("Azimuth and Distance Table from Features"), self.iface.mainWindow())
+        self.action_cogo_inverso.triggered.connect(lambda: run_cogo_inverso(self.iface))
+        menu_aplicativos.addAction(self.action_cogo_inverso)
+
         menu_aplicativos.addSeparator()
 
         #Conversor de Graus decimal para GMS
@@ -148,6 +173,12 @@ class RMCGeo:
         self.action_chanfro.triggered.connect(lambda: run_chanfro_tool(self.iface))
         menu_ferramentas.addAction(self.action_chanfro)
 
+        # Chanfro em Lote
+        self.action_chanfro_lote = QAction(QIcon(':/images/themes/default/algorithms/mAlgorithmBuffer.svg'),
+        self.tr("Batch Chamfer"), self.iface.mainWindow())
+        self.action_chanfro_lote.triggered.connect(lambda: run_chanfro_lote(self.iface))
+        menu_ferramentas.addAction(self.action_chanfro_lote)
+
         menu_ferramentas.addSeparator() 
 
         #Inserir Ponto
@@ -208,6 +239,18 @@ class RMCGeo:
         self.action_add_comprimento.triggered.connect(lambda: run_add_comprimento_tabela(self.iface))
         menu_manipulador_tabela.addAction(self.action_add_comprimento)
 
+        #Adicionar várias medidas de uma vez na Tabela de Atributos
+        self.action_add_medidas = QAction(QIcon(':/images/themes/default/mActionNewAttribute.svg'),
+        self.tr("Add Multiple Measures to Table"), self.iface.mainWindow())
+        self.action_add_medidas.triggered.connect(lambda: run_add_medidas_tabela(self.iface))
+        menu_manipulador_tabela.addAction(self.action_add_medidas)
+
+        #Calcular medidas em várias camadas do projeto de uma vez
+        self.action_add_lote = QAction(QIcon(':/images/themes/default/mActionNewAttribute.svg'),
+        self.tr("Add Measures to Multiple Layers"), self.iface.mainWindow())
+        self.action_add_lote.triggered.connect(lambda: run_add_lote_tabela(self.iface))
+        menu_manipulador_tabela.addAction(self.action_add_lote)
+
         # Menu Links Úteis
         menu_links_uteis = QMenu(self.tr("Useful Links"), self.plugin_menu)
         menu_links_uteis.setIcon(QIcon(':/images/themes/default/mIconWms.svg'))
@@ -226,6 +269,9 @@ class RMCGeo:
         self.menu_about.triggered.connect(self.show_about)
         self.plugin_menu.addAction(self.menu_about)
 
+        # Campos vivos: recalcula campos das feições editadas nas camadas do projeto
+        ligar_campos_vivos()
+
     def show_about(self):
         dlg = AboutDialog(self.iface.mainWindow())
         # Compatibilidade Qt5/Qt6: exec_() foi renomeado para exec()
@@ -235,6 +281,7 @@ class RMCGeo:
             dlg.exec_()
 
     def unload(self):
+        desligar_campos_vivos()
         if hasattr(self, 'plugin_menu'):
             self.plugin_menu.deleteLater()
 
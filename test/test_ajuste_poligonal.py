@@ -0,0 +1,113 @@
+# coding=utf-8
+"""Testes do fechamento e do ajuste de poligonais.
+
+Poligonal fechada A-B-C-A sobre o triângulo 3-4-5 (A em 0,0; B em 0,300;
+C em 400,300), com a primeira pernada medida 3 cm longa. Os valores
+esperados foram calculados à mão pelas fórmulas de cada regra:
+
+- erro: eE = 0, eN = +0,03 m; perímetro 1200,03 m; precisão 1:40.001
+- Bowditch: cN = -0,03 * d / 1200,03
+- trânsito: cN = -0,03 * |dN| / 600,03
+- Crandall: v = d * (lE sen + lN cos), com as equações normais em
+  aritmética exata (v = -0,0225006; +0,0099993; +0,0124991 m)
+
+A poligonal A-B-C-D-E-A do capítulo de cálculo de poligonais de Ghilani
+e Wolf (Elementary Surveying) confere o Bowditch (regra da bússola) com os
+valores publicados, em pés: azimutes já compensados, A em (10.000,00;
+5.000,00), erro linear 0,083 em 2.466,00 (1:29.700) e coordenadas ajustadas
+com duas casas.
+"""
+
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.ajuste_poligonal import (BOWDITCH, CRANDALL, TRANSITO, ajustar_poligonal,
+                                      calcular_fechamento, formatar_precisao)
+
+AZIMUTES = [0.0, 90.0, 180.0 + math.degrees(math.atan2(4, 3))]
+DISTANCIAS = [300.03, 400.00, 500.00]
+
+
+def dms(graus, minutos, segundos):
+    return graus + minutos / 60 + segundos / 3600
+
+
+# Ghilani e Wolf, Elementary Surveying: pernadas AB, BC, CD, DE, EA
+AZIMUTES_LIVRO = [dms(126, 55, 17), dms(178, 18, 58), dms(15, 31, 55),
+                  dms(284, 35, 21), dms(206, 9, 42)]
+DISTANCIAS_LIVRO = [647.25, 203.03, 720.35, 610.24, 285.13]
+COORDENADAS_LIVRO = [(10517.44, 4611.16), (10523.41, 4408.22),
+                     (10716.29, 5102.24), (10125.72, 5255.93)]
+
+
+class FechamentoTest(unittest.TestCase):
+
+    def test_erro_de_fechamento(self):
+        fechamento = calcular_fechamento(AZIMUTES, DISTANCIAS)
+        self.assertAlmostEqual(fechamento.erro_e, 0.0, places=9)
+        self.assertAlmostEqual(fechamento.erro_n, 0.03, places=9)
+        self.assertAlmostEqual(fechamento.erro_linear, 0.03, places=9)
+        self.assertAlmostEqual(fechamento.perimetro, 1200.03, places=9)
+
+    def test_precisao_relativa(self):
+        fechamento = calcular_fechamento(AZIMUTES, DISTANCIAS)
+        self.assertAlmostEqual(fechamento.precisao, 40001.0, places=3)
+        self.assertEqual(formatar_precisao(fechamento.precisao), "1:40.001")
+
+    def test_poligonal_sem_erro(self):
+        fechamento = calcular_fechamento(AZIMUTES, [300.0, 400.0, 500.0])
+        self.assertLess(fechamento.erro_linear, 1e-9)
+        self.assertEqual(formatar_precisao(math.inf), "sem erro")
+
+
+class AjusteTest(unittest.TestCase):
+
+    def verificar(self, metodo, esperados):
+        vertices = ajustar_poligonal(AZIMUTES, DISTANCIAS, (0.0, 0.0), metodo=metodo)
+        self.assertEqual(len(vertices), 4)
+        self.assertEqual(vertices[-1], (0.0, 0.0))
+        for (x, y), (x_esperado, y_esperado) in zip(vertices[1:3], esperados):
+            self.assertAlmostEqual(x, x_esperado, places=6)
+            self.assertAlmostEqual(y, y_esperado, places=6)
+
+    def test_bowditch(self):
+        self.verificar(BOWDITCH, [(0.0, 300.03 - 0.03 * 300.03 / 1200.03),
+                                  (400.0, 300.03 - 0.03 * 700.03 / 1200.03)])
+        self.verificar(BOWDITCH, [(0.0, 300.0224994), (400.0, 300.0124997)])
+
+    def test_transito(self):
+        # A pernada B-C não tem projeção norte e não recebe correção em N
+        self.verificar(TRANSITO, [(0.0, 300.0149993), (400.0, 300.0149993)])
+
+    def test_crandall(self):
+        self.verificar(CRANDALL, [(0.0, 300.0074994), (400.0099993, 300.0074994)])
+
+    def test_crandall_mantem_azimutes(self):
+        vertices = ajustar_poligonal(AZIMUTES, DISTANCIAS, (0.0, 0.0), metodo=CRANDALL)
+        for (x0, y0), (x1, y1), azimute in zip(vertices, vertices[1:], AZIMUTES):
+            ajustado = math.degrees(math.atan2(x1 - x0, y1 - y0)) % 360.0
+            self.assertAlmostEqual(ajustado, azimute, places=6)
+
+    def test_bowditch_exemplo_publicado(self):
+        fechamento = calcular_fechamento(AZIMUTES_LIVRO, DISTANCIAS_LIVRO)
+        self.assertAlmostEqual(fechamento.erro_linear, 0.083, delta=0.0005)
+        self.assertAlmostEqual(fechamento.precisao, 29700, delta=200)
+
+        vertices = ajustar_poligonal(AZIMUTES_LIVRO, DISTANCIAS_LIVRO, (10000.0, 5000.0))
+        self.assertEqual(vertices[-1], (10000.0, 5000.0))
+        for (x, y), (x_livro, y_livro) in zip(vertices[1:-1], COORDENADAS_LIVRO):
+            # O livro arredonda projeções e correções a cada passo
+            self.assertAlmostEqual(x, x_livro, delta=0.006)
+            self.assertAlmostEqual(y, y_livro, delta=0.006)
+
+    def test_metodo_desconhecido(self):
+        with self.assertRaises(ValueError):
+            ajustar_poligonal(AZIMUTES, DISTANCIAS, (0.0, 0.0), metodo='outro')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# coding=utf-8
+"""Testes do problema geodésico direto e do fator de escala/convergência TM."""
+
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.geodesia import (direto, elipsoide, escala_convergencia, fator_elevacao,
+                              parametros_tm, propagar_geodesico, zona)
+
+GRS80 = elipsoide(6378137.0, 1 / 298.257222101)
+CLARKE_1866 = elipsoide(6378206.4, 1 / 294.978698214)
+
+
+def dms(graus, minutos, segundos):
+    return math.copysign(abs(graus) + minutos / 60 + segundos / 3600, graus)
+
+
+class DiretoTest(unittest.TestCase):
+    """Flinders Peak -> Buninyong (GRS80), exemplo de referência do
+    problema direto de Vincenty publicado pela Geoscience Australia."""
+
+    INICIO = (-dms(37, 57, 3.72030), dms(144, 25, 29.52440))
+    AZIMUTE = dms(306, 52, 5.37)
+    DISTANCIA = 54972.271
+
+    def test_flinders_peak_buninyong(self):
+        lat, lon, azimute_final = direto(*self.INICIO, self.AZIMUTE, self.DISTANCIA, GRS80)
+        self.assertAlmostEqual(lat, -dms(37, 39, 10.15610), places=7)
+        self.assertAlmostEqual(lon, dms(143, 55, 35.38390), places=7)
+        # Azimute reverso publicado: 127°10'25.07"
+        self.assertAlmostEqual((azimute_final + 180) % 360, dms(127, 10, 25.07), delta=0.01 / 3600)
+
+    def test_propagar_em_duas_pernadas(self):
+        metade = self.DISTANCIA / 2
+        lat, lon, azimute = direto(*self.INICIO, self.AZIMUTE, metade, GRS80)
+        pontos = propagar_geodesico(*self.INICIO, [self.AZIMUTE, azimute], [metade, metade], GRS80)
+        self.assertAlmostEqual(pontos[-1][0], -dms(37, 39, 10.15610), places=7)
+        self.assertAlmostEqual(pontos[-1][1], dms(143, 55, 35.38390), places=7)
+
+    def test_fator_elevacao(self):
+        self.assertEqual(fator_elevacao(0.0, GRS80), 1.0)
+        self.assertLess(fator_elevacao(1000.0, GRS80), 1.0)
+
+
+class EscalaConvergenciaTest(unittest.TestCase):
+    """Snyder, Map Projections - A Working Manual (USGS PP 1395), exemplo
+    da Transversa de Mercator elipsoidal: Clarke 1866, lat 40°30' N,
+    lon 73°30' W, meridiano central 75° W, k0 = 0,9996 -> k = 0,9997989."""
+
+    ZONA = zona(CLARKE_1866.a, CLARKE_1866.f, -75.0, 0.9996)
+
+    def test_exemplo_snyder(self):
+        k, _ = escala_convergencia(40.5, -73.5, self.ZONA)
+        self.assertAlmostEqual(k, 0.9997989, places=7)
+
+    def test_meridiano_central(self):
+        k, gamma = escala_convergencia(40.5, -75.0, self.ZONA)
+        self.assertAlmostEqual(k, 0.9996, places=12)
+        self.assertAlmostEqual(gamma, 0.0, places=12)
+
+    def test_convergencia(self):
+        # Próxima de atan(tan(dlon) sen(lat)) da esfera; sinal pelo lado do meridiano
+        _, leste = escala_convergencia(40.5, -73.5, self.ZONA)
+        _, oeste = escala_convergencia(40.5, -76.5, self.ZONA)
+        esfera = math.degrees(math.atan(math.tan(math.radians(1.5)) * math.sin(math.radians(40.5))))
+        self.assertAlmostEqual(leste, esfera, delta=5e-4)
+        self.assertAlmostEqual(oeste, -leste, places=12)
+        _, sul = escala_convergencia(-40.5, -73.5, self.ZONA)
+        self.assertAlmostEqual(sul, -leste, places=12)
+
+    def test_parametros_tm(self):
+        self.assertEqual(parametros_tm("+proj=utm +zone=22 +south +ellps=GRS80"), (-51, 0.9996))
+        self.assertEqual(parametros_tm("+proj=tmerc +lat_0=0 +lon_0=-54 +k=0.9999"), (-54.0, 0.9999))
+        self.assertIsNone(parametros_tm("+proj=longlat +ellps=GRS80"))
+
+
+if __name__ == '__main__':
+    unittest.main()
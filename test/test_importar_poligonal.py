@@ -0,0 +1,59 @@
+# coding=utf-8
+"""Testes da importação de pernadas de arquivos CSV."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.importar_poligonal import ImportadorPoligonal
+
+
+class LerCsvTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta)
+
+    def importar(self, texto):
+        caminho = os.path.join(self.pasta, 'pernadas.csv')
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        importador = ImportadorPoligonal(caminho)
+        return list(importador.pernadas()), importador.ignoradas
+
+    def test_ponto_e_virgula_com_virgula_decimal(self):
+        pernadas, ignoradas = self.importar(
+            "45 30 15;120,35\n135 10 05;80,20\n225 00 00;60,00\n")
+        self.assertEqual(ignoradas, 0)
+        self.assertEqual(len(pernadas), 3)
+        self.assertAlmostEqual(pernadas[0].azimute, 45 + 30 / 60 + 15 / 3600)
+        self.assertAlmostEqual(pernadas[0].distancia, 120.35)
+        self.assertAlmostEqual(pernadas[1].distancia, 80.20)
+
+    def test_rumo_com_quadrante(self):
+        pernadas, ignoradas = self.importar("10 00 00;SW;50,5\n")
+        self.assertEqual(ignoradas, 0)
+        self.assertEqual(len(pernadas), 1)
+        self.assertAlmostEqual(pernadas[0].azimute, 190.0)
+        self.assertAlmostEqual(pernadas[0].distancia, 50.5)
+
+    def test_azimute_inteiro_nao_vira_minutos(self):
+        pernadas, ignoradas = self.importar("45 30 15;120,35\n90;10,5\n")
+        self.assertEqual(ignoradas, 0)
+        self.assertAlmostEqual(pernadas[1].azimute, 90.0)
+        self.assertAlmostEqual(pernadas[1].distancia, 10.5)
+
+    def test_virgula_como_separador(self):
+        pernadas, ignoradas = self.importar("azimute,distancia\n45.5,100.25\n90,50\n")
+        self.assertEqual(ignoradas, 0)
+        self.assertEqual([p.distancia for p in pernadas], [100.25, 50.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+# coding=utf-8
+"""Testes das partes de linha (requer o PyQGIS)."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+try:
+    from qgis.core import QgsGeometry, QgsPointXY
+    from modules.line_parts import closest_part_index
+except ImportError:
+    QgsGeometry = None
+
+
+@unittest.skipIf(QgsGeometry is None, "PyQGIS não disponível")
+class ClosestPartIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.multi = QgsGeometry.fromWkt(
+            "MultiLineString ((0 0, 10 0), (0 10, 10 10), (20 0, 20 10))")
+
+    def test_parte_mais_proxima(self):
+        self.assertEqual(closest_part_index(self.multi, QgsPointXY(5, 1)), 0)
+        self.assertEqual(closest_part_index(self.multi, QgsPointXY(5, 9)), 1)
+        self.assertEqual(closest_part_index(self.multi, QgsPointXY(21, 5)), 2)
+
+    def test_linha_simples(self):
+        linha = QgsGeometry.fromWkt("LineString (0 0, 10 0)")
+        self.assertEqual(closest_part_index(linha, QgsPointXY(5, 5)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# coding=utf-8
+"""Testes do registro de códigos de vértices."""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.registro_vertices import RegistroVertices
+
+
+class RegistroVerticesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+        self.caminho = os.path.join(self.pasta, 'vertices.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta)
+
+    def linhas(self):
+        conexao = sqlite3.connect(self.caminho)
+        try:
+            return conexao.execute("SELECT camada, codigo, x, y FROM vertices ORDER BY rowid").fetchall()
+        finally:
+            conexao.close()
+
+    def test_vertice_dentro_da_tolerancia_reusa_o_codigo(self):
+        registro = RegistroVertices('lotes', tolerancia=0.01, prefixo='M-')
+        self.assertEqual(registro.registrar(100.0, 200.0), ('M-0001', (100.0, 200.0)))
+        # Vizinho a 7 mm, em outra célula da grade: mesmo código e coordenadas
+        self.assertEqual(registro.registrar(100.005, 200.005), ('M-0001', (100.0, 200.0)))
+        self.assertEqual(registro.registrar(100.02, 200.0), ('M-0002', (100.02, 200.0)))
+
+    def test_numeracao_continua_apos_codigos_existentes(self):
+        registro = RegistroVertices('lotes', prefixo='M-')
+        registro.adicionar('M-0041', 'M-', 41, 0.0, 0.0)
+        registro.adicionar('P-0007', 'P-', 7, 10.0, 0.0)
+        self.assertEqual(registro.registrar(5.0, 5.0)[0], 'M-0042')
+
+        outro = RegistroVertices('lotes', prefixo='P-', digitos=3)
+        outro.adicionar('M-0041', 'M-', 41, 0.0, 0.0)
+        outro.adicionar('P-0007', 'P-', 7, 10.0, 0.0)
+        self.assertEqual(outro.registrar(5.0, 5.0)[0], 'P-008')
+
+    def test_persistencia_entre_instancias(self):
+        primeiro = RegistroVertices('lotes', prefixo='M-')
+        primeiro.carregar(self.caminho)
+        primeiro.registrar(0.0, 0.0)
+        primeiro.registrar(10.0, 0.0)
+        primeiro.salvar(self.caminho)
+
+        segundo = RegistroVertices('lotes', prefixo='M-')
+        segundo.carregar(self.caminho)
+        self.assertEqual(segundo.registrar(10.001, 0.0), ('M-0002', (10.0, 0.0)))
+        self.assertEqual(segundo.registrar(20.0, 0.0)[0], 'M-0003')
+        segundo.salvar(self.caminho)
+
+        self.assertEqual([codigo for _, codigo, _, _ in self.linhas()], ['M-0001', 'M-0002', 'M-0003'])
+
+        # Outra camada no mesmo arquivo tem a própria numeração
+        ruas = RegistroVertices('ruas', prefixo='M-')
+        ruas.carregar(self.caminho)
+        self.assertEqual(ruas.registrar(0.0, 0.0)[0], 'M-0001')
+
+    def test_gravar_de_novo_nao_duplica(self):
+        primeiro = RegistroVertices('lotes', prefixo='M-')
+        primeiro.registrar(0.0, 0.0)
+        novos = list(primeiro.novos)
+        primeiro.salvar(self.caminho)
+        self.assertEqual(primeiro.novos, [])
+
+        # A mesma entrada gravada outra vez (ex.: duas tarefas) é ignorada
+        primeiro.novos = novos
+        primeiro.salvar(self.caminho)
+
+        repetido = RegistroVertices('lotes', prefixo='M-')
+        repetido.registrar(0.0, 0.0)
+        repetido.salvar(self.caminho)
+
+        self.assertEqual(self.linhas(), [('lotes', 'M-0001', 0.0, 0.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# coding=utf-8
+"""Testes do arquivo binário das sessões de poligonal."""
+
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.sessao_poligonal import EXTENSAO, SessaoPoligonal, listar_sessoes
+
+CRS = "EPSG:31982"
+
+
+class SessaoPoligonalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+        self.caminho = os.path.join(self.pasta, 'teste' + EXTENSAO)
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta)
+
+    def criar(self):
+        sessao = SessaoPoligonal.criar(self.caminho, 500000.25, 7400000.5, CRS)
+        sessao.acrescentar([45.5, 135.0], [100.25, 80.0])
+        sessao.acrescentar([225.125], [60.5])
+        return sessao
+
+    def test_ida_e_volta(self):
+        self.criar()
+        sessao = SessaoPoligonal.abrir(self.caminho)
+        self.assertEqual((sessao.x, sessao.y, sessao.crs), (500000.25, 7400000.5, CRS))
+        self.assertEqual(len(sessao), 3)
+        azimutes, distancias = sessao.pernadas()
+        self.assertEqual(list(azimutes), [45.5, 135.0, 225.125])
+        self.assertEqual(list(distancias), [100.25, 80.0, 60.5])
+
+    def test_alterar_remover_e_mover_inicio(self):
+        sessao = self.criar()
+        sessao.alterar(1, 90.0, 10.0)
+        sessao.remover_ultima()
+        sessao.mover_inicio(1.0, 2.0)
+
+        sessao = SessaoPoligonal.abrir(self.caminho)
+        self.assertEqual((sessao.x, sessao.y), (1.0, 2.0))
+        azimutes, distancias = sessao.pernadas()
+        self.assertEqual(list(azimutes), [45.5, 90.0])
+        self.assertEqual(list(distancias), [100.25, 10.0])
+
+    def test_magico_invalido(self):
+        self.criar()
+        with open(self.caminho, 'r+b') as f:
+            f.write(b'XXXX')
+        with self.assertRaises(ValueError):
+            SessaoPoligonal.abrir(self.caminho)
+        self.assertEqual(listar_sessoes(self.pasta), [])
+
+    def test_versao_invalida(self):
+        self.criar()
+        with open(self.caminho, 'r+b') as f:
+            f.seek(4)
+            f.write(struct.pack('<B', 99))
+        with self.assertRaises(ValueError):
+            SessaoPoligonal.abrir(self.caminho)
+
+    def test_cabecalho_incompleto(self):
+        with open(self.caminho, 'wb') as f:
+            f.write(b'RMCP\x01')
+        with self.assertRaises(ValueError):
+            SessaoPoligonal.abrir(self.caminho)
+
+    def test_registro_incompleto_ignorado_e_sobrescrito(self):
+        self.criar()
+        # Queda no meio da gravação: metade de um registro no fim do arquivo
+        with open(self.caminho, 'ab') as f:
+            f.write(struct.pack('<d', 315.0))
+
+        sessao = SessaoPoligonal.abrir(self.caminho)
+        self.assertEqual(len(sessao), 3)
+        self.assertEqual(list(sessao.pernadas()[0]), [45.5, 135.0, 225.125])
+
+        sessao.acrescentar([315.0], [40.0])
+        azimutes, distancias = SessaoPoligonal.abrir(self.caminho).pernadas()
+        self.assertEqual(list(azimutes), [45.5, 135.0, 225.125, 315.0])
+        self.assertEqual(list(distancias), [100.25, 80.0, 60.5, 40.0])
+
+
+if __name__ == '__main__':
+    unittest.main()